@@ -12,6 +12,44 @@ BASE_DIR = TRACK_ROOT / "0127Tracking"  # 파일 기반 로더용 (선택)
 
 # YOLO 추론 입력 크기 (Ultralytics). 정수 하나면 정사각형: 모델 입력 = imgsz × imgsz (letterbox)
 YOLO_IMGSZ = 640
+# True: cam별 ROI/EOL 밴드(위아래 ROI_CROP_PAD_RATE*H 또는 max_dy 중 큰 값만큼 확장)만 잘라 배치 추론.
+# 밴드 밖 detection은 나오지 않으므로 (추적은 밴드 안에서만) monitoring/roi_crop_benchmark.py로 확인 후 사용
+YOLO_ROI_CROP = False
+ROI_CROP_PAD_RATE = 0.1
+# 추론 백엔드: "ultralytics"(.pt, PyTorch) / "onnxruntime" / "openvino" (CPU, logic/inference_backends.py)
+# onnxruntime/openvino는 MODEL_PATH 옆 export 산출물(parcel_ver0123.onnx, parcel_ver0123_openvino_model/) 사용
+INFERENCE_BACKEND = "ultralytics"
+# True: export 산출물이 없으면 시작 시 export (ultralytics 필요). 미리 만들려면 monitoring/export_model.py
+INFERENCE_AUTO_EXPORT = True
+# onnxruntime/openvino 추론 스레드 수 (0이면 런타임 기본값). 추론 워커 여러 개면 코어 수 / INFERENCE_WORKERS 권장
+INFERENCE_THREADS = 0
+# 500ms 세트 모드: True면 4 cam 프레임을 한 번의 배치 forward로 추론 (YOLODetector.get_detections_batch)
+YOLO_BATCH_INFERENCE = True
+# 상주 추론 워커 수 (워커마다 모델 복제본 1개). CPU 코어/메모리에 맞게 조정.
+# 2 이상이면 세트를 워커 수만큼 앞서 제출(파이프라인)해 동시에 추론. INFERENCE_SCHEDULER/MOTION_GATE와 함께면 파이프라인 없음
+INFERENCE_WORKERS = 1
+# 추론 대기 큐 상한 (가득 차면 submit 블록 = backpressure)
+INFERENCE_QUEUE_SIZE = 8
+# submit 최대 대기(초). None이면 무한 대기, 초과 시 해당 작업 거절
+INFERENCE_SUBMIT_TIMEOUT_SEC = None
+# True: cam별 적응형 추론 주기 (logic/inference_scheduler.py). active track·ROI 근처 detection·도착 예정 master
+# (matcher 큐 + AVG_TRAVEL/TIME_MARGIN)가 없는 cam은 SCHEDULER_IDLE_INTERVAL_SEC마다 한 번만 추론
+INFERENCE_SCHEDULER = False
+SCHEDULER_IDLE_INTERVAL_SEC = 2.0
+# 마지막 ROI 근처 detection 이후 이 시간(초)이 지나야 idle 전환
+SCHEDULER_IDLE_AFTER_SEC = 3.0
+# 도착 예상 구간(expected - TIME_MARGIN)보다 이 시간(초) 먼저 전체 주기로 복귀
+SCHEDULER_LOOKAHEAD_SEC = 1.0
+# True: detection 전 motion gate (logic/motion_gate.py). ROI/EOL 밴드(±max_dy)를 1/DOWNSAMPLE gray로 줄여
+# 마지막 추론 프레임과 비교, 변화 픽셀 비율 < MIN_CHANGED_RATIO이고 직전 결과가 비었으면 추론 생략 (빈 결과 재사용)
+MOTION_GATE = False
+MOTION_GATE_DOWNSAMPLE = 4
+MOTION_GATE_PIXEL_THRESH = 20
+MOTION_GATE_MIN_CHANGED_RATIO = 0.002
+# 연속 생략 상한: 이 프레임 수만큼 생략했으면 변화가 없어도 강제 추론 (0이면 강제 없음)
+MOTION_GATE_FORCE_EVERY = 10
+# INFERENCE_POOL_STATS(워커별 latency) 로그 주기(초)
+INFERENCE_POOL_STATS_INTERVAL_SEC = 10
 OUT_DIR = TRACK_ROOT / "output" / "Parcel_Integration_Log_FIFO"
 VIDEO_DIR = OUT_DIR / "videos"
 CROP_DIR = OUT_DIR / "crops"
@@ -19,12 +57,39 @@ CROP_DIR = OUT_DIR / "crops"
 # -----------------------------------------------------------------------------
 # Ingest (ZMQ / 로컬 USB / stream)
 # -----------------------------------------------------------------------------
-# Raspberry Pi ZMQ 클라이언트 목록 (id, ip, port, cameras)
+# Raspberry Pi ZMQ 클라이언트 목록 (id, ip, port, cameras, wire_format)
+# wire_format: "json"(LZ4+JSON+base64, 기존), "binary"(struct header + JPEG/raw), "auto"(메시지별 판별)
 RBP_CLIENTS = [
-    {"id": "rpi1", "ip": "192.168.1.111", "port": 5555, "cameras": ["usb1", "usb2"]},
-    {"id": "rpi2", "ip": "192.168.1.112", "port": 5555, "cameras": ["usb3"]},
+    {"id": "rpi1", "ip": "192.168.1.111", "port": 5555, "cameras": ["usb1", "usb2"], "wire_format": "auto",
+     "rcvhwm": 60, "conflate": False},
+    {"id": "rpi2", "ip": "192.168.1.112", "port": 5555, "cameras": ["usb3"], "wire_format": "auto",
+     "rcvhwm": 60, "conflate": False},
 ]
 
+# ZMQ 수신: reactor(Poller 스레드 1개)로 모든 SUB 소켓 처리. False면 FrameReceiver별 polling 스레드
+ZMQ_USE_REACTOR = True
+ZMQ_POLL_TIMEOUT_MS = 100   # poll 블로킹 상한 (종료 확인 주기)
+ZMQ_DRAIN_BATCH = 64        # 소켓당 한 번에 드레인할 최대 메시지 수
+# 클라이언트별 rcvhwm 미지정 시 기본 수신 큐 상한 (None이면 ZMQ 기본값 1000).
+# conflate=True면 드레인 배치에서 카메라별 최신 프레임만 디코딩 (time-ordered 모드는 구간 내 여러 프레임이 필요해 기본 False)
+ZMQ_RCVHWM = 60
+# 전처리 리사이즈 가로 폭 (CAM_SETTINGS[cam]["target_width"]로 카메라별 지정 가능)
+PREPROCESS_TARGET_WIDTH = 640
+# True: cam별 전처리 버퍼 재사용 (리사이즈 → 회전을 미리 잡은 배열에 기록)
+PREPROCESS_REUSE_BUFFERS = True
+# True: 전처리에서 YOLO_IMGSZ x YOLO_IMGSZ letterbox 입력까지 생성 (Ultralytics letterbox 생략)
+PREPROCESS_LETTERBOX = False
+# ZMQ JPEG 축소 디코딩 (IMREAD_REDUCED_COLOR_2/4/8): 회전 후 가로가 target_width 이상 남는 최대 배율.
+# 현재 Pi 스트림(1280x720, 90/270 회전)은 회전 후 가로 720이라 배율 1 — 더 큰 해상도·무회전 스트림에서만 효과.
+# 썸네일은 로컬 USB_LOCAL(ZMQ 아님) 전처리 이미지에서 crop하므로 ZMQ 카메라는 원본 해상도가 필요 없음
+ZMQ_REDUCED_DECODE = True
+# ZMQ 프레임 디코딩 워커 수 (0이면 수신 스레드에서 직접 디코딩)
+DECODE_WORKERS = 2
+# 카메라별 디코딩 대기 메시지 상한 (수신 스레드는 블록하지 않고 초과분 중 오래된 메시지를 스킵)
+DECODE_QUEUE_SIZE = 64
+# 카메라별 미처리 프레임 상한. 초과분 중 오래된 프레임은 디코딩 생략 (None이면 TIME_ORDERED_BUFFER_MAXLEN)
+DECODE_MAX_BACKLOG = None
+
 # 로컬 USB 카메라 (device, width, height, fps, enabled)
 LOCAL_USB_CAMERAS = {
     "usb_local_0": {
@@ -34,11 +99,19 @@ LOCAL_USB_CAMERAS = {
         "height": 720,
         "fps": 20,
         "enabled": True,
+        # MJPG: USB 대역폭 절약·고해상도 fps 확보 (YUYV 1280x720은 대개 10fps 이하)
+        "fourcc": "MJPG",
+        # 드라이버 버퍼 timestamp(캡처 시각)를 frame timestamp로 사용 (read() 반환 시각보다 정확)
+        "hw_timestamp": True,
+        # None: 모든 프레임 디코딩. 값 지정 시 grab()은 매 프레임, retrieve()는 이 fps로만
+        "retrieve_fps": None,
     }
 }
 
 # ZMQ 수신 시 LZ4 압축 해제 사용 여부
 STREAM_USE_LZ4 = True
+# True: 수신 frame을 복사하지 않고 읽기 전용(writeable=False)으로 sink·detector까지 공유 (1280x720 BGR 1장 ≈ 2.7MB)
+INGEST_ZERO_COPY = True
 
 # -----------------------------------------------------------------------------
 # Tracking (카메라별 ROI, 이동 시간, 매칭)
@@ -137,6 +210,18 @@ WAIT_FOR_FIRST_SCAN = False
 USE_TIME_ORDERED_BUFFER = True
 # 시간순 버퍼당 카메라별 최대 프레임 수
 TIME_ORDERED_BUFFER_MAXLEN = 60
+# True: 카메라별 (MAXLEN, H, W, 3) uint8 arena를 첫 프레임 때 잡아 슬롯 재사용 (1280x720 기준 cam당 약 166MB 고정).
+# 수신 시 1회 복사하고 꺼낼 때는 슬롯 view. False(기본)면 INGEST_ZERO_COPY로 수신 배열을 복사 없이 보관
+TIME_ORDERED_BUFFER_ARENA = False
+# 종료 상태(PICKUP/DISAPPEAR/MISSING) master를 matcher.masters에 남겨 두는 시간(초, 프레임 ts 기준). 이후 archive로 이동
+MASTER_RETENTION_SEC = 120
+# archive 메모리 상한 (uid 조회 가능한 최근 master 수, 초과 시 오래된 것부터 제거)
+MASTER_ARCHIVE_MAX = 10000
+# archive JSONL 경로 (None이면 파일 기록 안 함). 예: OUT_DIR / "master_archive.jsonl"
+MASTER_ARCHIVE_PATH = None
+# detection ↔ active track 연결 방식 (logic/association.py). greedy_compat: 기존 루프와 동일(detection별 최소 비용 track),
+# greedy: track·detection 1:1 비용 오름차순, hungarian: 1:1 비용 합 최소 (scipy 필요)
+ASSOCIATION_MODE = "greedy_compat"
 # PENDING 해제 시 추가 대기 시간(초). expected += 이 값 후 now_s >= expected 일 때만 DISAPPEAR.
 PENDING_EXTRA_MARGIN_SEC = 0
 # 프레임 ts가 현재 시각보다 이 값(초) 이상 과거면 resolve_pending 호출 생략 (stale frame).
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ZMQ 프레임 디코딩 워커 풀. 수신 스레드(reactor/FrameReceiver)는 raw 메시지를 넣기만 하고,
+워커 N개가 LZ4·base64·imdecode를 병렬 처리한 뒤 stream(카메라)별 수신 순서대로 sink에 전달.
+- 순서 보장: stream별 시퀀스 번호 + 재정렬 버퍼. 먼저 끝난 뒤 프레임은 앞 프레임 전달 시까지 대기.
+- stream별 대기열: 메시지는 stream마다 따로 쌓이고 워커는 대기 중인 stream을 돌아가며 1개씩 꺼냄.
+  submit은 블록하지 않음 — stream 대기열이 상한(max_backlog, queue_size 중 작은 값)을 넘으면
+  가장 오래된 대기 메시지를 디코딩하지 않고 건너뜀 (TimeOrderedFrameBuffer(maxlen)에서 어차피 밀려날 프레임).
+  느린 카메라 하나가 다른 stream이나 reactor 스레드를 막지 않음.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_SKIPPED = object()
+
+
+class _Stream:
+    """stream 1개의 대기열·시퀀스·재정렬 상태."""
+
+    __slots__ = ("lock", "next_seq", "next_deliver", "ready", "skipped", "decoded", "pending", "scheduled")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.next_seq = 0       # 다음 submit에 줄 번호
+        self.next_deliver = 0   # 다음에 전달할 번호
+        self.ready: Dict[int, Any] = {}
+        self.skipped = 0
+        self.decoded = 0
+        # 아래 둘은 DecodePool._cond 안에서만 변경
+        self.pending: Deque[Tuple[int, Callable[[], Any], Callable[[Any], None]]] = deque()
+        self.scheduled = False  # 워커 순번 대기열(_ready_streams)에 들어가 있는지
+
+
+class DecodePool:
+    """
+    submit(stream_key, decode_fn, deliver_fn):
+      decode_fn() → 결과 또는 None(디코딩 실패), 워커 스레드에서 실행.
+      deliver_fn(result) → stream별 submit 순서대로 호출 (None·스킵 결과는 전달하지 않음).
+    workers: 디코딩 스레드 수. queue_size: stream별 대기 메시지 상한.
+    max_backlog: stream별 미처리 상한 (None이면 queue_size만 적용).
+    상한을 넘으면 submit은 블록하지 않고 그 stream의 가장 오래된 대기 메시지를 스킵.
+    """
+
+    def __init__(self, workers: int = 2, queue_size: int = 64, max_backlog: Optional[int] = None):
+        self._num_workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+        self.max_backlog = max_backlog
+        self._limit = self.queue_size if max_backlog is None else max(1, min(self.queue_size, max_backlog))
+        self._streams: Dict[Hashable, _Stream] = {}
+        self._streams_lock = threading.Lock()
+        # 대기열·워커 순번 상태 보호 + 워커 깨우기
+        self._cond = threading.Condition()
+        self._ready_streams: Deque[_Stream] = deque()
+        self._stats_lock = threading.Lock()
+        self._decode_count = 0
+        self._decode_sec = 0.0
+        self._decode_max_sec = 0.0
+        self._failed = 0
+        self._threads: List[threading.Thread] = []
+        self.running = False
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self.running = True
+        for idx in range(self._num_workers):
+            t = threading.Thread(target=self._worker_loop, daemon=True, name=f"decode-worker-{idx}")
+            t.start()
+            self._threads.append(t)
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """대기 중인 메시지는 버리고 워커 종료. 디코딩 중인 워커는 timeout까지만 기다림."""
+        if not self.running:
+            return
+        with self._cond:
+            self.running = False
+            for st in self._ready_streams:
+                st.pending.clear()
+                st.scheduled = False
+            self._ready_streams.clear()
+            self._cond.notify_all()
+        for t in self._threads:
+            t.join(timeout=timeout)
+        self._threads.clear()
+
+    def _stream(self, key: Hashable) -> _Stream:
+        st = self._streams.get(key)
+        if st is None:
+            with self._streams_lock:
+                st = self._streams.setdefault(key, _Stream())
+        return st
+
+    def submit(self, stream_key: Hashable, decode_fn: Callable[[], Any], deliver_fn: Callable[[Any], None]) -> None:
+        st = self._stream(stream_key)
+        dropped = None
+        with self._cond:
+            seq = st.next_seq
+            st.next_seq += 1
+            st.pending.append((seq, decode_fn, deliver_fn))
+            if len(st.pending) > self._limit:
+                dropped = st.pending.popleft()
+            if not st.scheduled:
+                st.scheduled = True
+                self._ready_streams.append(st)
+            self._cond.notify()
+        if dropped is not None:
+            # 순번을 채워야 뒤 프레임이 전달되므로 스킵 결과로 완료 처리
+            self._complete(st, dropped[0], _SKIPPED, dropped[2])
+
+    def _next_job(self):
+        """다음 디코딩 작업 (stream, seq, decode_fn, deliver_fn). 종료 시 None."""
+        with self._cond:
+            while self.running and not self._ready_streams:
+                self._cond.wait()
+            if not self.running:
+                return None
+            st = self._ready_streams.popleft()
+            seq, decode_fn, deliver_fn = st.pending.popleft()
+            # 남은 메시지가 있으면 다른 stream 뒤로 (stream 간 round-robin)
+            if st.pending:
+                self._ready_streams.append(st)
+            else:
+                st.scheduled = False
+            return st, seq, decode_fn, deliver_fn
+
+    def _worker_loop(self) -> None:
+        while True:
+            job = self._next_job()
+            if job is None:
+                break
+            st, seq, decode_fn, deliver_fn = job
+            t0 = time.perf_counter()
+            try:
+                result = decode_fn()
+            except Exception as e:
+                logger.error("Decode error: %s", e)
+                result = None
+            elapsed = time.perf_counter() - t0
+            with self._stats_lock:
+                self._decode_count += 1
+                self._decode_sec += elapsed
+                if elapsed > self._decode_max_sec:
+                    self._decode_max_sec = elapsed
+                if result is None:
+                    self._failed += 1
+            self._complete(st, seq, result, deliver_fn)
+
+    def _complete(self, st: _Stream, seq: int, result: Any, deliver_fn: Callable[[Any], None]) -> None:
+        """결과를 재정렬 버퍼에 넣고, 다음 순번부터 연속된 결과를 전달 (stream lock 안에서 순서대로)."""
+        with st.lock:
+            st.ready[seq] = (result, deliver_fn)
+            while st.next_deliver in st.ready:
+                res, fn = st.ready.pop(st.next_deliver)
+                st.next_deliver += 1
+                if res is _SKIPPED:
+                    st.skipped += 1
+                    continue
+                if res is None:
+                    continue
+                st.decoded += 1
+                try:
+                    fn(res)
+                except Exception as e:
+                    logger.error("Decode deliver error: %s", e)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """queue_depth, 디코딩 시간(평균·최대 ms), 실패 수, stream별 backlog·디코딩·스킵 수."""
+        with self._cond:
+            queue_depth = sum(len(st.pending) for st in self._ready_streams)
+        with self._stats_lock:
+            count = self._decode_count
+            stats = {
+                "queue_depth": queue_depth,
+                "workers": self._num_workers,
+                "decoded": count,
+                "failed": self._failed,
+                "decode_ms_mean": round(self._decode_sec / count * 1000, 3) if count else 0.0,
+                "decode_ms_max": round(self._decode_max_sec * 1000, 3),
+            }
+        with self._streams_lock:
+            streams = list(self._streams.items())
+        per_stream = {}
+        for key, st in streams:
+            with st.lock:
+                per_stream[str(key)] = {
+                    "backlog": st.next_seq - st.next_deliver,
+                    "decoded": st.decoded,
+                    "skipped": st.skipped,
+                }
+        stats["streams"] = per_stream
+        return stats
@@ -8,18 +8,28 @@ from typing import Optional, Tuple, List
 
 import numpy as np
 
+from ingest.frame_ownership import freeze_frame
+
 
 class FrameAggregator:
-    """put(cam_id, frame, ts), get(cam_id) -> (frame, ts) 복사본, get_all_cam_ids()."""
+    """
+    put(cam_id, frame, ts), get(cam_id) -> (frame, ts) 복사본, get_all_cam_ids().
+    zero_copy=True: put은 frame 소유권을 넘겨받아 읽기 전용으로 잠그고, get은 복사 없이 같은 배열 반환.
+    """
 
-    def __init__(self):
+    def __init__(self, zero_copy: bool = False):
         self._lock = threading.Lock()
         self._buffers: dict = {}  # cam_id -> {"frame": ndarray, "timestamp": float}
+        self.zero_copy = zero_copy
 
     def put(self, cam_id: str, frame: np.ndarray, timestamp: float) -> None:
+        if self.zero_copy:
+            frame = freeze_frame(frame)
+        elif frame is not None:
+            frame = frame.copy()
         with self._lock:
             self._buffers[cam_id] = {
-                "frame": frame.copy() if frame is not None else None,
+                "frame": frame,
                 "timestamp": timestamp,
             }
 
@@ -31,7 +41,7 @@ class FrameAggregator:
             f, ts = buf["frame"], buf["timestamp"]
             if f is None:
                 return None
-            return (f.copy(), ts)
+            return (f if self.zero_copy else f.copy(), ts)
 
     def get_all_cam_ids(self) -> List[str]:
         with self._lock:
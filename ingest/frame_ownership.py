@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+프레임 소유권 이전(zero-copy) 헬퍼.
+producer가 넘긴 ndarray를 더 이상 수정하지 않는다는 약속 하에, 복사 대신 writeable=False로 잠가 공유.
+수정이 필요한 consumer(ROI 오버레이 등)는 직접 .copy() 하거나, cv2.rotate/resize 결과(새 배열)에 그림.
+"""
+from typing import Optional
+
+import numpy as np
+
+
+def freeze_frame(frame: Optional[np.ndarray]) -> Optional[np.ndarray]:
+    """frame을 읽기 전용으로 표시하고 그대로 반환 (복사 없음). None은 그대로."""
+    if frame is not None and frame.flags.writeable:
+        frame.flags.writeable = False
+    return frame
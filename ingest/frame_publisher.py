@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+참조용 ZMQ 프레임 퍼블리셔 (Raspberry Pi 송신 측과 같은 포맷).
+로컬 벤치마크·테스트에서 inproc:// / ipc:// 로 FrameReceiver에 json/binary 두 포맷을 보낼 때 사용.
+"""
+import time
+from typing import Optional
+
+import numpy as np
+import zmq
+
+from ingest.wire_format import (
+    WIRE_FORMAT_BINARY,
+    WIRE_FORMAT_JSON,
+    encode_binary_message,
+    encode_json_message,
+)
+
+
+class FramePublisher:
+    """
+    publish(camera, frame, timestamp) → [topic=camera, ...] multipart 송신.
+    wire_format: "json" (LZ4+JSON+base64 JPEG) 또는 "binary" (struct header + payload).
+    encoding: binary 전용, "jpeg" / "raw_bgr" / "raw_gray".
+    """
+
+    def __init__(self, zmq_socket: zmq.Socket, wire_format: str = WIRE_FORMAT_JSON, use_lz4: bool = True,
+                 encoding: str = "jpeg", jpeg_quality: int = 80):
+        if wire_format not in (WIRE_FORMAT_JSON, WIRE_FORMAT_BINARY):
+            raise ValueError(f"unsupported wire_format: {wire_format}")
+        self.zmq_socket = zmq_socket
+        self.wire_format = wire_format
+        self.use_lz4 = use_lz4
+        self.encoding = encoding
+        self.jpeg_quality = jpeg_quality
+        self.sent_count = 0
+        self.sent_bytes = 0
+
+    def encode(self, camera: str, frame: np.ndarray, timestamp: float):
+        if self.wire_format == WIRE_FORMAT_BINARY:
+            return encode_binary_message(camera, camera, frame, timestamp, self.encoding, self.jpeg_quality)
+        return encode_json_message(camera, camera, frame, timestamp, self.use_lz4, self.jpeg_quality)
+
+    def publish(self, camera: str, frame: np.ndarray, timestamp: Optional[float] = None) -> int:
+        """1프레임 송신. 송신 바이트 수 반환."""
+        parts = self.encode(camera, frame, time.time() if timestamp is None else timestamp)
+        self.zmq_socket.send_multipart(parts)
+        n = sum(len(p) for p in parts)
+        self.sent_count += 1
+        self.sent_bytes += n
+        return n
@@ -2,34 +2,65 @@
 # -*- coding: utf-8 -*-
 """
 ZMQ SUB 수신, LZ4/JSON/Base64 디코딩. output_bgr=True 시 BGR 반환.
+wire_format: "json"(기존 LZ4+JSON), "binary"(struct header + JPEG/raw, ingest.wire_format), "auto"(메시지별 판별).
+decode_pool 지정 시 수신 스레드는 메시지를 넘기기만 하고 디코딩은 DecodePool 워커에서 수행.
+reduce_factor_fn(camera, width, height) → 1/2/4/8 지정 시 JPEG를 IMREAD_REDUCED_*로 축소 디코딩.
 """
 import time
 import logging
 import threading
 import json
 import base64
-from typing import Optional, Dict, Any, Callable
+from typing import Optional, Dict, Any, Callable, Tuple
 
 import cv2
 import numpy as np
 import zmq
 import lz4.frame
 
+from ingest.frame_ownership import freeze_frame
+from ingest.wire_format import (
+    WIRE_FORMAT_AUTO,
+    WIRE_FORMAT_BINARY,
+    WIRE_FORMAT_JSON,
+    decode_binary_payload,
+    is_binary_header,
+    reduced_imread_flag,
+    unpack_header,
+)
+
 logger = logging.getLogger(__name__)
 
 
 class FrameReceiver:
-    def __init__(self, zmq_socket: zmq.Socket, use_lz4: bool = True, output_bgr: bool = True):
+    def __init__(self, zmq_socket: zmq.Socket, use_lz4: bool = True, output_bgr: bool = True,
+                 zero_copy: bool = False, wire_format: str = WIRE_FORMAT_AUTO,
+                 decode_pool=None, source_id: str = "",
+                 reduce_factor_fn: Optional[Callable[[str, int, int], int]] = None):
         self.zmq_socket = zmq_socket
         self.use_lz4 = use_lz4
         self.output_bgr = output_bgr
+        self.wire_format = wire_format
+        # True: 디코딩된 frame을 읽기 전용으로 잠가 callback/get_frame에 복사 없이 전달
+        self.zero_copy = zero_copy
+        # decode_pool(ingest.decode_pool.DecodePool): 지정 시 디코딩을 워커 풀에서 병렬 처리
+        self.decode_pool = decode_pool
+        self.source_id = source_id
+        # 카메라별 JPEG 축소 디코딩 배율 (None이면 항상 원본 해상도)
+        self.reduce_factor_fn = reduce_factor_fn
         self.running = False
         self.thread: Optional[threading.Thread] = None
         self.frame_buffers: Dict[str, Dict[str, Any]] = {}
         self.frame_counts: Dict[str, int] = {}
         self.error_counts: Dict[str, int] = {}
+        # decode_pool 사용 시 여러 워커가 동시에 카운터를 갱신하므로 잠금
+        self._counts_lock = threading.Lock()
         self.frame_callback: Optional[Callable[[str, np.ndarray, float], None]] = None
 
+    def _count_error(self, camera_name: str) -> None:
+        with self._counts_lock:
+            self.error_counts[camera_name] = self.error_counts.get(camera_name, 0) + 1
+
     def set_frame_callback(self, callback: Callable[[str, np.ndarray, float], None]):
         self.frame_callback = callback
 
@@ -44,45 +75,121 @@ class FrameReceiver:
             logger.error("Failed to decode message: %s", e)
             return None
 
-    def _process_frame(self, camera_name: str, message: Dict[str, Any]):
+    def _imread_flag(self, camera_name: str, width: int, height: int) -> int:
+        factor = 1
+        if self.reduce_factor_fn is not None and width and height:
+            try:
+                factor = self.reduce_factor_fn(camera_name, width, height)
+            except Exception as e:
+                logger.error("%s reduce factor error: %s", camera_name, e)
+        return reduced_imread_flag(factor, self.output_bgr)
+
+    def _decode_json_frame(self, camera_name: str, message: Dict[str, Any]) -> Optional[Tuple]:
+        """json 포맷: base64 JPEG 디코딩. (camera, frame, timestamp, width, height) 또는 None."""
         try:
             frame_b64 = message.get("frame", "")
             img_bytes = base64.b64decode(frame_b64)
             img_array = np.frombuffer(img_bytes, dtype=np.uint8)
-            frame = cv2.imdecode(img_array, cv2.IMREAD_COLOR if self.output_bgr else cv2.IMREAD_GRAYSCALE)
+            flag = self._imread_flag(camera_name, message.get("width", 0), message.get("height", 0))
+            frame = cv2.imdecode(img_array, flag)
             if frame is None:
                 logger.warning("%s: Failed to decode image", camera_name)
-                return
-            if not self.output_bgr and len(frame.shape) == 3:
-                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            timestamp = message.get("timestamp", time.time())
-            self.frame_buffers[camera_name] = {
-                "frame": frame,
-                "timestamp": timestamp,
-                "width": message.get("width", frame.shape[1]),
-                "height": message.get("height", frame.shape[0]),
-            }
-            self.frame_counts[camera_name] = self.frame_counts.get(camera_name, 0) + 1
-            if self.frame_callback:
-                try:
-                    self.frame_callback(camera_name, frame, timestamp)
-                except Exception as e:
-                    logger.error("Frame callback error: %s", e)
+                return None
+            return (
+                camera_name, frame, message.get("timestamp", time.time()),
+                message.get("width", frame.shape[1]), message.get("height", frame.shape[0]),
+            )
         except Exception as e:
             logger.error("%s frame processing error: %s", camera_name, e)
-            self.error_counts[camera_name] = self.error_counts.get(camera_name, 0) + 1
+            self._count_error(camera_name)
+            return None
+
+    def _decode_binary_frame(self, header_bytes: bytes, payload: bytes) -> Optional[Tuple]:
+        """binary 포맷: struct header + JPEG/raw payload 디코딩. (camera, frame, timestamp, width, height) 또는 None."""
+        header = unpack_header(header_bytes)
+        if header is None:
+            logger.error("Invalid binary frame header")
+            return None
+        try:
+            frame = decode_binary_payload(
+                header, payload, self._imread_flag(header.camera, header.width, header.height)
+            )
+            if frame is None:
+                logger.warning("%s: Failed to decode image", header.camera)
+                return None
+            if self.output_bgr and frame.ndim == 2:
+                frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+            return header.camera, frame, header.timestamp, header.width, header.height
+        except Exception as e:
+            logger.error("%s frame processing error: %s", header.camera, e)
+            self._count_error(header.camera)
+            return None
+
+    def decode_message(self, parts) -> Optional[Tuple]:
+        """
+        multipart 메시지 1개 디코딩 (전달 없음). wire_format에 따라 binary/json 경로 선택 (auto는 header magic으로 판별).
+        (camera, frame, timestamp, width, height) 또는 None.
+        """
+        if len(parts) < 2:
+            return None
+        if (
+            self.wire_format != WIRE_FORMAT_JSON
+            and len(parts) >= 3
+            and is_binary_header(parts[1])
+        ):
+            return self._decode_binary_frame(parts[1], parts[2])
+        if self.wire_format == WIRE_FORMAT_BINARY:
+            logger.error("Non-binary message on binary stream (%d parts)", len(parts))
+            return None
+        topic = parts[0].decode("utf-8")
+        message = self._decode_frame(parts[1])
+        if message is None:
+            return None
+        return self._decode_json_frame(message.get("camera", topic), message)
+
+    def _deliver(self, camera_name: str, frame: np.ndarray, timestamp: float, width: int, height: int):
+        if not self.output_bgr and len(frame.shape) == 3:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if self.zero_copy:
+            frame = freeze_frame(frame)
+        self.frame_buffers[camera_name] = {
+            "frame": frame,
+            "timestamp": timestamp,
+            "width": width,
+            "height": height,
+        }
+        with self._counts_lock:
+            self.frame_counts[camera_name] = self.frame_counts.get(camera_name, 0) + 1
+        if self.frame_callback:
+            try:
+                self.frame_callback(camera_name, frame, timestamp)
+            except Exception as e:
+                logger.error("Frame callback error: %s", e)
+
+    def _deliver_decoded(self, decoded: Tuple) -> None:
+        self._deliver(*decoded)
+
+    def handle_message(self, parts) -> None:
+        """
+        multipart 메시지 1개 처리. decode_pool이 있으면 디코딩을 워커로 넘기고
+        (stream = source_id:topic 단위로 수신 순서대로 전달), 없으면 이 스레드에서 디코딩·전달.
+        """
+        if self.decode_pool is not None:
+            if len(parts) < 2:
+                return
+            stream_key = f"{self.source_id}:{bytes(parts[0]).decode('utf-8', 'replace')}"
+            self.decode_pool.submit(stream_key, lambda: self.decode_message(parts), self._deliver_decoded)
+            return
+        decoded = self.decode_message(parts)
+        if decoded is not None:
+            self._deliver(*decoded)
 
     def _receive_loop(self):
         logger.info("Frame receiver started")
         while self.running:
             try:
                 parts = self.zmq_socket.recv_multipart(zmq.NOBLOCK)
-                if len(parts) >= 2:
-                    topic = parts[0].decode("utf-8")
-                    message = self._decode_frame(parts[1])
-                    if message is not None:
-                        camera_name = message.get("camera", topic)
-                        self._process_frame(camera_name, message)
+                self.handle_message(parts)
             except zmq.Again:
                 time.sleep(0.01)
             except Exception as e:
@@ -104,5 +211,6 @@ class FrameReceiver:
 
     def get_frame(self, camera_name: str) -> Optional[np.ndarray]:
         if camera_name in self.frame_buffers:
-            return self.frame_buffers[camera_name]["frame"].copy()
+            frame = self.frame_buffers[camera_name]["frame"]
+            return frame if self.zero_copy else frame.copy()
         return None
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+카메라 1대용 고정 크기 프레임 링 버퍼.
+arena=True: 첫 프레임 shape으로 (maxlen, H, W, C) uint8 arena를 한 번만 할당하고 슬롯을 제자리 재사용 (append 시 1회 복사).
+  frame()은 슬롯의 읽기 전용 view를 돌려주고 슬롯을 lease 상태로 둠. lease 중인 슬롯 차례가 오면 덮어쓰지 않고
+  그 프레임만 별도 배열로 보관 → 소비자가 release()하기 전까지 view 내용이 바뀌지 않음.
+arena=False: 슬롯에 ndarray 참조만 보관 (zero-copy/복사본 모드).
+timestamp·receive_ts·상태는 슬롯과 나란한 numpy 배열. 중간 제거는 tombstone 처리 후 head만 당김.
+receive_ts는 append 순서대로 단조 증가(역행 시 직전 값으로 보정)하므로 구간 조회는 이진 탐색 O(log n).
+"""
+import logging
+from typing import Iterator, List, Optional
+
+import numpy as np
+
+from ingest.frame_ownership import freeze_frame
+
+logger = logging.getLogger(__name__)
+
+# 슬롯 상태
+_EMPTY = 0      # 제거됨(tombstone) 또는 미사용
+_FRAME = 1      # 프레임 있음
+_NO_FRAME = 2   # put(frame=None)으로 들어온 항목
+
+
+class FrameRing:
+    """
+    논리 순서 i (0 = 가장 오래된 항목) → 물리 슬롯 (head + i) % maxlen.
+    가득 찬 상태에서 append하면 head 슬롯(가장 오래된 항목)을 덮어씀 (deque(maxlen)과 동일).
+    """
+
+    def __init__(self, maxlen: int, arena: bool = False):
+        self.maxlen = max(1, int(maxlen))
+        self.use_arena = arena
+        self._arena: Optional[np.ndarray] = None
+        self._refs = [None] * self.maxlen
+        self._ts = np.zeros(self.maxlen, dtype=np.float64)
+        self._rts = np.zeros(self.maxlen, dtype=np.float64)
+        self._state = np.zeros(self.maxlen, dtype=np.uint8)
+        self._leased = np.zeros(self.maxlen, dtype=bool)
+        self._last_rts = float("-inf")
+        self._head = 0
+        self._count = 0   # head부터 tail까지 슬롯 수 (tombstone 포함)
+        self._live = 0    # 제거되지 않은 항목 수
+
+    def __len__(self) -> int:
+        return self._live
+
+    def clear(self) -> None:
+        self._refs = [None] * self.maxlen
+        self._state[:] = _EMPTY
+        self._leased[:] = False
+        self._head = 0
+        self._count = 0
+        self._live = 0
+
+    def _ensure_arena(self, frame: np.ndarray) -> None:
+        arena = self._arena
+        if arena is not None and arena.shape[1:] == frame.shape and arena.dtype == frame.dtype:
+            return
+        if arena is not None:
+            logger.warning("Frame shape changed %s -> %s, reallocating ring arena", arena.shape[1:], frame.shape)
+            # 버퍼에 남은 이전 shape 프레임은 이전 arena의 view로 계속 보관 (제거되면 이전 arena도 해제)
+            for slot in self.slots():
+                if self._state[slot] == _FRAME and self._refs[slot] is None:
+                    self._refs[slot] = freeze_frame(arena[slot])
+            self._leased[:] = False
+        self._arena = np.empty((self.maxlen,) + frame.shape, dtype=frame.dtype)
+
+    def append(self, frame: Optional[np.ndarray], timestamp: float, receive_ts: float) -> None:
+        if self._count == self.maxlen:
+            self._drop_head_slot()
+        if frame is not None and self.use_arena:
+            self._ensure_arena(frame)
+        slot = (self._head + self._count) % self.maxlen
+        if frame is None:
+            self._state[slot] = _NO_FRAME
+            self._refs[slot] = None
+        else:
+            self._state[slot] = _FRAME
+            if not self.use_arena:
+                self._refs[slot] = frame
+            elif self._leased[slot]:
+                # 이전 프레임 view가 아직 사용 중: 슬롯을 덮어쓰지 않고 이 프레임만 별도 보관
+                self._refs[slot] = freeze_frame(frame.copy())
+            else:
+                np.copyto(self._arena[slot], frame)
+                self._refs[slot] = None
+        # 시스템 시계 역행 시에도 receive_ts 단조성 유지 (이진 탐색 전제)
+        receive_ts = max(receive_ts, self._last_rts)
+        self._last_rts = receive_ts
+        self._ts[slot] = timestamp
+        self._rts[slot] = receive_ts
+        self._count += 1
+        self._live += 1
+
+    def _drop_head_slot(self) -> None:
+        slot = self._head
+        if self._state[slot] != _EMPTY:
+            self._live -= 1
+        self._state[slot] = _EMPTY
+        self._refs[slot] = None
+        self._head = (self._head + 1) % self.maxlen
+        self._count -= 1
+        self._trim_head()
+
+    def _trim_head(self) -> None:
+        while self._count and self._state[self._head] == _EMPTY:
+            self._head = (self._head + 1) % self.maxlen
+            self._count -= 1
+
+    def slots(self) -> Iterator[int]:
+        """살아있는 항목의 물리 슬롯을 오래된 순으로."""
+        for i in range(self._count):
+            slot = (self._head + i) % self.maxlen
+            if self._state[slot] != _EMPTY:
+                yield slot
+
+    def _lower_bound(self, t: float) -> int:
+        """receive_ts >= t 인 첫 논리 인덱스 (tombstone도 receive_ts를 유지하므로 정렬 유지)."""
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._rts[(self._head + mid) % self.maxlen] < t:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def slots_between(self, start_ts: float, end_ts: float) -> List[int]:
+        """receive_ts가 [start_ts, end_ts) 인 살아있는 항목의 슬롯, 오래된 순. O(log n + k)."""
+        lo = self._lower_bound(start_ts)
+        hi = self._lower_bound(end_ts)
+        out = []
+        for i in range(lo, hi):
+            slot = (self._head + i) % self.maxlen
+            if self._state[slot] != _EMPTY:
+                out.append(slot)
+        return out
+
+    def find_receive_ts(self, receive_ts: float) -> Optional[int]:
+        """receive_ts가 일치하는 첫 살아있는 항목의 슬롯."""
+        for i in range(self._lower_bound(receive_ts), self._count):
+            slot = (self._head + i) % self.maxlen
+            if self._rts[slot] != receive_ts:
+                break
+            if self._state[slot] != _EMPTY:
+                return slot
+        return None
+
+    def remove_between(self, start_ts: float, end_ts: float) -> int:
+        """receive_ts가 [start_ts, end_ts) 인 항목 제거. 구간이 head부터면 head를 한 번에 당김. 제거 수 반환."""
+        lo = self._lower_bound(start_ts)
+        hi = self._lower_bound(end_ts)
+        removed = 0
+        for i in range(lo, hi):
+            slot = (self._head + i) % self.maxlen
+            if self._state[slot] != _EMPTY:
+                self._state[slot] = _EMPTY
+                self._refs[slot] = None
+                removed += 1
+        self._live -= removed
+        if lo == 0 and hi:
+            self._head = (self._head + hi) % self.maxlen
+            self._count -= hi
+        self._trim_head()
+        return removed
+
+    def head_slot(self) -> Optional[int]:
+        """가장 오래된 살아있는 항목의 슬롯 (head는 항상 살아있는 항목으로 유지됨)."""
+        return self._head if self._count else None
+
+    def remove(self, slot: int) -> None:
+        if self._state[slot] == _EMPTY:
+            return
+        self._state[slot] = _EMPTY
+        self._refs[slot] = None
+        self._live -= 1
+        self._trim_head()
+
+    def has_frame(self, slot: int) -> bool:
+        return self._state[slot] == _FRAME
+
+    def timestamp(self, slot: int) -> float:
+        return float(self._ts[slot])
+
+    def receive_ts(self, slot: int) -> float:
+        return float(self._rts[slot])
+
+    def frame(self, slot: int) -> Optional[np.ndarray]:
+        """
+        슬롯 프레임 반환 (복사 없음). 참조 모드는 보관 중인 배열 그대로,
+        arena 모드는 슬롯의 읽기 전용 view — release(view) 전까지 슬롯을 덮어쓰지 않음.
+        """
+        if self._state[slot] != _FRAME:
+            return None
+        ref = self._refs[slot]
+        if ref is not None:
+            return ref
+        self._leased[slot] = True
+        view = self._arena[slot]
+        view.flags.writeable = False
+        return view
+
+    def frame_copy(self, slot: int) -> Optional[np.ndarray]:
+        """
+        슬롯 프레임을 lease 없이 반환. arena 모드는 슬롯 내용의 복사본 (슬롯은 바로 재사용 가능),
+        참조 모드·별도 보관 프레임은 이미 다른 곳에서 바뀌지 않는 배열이므로 그대로.
+        """
+        if self._state[slot] != _FRAME:
+            return None
+        ref = self._refs[slot]
+        if ref is not None:
+            return ref
+        return self._arena[slot].copy()
+
+    def release(self, frame: Optional[np.ndarray]) -> bool:
+        """frame()이 준 arena view 사용 종료: 해당 슬롯을 다시 제자리 재사용 가능하게 함. arena view가 아니면 False."""
+        arena = self._arena
+        if frame is None or arena is None or frame.base is not arena:
+            return False
+        offset = frame.__array_interface__["data"][0] - arena.__array_interface__["data"][0]
+        self._leased[offset // arena[0].nbytes] = False
+        return True
+
+    def nbytes(self) -> int:
+        """arena가 차지하는 바이트 수 (참조 모드는 0)."""
+        return int(self._arena.nbytes) if self._arena is not None else 0
@@ -1,29 +1,46 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
-시간순 프레임 버퍼: 카메라별 deque, timestamp 기준 가장 오래된 프레임을 한 장씩 소비.
+시간순 프레임 버퍼: 카메라별 링 버퍼(FrameRing), timestamp 기준 가장 오래된 프레임을 한 장씩 소비.
 disappeared 오판 방지를 위한 프레임 처리 순서 보장.
 프레임 수신 카운터(1초/250ms 구간)로 병목·짝 생성률 분석 지원.
 """
 import threading
 import time
-from collections import deque
+from contextlib import ExitStack, contextmanager
 from typing import Optional, Tuple, List, Dict, Any
 
 import numpy as np
 
+from ingest.frame_ownership import freeze_frame
+from ingest.frame_ring import FrameRing
+
 # 500ms 세트: RPI 카메라 ID (대표 선택 시 중간 인덱스), USB_LOCAL (RPI 평균에 가장 가까운 것)
 RPI_CAM_IDS = ("RPI_USB1", "RPI_USB2", "RPI_USB3")
 USB_LOCAL_ID = "USB_LOCAL"
 
 
 class TimeOrderedFrameBuffer:
-    """카메라별 프레임 버퍼. get_oldest()로 timestamp가 가장 작은 (cam_id, frame, ts) 반환 및 소비."""
+    """
+    카메라별 프레임 버퍼. get_oldest()로 timestamp가 가장 작은 (cam_id, frame, ts) 반환 및 소비.
+    저장소는 카메라별 FrameRing (고정 슬롯, 제자리 재사용).
+    zero_copy=True: put은 frame 소유권을 넘겨받아 읽기 전용으로 잠그고 복사하지 않음.
+    arena=True: 카메라별 (maxlen, H, W, 3) arena에 복사해 보관 (put마다 새 배열 할당 없음). zero_copy보다 우선.
+      extract_set_for_interval은 슬롯의 읽기 전용 view (복사 없음). 다 쓴 뒤 release_frames()로 돌려주면
+      슬롯을 제자리 재사용, 돌려주지 않은 슬롯은 차례가 와도 덮어쓰지 않고 새 프레임을 별도 배열로 보관.
+      get_oldest/get_frames_in_interval은 돌려줄 경로가 없으므로 슬롯 복사본을 반환 (슬롯 lease 없음).
+    락은 카메라별: put은 자기 카메라 락만 잡으므로 다른 카메라 수신 콜백과 경합하지 않음.
+    여러 카메라를 함께 소비하는 get_oldest/extract_set_for_interval만 전체 락을 고정 순서로 잡음.
+    """
 
-    def __init__(self, cam_ids: List[str], maxlen_per_cam: int = 60):
-        self._lock = threading.Lock()
-        self._buffers: Dict[str, deque] = {
-            cid: deque(maxlen=maxlen_per_cam) for cid in cam_ids
+    def __init__(self, cam_ids: List[str], maxlen_per_cam: int = 60, zero_copy: bool = False,
+                 arena: bool = False):
+        self.zero_copy = zero_copy
+        self.arena = arena
+        self._locks: Dict[str, threading.Lock] = {cid: threading.Lock() for cid in cam_ids}
+        self._stats_lock = threading.Lock()
+        self._buffers: Dict[str, FrameRing] = {
+            cid: FrameRing(maxlen_per_cam, arena=arena) for cid in cam_ids
         }
         self._cam_ids = list(cam_ids)
         # 1초 구간별 프레임 수신 카운트 (put 시마다 증가)
@@ -38,65 +55,96 @@ class TimeOrderedFrameBuffer:
         if cam_id not in self._buffers:
             return
         receive_ts = time.time()
-        with self._lock:
-            self._buffers[cam_id].append({
-                "frame": frame.copy() if frame is not None else None,
-                "timestamp": timestamp,
-                "receive_ts": receive_ts,
-            })
+        # arena 모드는 FrameRing이 슬롯으로 직접 복사하므로 여기서는 복사하지 않음
+        if self.zero_copy and not self.arena:
+            frame = freeze_frame(frame)
+        elif frame is not None and not self.arena:
+            frame = frame.copy()
+        with self._locks[cam_id]:
+            self._buffers[cam_id].append(frame, timestamp, receive_ts)
+        with self._stats_lock:
             self._frame_counts[cam_id] = self._frame_counts.get(cam_id, 0) + 1
             elapsed = time.time() - self._window_start
             quarter = int(elapsed / 0.25)
             if 0 <= quarter <= 3:
                 self._quarter_counts[quarter][cam_id] = self._quarter_counts[quarter].get(cam_id, 0) + 1
 
+    @contextmanager
+    def _all_locks(self):
+        """전 카메라 락을 _cam_ids 순서로 획득 (put은 락 1개만 잡으므로 교착 없음)."""
+        with ExitStack() as stack:
+            for cid in self._cam_ids:
+                stack.enter_context(self._locks[cid])
+            yield
+
     def peek_oldest_per_cam(self) -> List[Tuple[str, float]]:
         """
         카메라별 버퍼의 가장 오래된 프레임의 (cam_id, timestamp) 목록 반환. 제거하지 않음.
         짝 맞춤 모니터링용: 4개 카메라가 모두 있는지, timestamp 범위는 얼마인지 확인.
         """
-        with self._lock:
-            out = []
-            for cid in self._cam_ids:
-                buf = self._buffers[cid]
-                if not buf:
-                    continue
-                head = buf[0]
-                if head["frame"] is None:
+        out = []
+        for cid in self._cam_ids:
+            with self._locks[cid]:
+                ring = self._buffers[cid]
+                slot = ring.head_slot()
+                if slot is None or not ring.has_frame(slot):
                     continue
-                out.append((cid, head["timestamp"]))
-            return out
+                out.append((cid, ring.timestamp(slot)))
+        return out
 
     def get_oldest(self) -> Optional[Tuple[str, np.ndarray, float]]:
         """
         모든 버퍼 중 timestamp가 가장 작은 (cam_id, frame, ts) 반환. 해당 항목은 제거됨.
+        arena 모드에서는 슬롯 복사본 (release 불필요).
         None이면 처리할 프레임 없음.
         """
-        with self._lock:
+        with self._all_locks():
             candidates = []
             for cid in self._cam_ids:
-                buf = self._buffers[cid]
-                if not buf:
+                ring = self._buffers[cid]
+                slot = ring.head_slot()
+                if slot is None:
                     continue
-                head = buf[0]
-                if head["frame"] is None:
-                    buf.popleft()
+                if not ring.has_frame(slot):
+                    ring.remove(slot)
                     continue
-                candidates.append((head["timestamp"], cid, head))
+                candidates.append((ring.timestamp(slot), cid, slot))
             if not candidates:
                 return None
             candidates.sort(key=lambda x: x[0])
-            ts, cid, head = candidates[0]
-            self._buffers[cid].popleft()
-            return (cid, head["frame"], ts)
+            ts, cid, slot = candidates[0]
+            ring = self._buffers[cid]
+            frame = ring.frame_copy(slot)
+            ring.remove(slot)
+            return (cid, frame, ts)
+
+    def release_frames(self, frames: Dict[str, Tuple[Optional[np.ndarray], float]]) -> None:
+        """extract_set_for_interval 세트 사용 종료 (arena view의 슬롯 lease 해제). arena 모드가 아니면 아무것도 안 함."""
+        if not self.arena:
+            return
+        for cid, (frame, _) in frames.items():
+            if cid in self._buffers:
+                with self._locks[cid]:
+                    self._buffers[cid].release(frame)
 
     def get_all_cam_ids(self) -> List[str]:
         return list(self._cam_ids)
 
     def buffer_lengths(self) -> Dict[str, int]:
         """디버그/모니터링: 카메라별 버퍼 길이."""
-        with self._lock:
-            return {cid: len(self._buffers[cid]) for cid in self._cam_ids}
+        out = {}
+        for cid in self._cam_ids:
+            with self._locks[cid]:
+                out[cid] = len(self._buffers[cid])
+        return out
+
+    def arena_nbytes(self) -> int:
+        """모니터링: arena 모드에서 카메라별 arena 총 바이트 수 (고정값)."""
+        total = 0
+        for cid in self._cam_ids:
+            with self._locks[cid]:
+                total += self._buffers[cid].nbytes()
+        return total
 
     def get_stats_and_reset(self) -> Tuple[Dict[str, int], List[Dict[str, int]]]:
         """
@@ -105,7 +153,7 @@ class TimeOrderedFrameBuffer:
           frame_counts: cam_id -> 수신 프레임 수
           quarter_counts: [q0, q1, q2, q3], 각 q는 cam_id -> 해당 250ms 구간 수신 수
         """
-        with self._lock:
+        with self._stats_lock:
             frame_counts = dict(self._frame_counts)
             quarter_counts = [dict(q) for q in self._quarter_counts]
             self._frame_counts = {cid: 0 for cid in self._cam_ids}
@@ -113,75 +161,62 @@ class TimeOrderedFrameBuffer:
             self._window_start = time.time()
         return frame_counts, quarter_counts
 
+    def _slots_in_interval(self, ring: FrameRing, start_ts: float, end_ts: float) -> List[int]:
+        """구간 [start_ts, end_ts) (receive_ts 기준) 내 프레임 있는 슬롯, 오래된 순. 이진 탐색 O(log n + k)."""
+        return [slot for slot in ring.slots_between(start_ts, end_ts) if ring.has_frame(slot)]
+
     def get_frames_in_interval(
         self, start_ts: float, end_ts: float
     ) -> Dict[str, List[Dict[str, Any]]]:
         """
         구간 [start_ts, end_ts) 내 프레임을 카메라별로 수집 (receive_ts 기준). 제거하지 않음.
+        arena 모드에서는 슬롯 복사본 (release 불필요).
         Returns: { cam_id: [ {"frame", "timestamp", "receive_ts"}, ... ], ... }
         """
-        with self._lock:
-            out: Dict[str, List[Dict[str, Any]]] = {}
-            for cid in self._cam_ids:
-                buf = self._buffers[cid]
+        out: Dict[str, List[Dict[str, Any]]] = {}
+        for cid in self._cam_ids:
+            with self._locks[cid]:
+                ring = self._buffers[cid]
                 items = [
-                    {"frame": x["frame"], "timestamp": x["timestamp"], "receive_ts": x["receive_ts"]}
-                    for x in buf
-                    if x["frame"] is not None
-                    and start_ts <= x["receive_ts"] < end_ts
+                    {"frame": ring.frame_copy(slot), "timestamp": ring.timestamp(slot), "receive_ts": ring.receive_ts(slot)}
+                    for slot in self._slots_in_interval(ring, start_ts, end_ts)
                 ]
-                if items:
-                    out[cid] = items
-            return out
+            if items:
+                out[cid] = items
+        return out
 
     def remove_frame(self, cam_id: str, receive_ts: float) -> bool:
         """
-        해당 cam의 deque에서 receive_ts가 일치하는 첫 번째 항목 1개만 제거.
+        해당 cam 버퍼에서 receive_ts가 일치하는 첫 번째 항목 1개만 제거.
         Returns: True if removed, False if not found.
         """
         if cam_id not in self._buffers:
             return False
-        with self._lock:
-            buf = self._buffers[cam_id]
-            kept = []
-            removed = False
-            for _ in range(len(buf)):
-                x = buf.popleft()
-                if not removed and x.get("receive_ts") == receive_ts:
-                    removed = True
-                    continue
-                kept.append(x)
-            for x in kept:
-                buf.append(x)
-            return removed
+        with self._locks[cam_id]:
+            ring = self._buffers[cam_id]
+            slot = ring.find_receive_ts(receive_ts)
+            if slot is None:
+                return False
+            ring.remove(slot)
+            return True
 
     def remove_frames_in_interval(self, start_ts: float, end_ts: float) -> None:
-        """구간 [start_ts, end_ts) 내 모든 프레임을 receive_ts 기준으로 카메라별 deque에서 제거."""
-        with self._lock:
-            for cid in self._cam_ids:
-                buf = self._buffers[cid]
-                kept = [
-                    x
-                    for x in buf
-                    if not (start_ts <= x.get("receive_ts", x["timestamp"]) < end_ts)
-                ]
-                buf.clear()
-                for x in kept:
-                    buf.append(x)
+        """구간 [start_ts, end_ts) 내 모든 프레임을 receive_ts 기준으로 카메라별 버퍼에서 제거."""
+        for cid in self._cam_ids:
+            with self._locks[cid]:
+                self._buffers[cid].remove_between(start_ts, end_ts)
 
     def get_min_timestamp(self) -> Optional[float]:
         """버퍼에 있는 카메라별 가장 오래된 프레임의 receive_ts 중 최소값. 한 cam이라도 비어 있으면 None."""
-        with self._lock:
-            ts_list = []
-            for cid in self._cam_ids:
-                buf = self._buffers[cid]
-                if not buf:
-                    return None
-                head = buf[0]
-                if head["frame"] is None:
+        ts_list = []
+        for cid in self._cam_ids:
+            with self._locks[cid]:
+                ring = self._buffers[cid]
+                slot = ring.head_slot()
+                if slot is None or not ring.has_frame(slot):
                     return None
-                ts_list.append(head.get("receive_ts", head["timestamp"]))
-            return min(ts_list) if ts_list else None
+                ts_list.append(ring.receive_ts(slot))
+        return min(ts_list) if ts_list else None
 
     def extract_set_for_interval(
         self, start_ts: float, end_ts: float
@@ -191,35 +226,26 @@ class TimeOrderedFrameBuffer:
         RPI: 구간 내 중간 인덱스; USB_LOCAL: RPI 3대표 timestamp 평균에 가장 가까운 1장.
         Returns: { cam_id: (frame, timestamp), ... } — downstream은 원본 캡처 timestamp 사용.
         """
-        with self._lock:
+        with self._all_locks():
             # 수집: receive_ts 기준 (서버 수신 시각으로 윈도우 정렬 → 클럭 스큐 방지)
-            by_cam: Dict[str, List[Dict[str, Any]]] = {}
+            by_cam: Dict[str, List[int]] = {}
             for cid in self._cam_ids:
-                buf = self._buffers[cid]
-                items = [
-                    {"frame": x["frame"], "timestamp": x["timestamp"], "receive_ts": x.get("receive_ts", x["timestamp"])}
-                    for x in buf
-                    if x["frame"] is not None
-                    and start_ts <= x.get("receive_ts", x["timestamp"]) < end_ts
-                ]
-                if not items:
+                slots = self._slots_in_interval(self._buffers[cid], start_ts, end_ts)
+                if not slots:
                     return None
-                by_cam[cid] = items
+                by_cam[cid] = slots
             if len(by_cam) != len(self._cam_ids):
                 return None
 
             # RPI 대표: 중간 인덱스
             rpi_timestamps = []
-            selected: Dict[str, Tuple[np.ndarray, float]] = {}
-            selected_receive_ts: Dict[str, float] = {}
+            selected_slot: Dict[str, int] = {}
             for cid in self._cam_ids:
                 if cid in RPI_CAM_IDS:
-                    lst = by_cam[cid]
-                    idx = len(lst) // 2
-                    item = lst[idx]
-                    selected[cid] = (item["frame"], item["timestamp"])
-                    selected_receive_ts[cid] = item["receive_ts"]
-                    rpi_timestamps.append(item["timestamp"])
+                    slots = by_cam[cid]
+                    slot = slots[len(slots) // 2]
+                    selected_slot[cid] = slot
+                    rpi_timestamps.append(self._buffers[cid].timestamp(slot))
                 # USB_LOCAL_ID는 아래에서 rpi_avg 구한 뒤 선택
 
             if not rpi_timestamps:
@@ -228,27 +254,19 @@ class TimeOrderedFrameBuffer:
 
             # USB_LOCAL: RPI 평균에 가장 가까운 1장
             if USB_LOCAL_ID in self._cam_ids:
-                usb_list = by_cam[USB_LOCAL_ID]
-                best = min(usb_list, key=lambda x: abs(x["timestamp"] - rpi_avg))
-                selected[USB_LOCAL_ID] = (best["frame"], best["timestamp"])
-                selected_receive_ts[USB_LOCAL_ID] = best["receive_ts"]
+                ring = self._buffers[USB_LOCAL_ID]
+                selected_slot[USB_LOCAL_ID] = min(
+                    by_cam[USB_LOCAL_ID], key=lambda s: abs(ring.timestamp(s) - rpi_avg)
+                )
 
-            if len(selected) != len(self._cam_ids):
+            if len(selected_slot) != len(self._cam_ids):
                 return None
 
-            # 버퍼에서 선택된 4장만 제거 (receive_ts로 일치)
-            for cid in self._cam_ids:
-                rt = selected_receive_ts[cid]
-                buf = self._buffers[cid]
-                kept = []
-                removed = False
-                for _ in range(len(buf)):
-                    x = buf.popleft()
-                    if not removed and x.get("receive_ts") == rt:
-                        removed = True
-                        continue
-                    kept.append(x)
-                for x in kept:
-                    buf.append(x)
+            # 선택된 4장만 꺼내고 버퍼에서 제거
+            selected: Dict[str, Tuple[np.ndarray, float]] = {}
+            for cid, slot in selected_slot.items():
+                ring = self._buffers[cid]
+                selected[cid] = (ring.frame(slot), ring.timestamp(slot))
+                ring.remove(slot)
 
             return selected
@@ -2,17 +2,41 @@
 # -*- coding: utf-8 -*-
 """
 로컬 USB 카메라 OpenCV 캡처. get_latest_frame(), latest_timestamp, start(), stop().
+set_frame_callback(cb) 등록 시 새로 캡처한 프레임마다 cb(camera_name, frame, timestamp)를 정확히 1번 호출 (push).
+camera_config 캡처 옵션:
+  fourcc: "MJPG" 등 (V4L2 포맷 협상 요청, 미지정 시 드라이버 기본)
+  hw_timestamp: True면 드라이버 버퍼 timestamp(CAP_PROP_POS_MSEC, monotonic)를 wall-clock으로 변환해 사용
+  retrieve_fps: 지정 시 grab()은 매 프레임, retrieve()(디코딩)는 이 주기로만 수행 → 나머지는 디코딩 없이 버림
 """
 import time
 import logging
 import threading
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable
 
 import cv2
 import numpy as np
 
+from ingest.frame_ownership import freeze_frame
+
 logger = logging.getLogger(__name__)
 
+# 버퍼 timestamp 변환값이 현재 시각과 이보다 크게 어긋나면 (드라이버가 다른 clock 사용 등) time.time()으로 대체
+HW_TIMESTAMP_MAX_SKEW_SEC = 1.0
+
+
+def buffer_ts_to_wall(pos_msec: float, now_wall: float, now_mono: float,
+                      max_skew: float = HW_TIMESTAMP_MAX_SKEW_SEC) -> Optional[float]:
+    """
+    V4L2 버퍼 timestamp(ms, CLOCK_MONOTONIC) → wall-clock 초.
+    변환 불가(0 이하)이거나 now_wall과 max_skew 이상 차이 나면 None (호출 측에서 time.time() 사용).
+    """
+    if not pos_msec or pos_msec <= 0:
+        return None
+    ts = now_wall - (now_mono - pos_msec / 1000.0)
+    if abs(now_wall - ts) > max_skew:
+        return None
+    return ts
+
 
 class USBCameraWorker:
     def __init__(self, camera_name: str, camera_config: Dict[str, Any]):
@@ -26,6 +50,19 @@ class USBCameraWorker:
         self.last_capture_time = None
         self.latest_frame: Optional[np.ndarray] = None
         self.latest_timestamp: float = 0.0
+        # 캡처 순번 (1부터). latest_frame과 함께 갱신
+        self.frame_seq = 0
+        self.frame_callback: Optional[Callable[[str, np.ndarray, float], None]] = None
+        self.use_hw_timestamp = bool(camera_config.get("hw_timestamp", False))
+        retrieve_fps = camera_config.get("retrieve_fps")
+        self.retrieve_interval = 1.0 / retrieve_fps if retrieve_fps else 0.0
+        self.dropped_count = 0      # grab만 하고 retrieve하지 않은 프레임 수
+        self.hw_ts_fallbacks = 0    # 버퍼 timestamp를 쓰지 못하고 time.time()으로 대체한 수
+        self._last_retrieve_ts = 0.0
+
+    def set_frame_callback(self, callback: Callable[[str, np.ndarray, float], None]):
+        """start() 전에 등록. 캡처 스레드에서 호출되므로 callback은 짧게 (sink.put 정도)."""
+        self.frame_callback = callback
 
     def initialize(self) -> bool:
         try:
@@ -41,6 +78,10 @@ class USBCameraWorker:
             if not self.cap.isOpened():
                 logger.error("Failed to open USB camera: %s", device)
                 return False
+            fourcc = self.camera_config.get("fourcc")
+            if fourcc:
+                # FOURCC는 해상도보다 먼저 지정해야 드라이버가 해당 포맷으로 협상
+                self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
             ret, _ = self.cap.read()
             if ret:
                 pass
@@ -63,17 +104,58 @@ class USBCameraWorker:
         ret, frame = self.cap.read()
         return frame if ret and frame is not None else None
 
+    def _frame_timestamp(self) -> float:
+        """방금 grab/read한 프레임의 timestamp. hw_timestamp면 드라이버 버퍼 시각, 아니면 time.time()."""
+        now_wall = time.time()
+        if not self.use_hw_timestamp:
+            return now_wall
+        ts = buffer_ts_to_wall(self.cap.get(cv2.CAP_PROP_POS_MSEC), now_wall, time.monotonic())
+        if ts is None:
+            self.hw_ts_fallbacks += 1
+            return now_wall
+        return ts
+
+    def _grab_and_retrieve(self):
+        """grab() 후 retrieve_interval이 지났을 때만 retrieve()(디코딩). (frame, ts), 버린 프레임은 (None, ts)."""
+        if self.cap is None or not self.cap.isOpened() or not self.cap.grab():
+            return None, None
+        ts = self._frame_timestamp()
+        if ts - self._last_retrieve_ts < self.retrieve_interval:
+            self.dropped_count += 1
+            return None, ts
+        ret, frame = self.cap.retrieve()
+        if not ret or frame is None:
+            return None, None
+        self._last_retrieve_ts = ts
+        return frame, ts
+
     def _worker_loop(self):
+        # read()/grab()이 다음 프레임까지 블록하므로 sleep 없이 돌고, 실패 시에만 잠깐 쉼
+        split = self.retrieve_interval > 0
         while self.running:
-            frame = self._capture_usb_frame()
+            if split:
+                frame, ts = self._grab_and_retrieve()
+                if frame is None and ts is not None:
+                    continue
+            else:
+                frame = self._capture_usb_frame()
+                ts = self._frame_timestamp() if frame is not None else None
             if frame is not None:
-                self.latest_frame = frame.copy()
-                self.latest_timestamp = time.time()
+                # cap.read()/retrieve()는 매번 새 배열을 반환하므로 복사 없이 잠가서 보관 (get_latest_frame이 공유)
+                frame = freeze_frame(frame)
+                self.latest_frame = frame
+                self.latest_timestamp = ts
+                self.frame_seq += 1
                 self.frame_count += 1
                 self.last_capture_time = time.time()
+                if self.frame_callback:
+                    try:
+                        self.frame_callback(self.camera_name, frame, ts)
+                    except Exception as e:
+                        logger.error("%s frame callback error: %s", self.camera_name, e)
             else:
                 self.error_count += 1
-            time.sleep(0.01)
+                time.sleep(0.01)
         logger.info("USB camera worker stopped: %s", self.camera_name)
 
     def start(self) -> bool:
@@ -97,7 +179,9 @@ class USBCameraWorker:
                 pass
             self.cap = None
 
-    def get_latest_frame(self) -> Optional[np.ndarray]:
-        if self.latest_frame is not None:
-            return self.latest_frame.copy()
+    def get_latest_frame(self, copy: bool = True) -> Optional[np.ndarray]:
+        """copy=False면 읽기 전용 배열을 복사 없이 반환 (소비자가 수정하지 않을 때)."""
+        frame = self.latest_frame
+        if frame is not None:
+            return frame.copy() if copy else frame
         return None
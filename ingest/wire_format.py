@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ZMQ 프레임 전송 포맷.
+- json (기존): multipart [topic, LZ4(JSON{camera, frame: base64 JPEG, timestamp, width, height})]
+- binary: multipart [topic, header, payload]
+    header = 고정 struct (magic, version, encoding, width, height, timestamp) + camera 이름(UTF-8)
+    payload = JPEG 바이트 그대로 또는 raw 픽셀 (BGR / GRAY, C-order)
+binary는 JSON 파싱·base64(+33%)·LZ4 단계가 없고, raw 픽셀은 복사 없이 ndarray view로 복원.
+"""
+import base64
+import json
+import struct
+from typing import List, NamedTuple, Optional
+
+import cv2
+import numpy as np
+import lz4.frame
+
+WIRE_FORMAT_JSON = "json"
+WIRE_FORMAT_BINARY = "binary"
+WIRE_FORMAT_AUTO = "auto"
+
+WIRE_MAGIC = b"TRKF"
+WIRE_VERSION = 1
+
+ENCODING_JPEG = 0
+ENCODING_RAW_BGR = 1
+ENCODING_RAW_GRAY = 2
+_ENCODING_NAMES = {"jpeg": ENCODING_JPEG, "raw_bgr": ENCODING_RAW_BGR, "raw_gray": ENCODING_RAW_GRAY}
+
+# JPEG 축소 디코딩 (libjpeg DCT 스케일링): 축소 배율 → imread flag
+_REDUCED_COLOR_FLAGS = {
+    1: cv2.IMREAD_COLOR, 2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4, 8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+_REDUCED_GRAY_FLAGS = {
+    1: cv2.IMREAD_GRAYSCALE, 2: cv2.IMREAD_REDUCED_GRAYSCALE_2,
+    4: cv2.IMREAD_REDUCED_GRAYSCALE_4, 8: cv2.IMREAD_REDUCED_GRAYSCALE_8,
+}
+
+# magic(4s) version(B) encoding(B) width(H) height(H) timestamp(d) camera_len(B)
+_HEADER = struct.Struct("<4sBBHHdB")
+
+
+class FrameHeader(NamedTuple):
+    camera: str
+    timestamp: float
+    width: int
+    height: int
+    encoding: int
+
+
+def pack_header(camera: str, timestamp: float, width: int, height: int, encoding: int) -> bytes:
+    name = camera.encode("utf-8")
+    if len(name) > 255:
+        raise ValueError("camera name too long for wire header")
+    return _HEADER.pack(WIRE_MAGIC, WIRE_VERSION, encoding, width, height, timestamp, len(name)) + name
+
+
+def is_binary_header(data) -> bool:
+    return len(data) >= _HEADER.size and bytes(data[:4]) == WIRE_MAGIC
+
+
+def unpack_header(data) -> Optional[FrameHeader]:
+    """binary header 해석. magic/version 불일치·길이 부족이면 None."""
+    if not is_binary_header(data):
+        return None
+    magic, version, encoding, width, height, timestamp, name_len = _HEADER.unpack_from(data, 0)
+    if version != WIRE_VERSION or len(data) < _HEADER.size + name_len:
+        return None
+    camera = bytes(data[_HEADER.size:_HEADER.size + name_len]).decode("utf-8")
+    return FrameHeader(camera, timestamp, width, height, encoding)
+
+
+def choose_reduce_factor(width: int, height: int, rotate: int, target_width: int) -> int:
+    """
+    회전 후 가로가 target_width 이상으로 남는 가장 큰 2의 거듭제곱 축소 배율 (1/2/4/8).
+    전처리가 어차피 target_width로 줄이므로 그 이상 해상도의 디코딩은 버려지는 픽셀.
+    """
+    if not width or not height or not target_width:
+        return 1
+    eff_w = height if rotate in (90, 270) else width
+    for factor in (8, 4, 2):
+        if eff_w // factor >= target_width:
+            return factor
+    return 1
+
+
+def reduced_imread_flag(factor: int, color: bool = True) -> int:
+    """축소 배율 → cv2.imdecode flag (지원하지 않는 배율은 원본 해상도)."""
+    flags = _REDUCED_COLOR_FLAGS if color else _REDUCED_GRAY_FLAGS
+    return flags.get(factor, flags[1])
+
+
+def decode_binary_payload(header: FrameHeader, payload, imread_flag: int = cv2.IMREAD_COLOR) -> Optional[np.ndarray]:
+    """
+    payload → ndarray. JPEG은 imdecode, raw는 버퍼 위 읽기 전용 view (복사 없음).
+    크기 불일치 등 해석 불가면 None.
+    """
+    if header.encoding == ENCODING_JPEG:
+        return cv2.imdecode(np.frombuffer(payload, dtype=np.uint8), imread_flag)
+    if header.encoding == ENCODING_RAW_BGR:
+        shape = (header.height, header.width, 3)
+    elif header.encoding == ENCODING_RAW_GRAY:
+        shape = (header.height, header.width)
+    else:
+        return None
+    arr = np.frombuffer(payload, dtype=np.uint8)
+    if arr.size != int(np.prod(shape)):
+        return None
+    return arr.reshape(shape)
+
+
+def encode_binary_message(topic: str, camera: str, frame: np.ndarray, timestamp: float,
+                          encoding: str = "jpeg", jpeg_quality: int = 80) -> List[bytes]:
+    """binary 포맷 multipart [topic, header, payload] 생성."""
+    enc = _ENCODING_NAMES[encoding]
+    h, w = frame.shape[:2]
+    if enc == ENCODING_JPEG:
+        ok, buf = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality])
+        if not ok:
+            raise ValueError("JPEG encode failed")
+        payload = buf.tobytes()
+    else:
+        payload = np.ascontiguousarray(frame).tobytes()
+    return [topic.encode("utf-8"), pack_header(camera, timestamp, w, h, enc), payload]
+
+
+def encode_json_message(topic: str, camera: str, frame: np.ndarray, timestamp: float,
+                        use_lz4: bool = True, jpeg_quality: int = 80) -> List[bytes]:
+    """기존 json 포맷 multipart [topic, LZ4(JSON)] 생성 (FrameReceiver._decode_frame 대응)."""
+    ok, buf = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality])
+    if not ok:
+        raise ValueError("JPEG encode failed")
+    h, w = frame.shape[:2]
+    body = json.dumps({
+        "camera": camera,
+        "frame": base64.b64encode(buf).decode("ascii"),
+        "timestamp": timestamp,
+        "width": w,
+        "height": h,
+    }).encode("utf-8")
+    if use_lz4:
+        body = lz4.frame.compress(body)
+    return [topic.encode("utf-8"), body]
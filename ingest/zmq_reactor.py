@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ZMQ SUB 소켓 reactor. FrameReceiver마다 NOBLOCK + 10ms sleep 스레드를 돌리는 대신,
+스레드 1개가 zmq.Poller로 모든 소켓을 블로킹 대기하고 readable 소켓을 배치로 드레인해
+각 FrameReceiver.handle_message로 넘김.
+"""
+import logging
+import threading
+from typing import Dict, List, Optional
+
+import zmq
+
+logger = logging.getLogger(__name__)
+
+
+def configure_sub_socket(sock: zmq.Socket, rcvhwm: Optional[int] = None) -> None:
+    """
+    SUB 소켓 수신 옵션. connect 전에 호출해야 적용됨.
+    rcvhwm: 수신 큐 상한(메시지 수). 넘치면 ZMQ가 새 메시지를 소켓에서 버림 (디코딩 전 폐기).
+    ZMQ_CONFLATE는 multipart 메시지를 지원하지 않아 (json/binary 모두 multipart) 쓰지 않고,
+    같은 효과는 ZmqReactor.add(conflate=True)의 드레인 단계에서 처리.
+    """
+    if rcvhwm is not None:
+        sock.setsockopt(zmq.RCVHWM, int(rcvhwm))
+
+
+class ZmqReactor:
+    """
+    add(receiver, conflate)로 FrameReceiver(소켓 포함)를 등록 후 start().
+    poll_timeout_ms: poll 블로킹 상한 (stop 확인 주기). 메시지가 오면 즉시 깨어남.
+    max_batch: 소켓 1개에서 한 번에 드레인할 최대 메시지 수 (다른 소켓 기아 방지).
+    conflate=True: 드레인한 배치에서 topic(카메라)별 최신 메시지만 디코딩하고 나머지는 버림.
+    """
+
+    def __init__(self, poll_timeout_ms: int = 100, max_batch: int = 64):
+        self.poll_timeout_ms = poll_timeout_ms
+        self.max_batch = max(1, max_batch)
+        self._poller = zmq.Poller()
+        self._entries: Dict[zmq.Socket, Dict] = {}
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+
+    def add(self, receiver, conflate: bool = False) -> None:
+        if self.running:
+            raise RuntimeError("ZmqReactor.add() must be called before start()")
+        sock = receiver.zmq_socket
+        self._entries[sock] = {"receiver": receiver, "conflate": conflate, "received": 0, "dropped_stale": 0}
+        self._poller.register(sock, zmq.POLLIN)
+
+    def _drain(self, sock: zmq.Socket) -> List[List[bytes]]:
+        batch = []
+        for _ in range(self.max_batch):
+            try:
+                batch.append(sock.recv_multipart(zmq.NOBLOCK))
+            except zmq.Again:
+                break
+        return batch
+
+    def _dispatch(self, sock: zmq.Socket, batch: List[List[bytes]]) -> None:
+        entry = self._entries[sock]
+        entry["received"] += len(batch)
+        if entry["conflate"] and len(batch) > 1:
+            latest: Dict[bytes, List[bytes]] = {}
+            for parts in batch:
+                latest[parts[0]] = parts
+            entry["dropped_stale"] += len(batch) - len(latest)
+            batch = list(latest.values())
+        receiver = entry["receiver"]
+        for parts in batch:
+            try:
+                receiver.handle_message(parts)
+            except Exception as e:
+                logger.error("Reactor dispatch error: %s", e)
+
+    def _loop(self) -> None:
+        logger.info("ZMQ reactor started (%d sockets)", len(self._entries))
+        while self.running:
+            try:
+                events = dict(self._poller.poll(self.poll_timeout_ms))
+            except zmq.ZMQError as e:
+                if not self.running:
+                    break
+                logger.error("Reactor poll error: %s", e)
+                continue
+            for sock in events:
+                batch = self._drain(sock)
+                if batch:
+                    self._dispatch(sock, batch)
+        logger.info("ZMQ reactor stopped")
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._loop, daemon=True, name="zmq-reactor")
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=2.0)
+
+    def get_stats(self) -> List[Dict]:
+        """소켓별 수신 수·conflate로 버린 수."""
+        return [
+            {"received": e["received"], "dropped_stale": e["dropped_stale"], "conflate": e["conflate"]}
+            for e in self._entries.values()
+        ]
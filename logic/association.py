@@ -0,0 +1,85 @@
+# association.py - track/logic
+"""
+cam별 detection ↔ active track 연결. detection 중심(cx, cy)과 track last_pos로 비용 행렬을 numpy로 한 번에 계산:
+dx = |cx - tx|, dy = (cy - ty) * forward_sign, 비용 = dx + dy * 0.3.
+dx > dist_eps, dy < -DY_BACK_TOLERANCE, dy > max_dy인 쌍은 gate로 제외(inf).
+모드:
+  greedy_compat: 기존 main 루프와 동일 — detection마다 비용 최소 track (동점이면 앞 track), 여러 detection이 같은 track 선택 가능
+  greedy: 비용 오름차순으로 track·detection 각각 한 번만 배정
+  hungarian: 전체 비용 합 최소 1:1 배정 (scipy 필요, 지연 import)
+반환: detection별 track index 배열 (-1 = 새 track). main이 track uid로 바꿔 visualizer에 그대로 넘김.
+"""
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+ASSOC_GREEDY_COMPAT = "greedy_compat"
+ASSOC_GREEDY = "greedy"
+ASSOC_HUNGARIAN = "hungarian"
+ASSOC_MODES = (ASSOC_GREEDY_COMPAT, ASSOC_GREEDY, ASSOC_HUNGARIAN)
+
+# 진행 반대 방향으로 이 픽셀까지는 같은 track으로 허용 (기존 dy < -5 gate)
+DY_BACK_TOLERANCE = 5
+DY_WEIGHT = 0.3
+
+Point = Tuple[float, float]
+
+
+def cost_matrix(det_centers: Sequence[Point], track_positions: Sequence[Point], forward_sign: int,
+                dist_eps: float, max_dy: float) -> np.ndarray:
+    """(D, T) float64 비용 행렬. gate에 걸린 쌍은 inf."""
+    det = np.asarray(det_centers, dtype=np.float64).reshape(-1, 2)
+    trk = np.asarray(track_positions, dtype=np.float64).reshape(-1, 2)
+    dx = np.abs(det[:, None, 0] - trk[None, :, 0])
+    dy = (det[:, None, 1] - trk[None, :, 1]) * forward_sign
+    cost = dx + dy * DY_WEIGHT
+    gated = (dx > dist_eps) | (dy < -DY_BACK_TOLERANCE) | (dy > max_dy)
+    cost[gated] = np.inf
+    return cost
+
+
+def _greedy_exclusive(cost: np.ndarray) -> np.ndarray:
+    assign = np.full(cost.shape[0], -1, dtype=np.intp)
+    rows, cols = np.nonzero(np.isfinite(cost))
+    used_tracks = set()
+    # 비용 동점이면 detection 순 → track 순 (stable 정렬)
+    for k in np.argsort(cost[rows, cols], kind="stable"):
+        d, t = rows[k], cols[k]
+        if assign[d] < 0 and t not in used_tracks:
+            assign[d] = t
+            used_tracks.add(t)
+    return assign
+
+
+def _hungarian(cost: np.ndarray) -> np.ndarray:
+    from scipy.optimize import linear_sum_assignment
+
+    assign = np.full(cost.shape[0], -1, dtype=np.intp)
+    finite = np.isfinite(cost)
+    if not finite.any():
+        return assign
+    # gate 쌍은 어떤 유효 배정 합보다 큰 값으로 두고, 배정 후 제외
+    big = cost[finite].max() * cost.shape[0] + 1e6
+    rows, cols = linear_sum_assignment(np.where(finite, cost, big))
+    ok = finite[rows, cols]
+    assign[rows[ok]] = cols[ok]
+    return assign
+
+
+def associate(det_centers: Sequence[Point], track_positions: Sequence[Point], forward_sign: int,
+              dist_eps: float, max_dy: float, mode: str = ASSOC_GREEDY_COMPAT,
+              cost: Optional[np.ndarray] = None) -> np.ndarray:
+    """detection별 배정 track index (D,) intp 배열, 배정 없으면 -1. cost를 주면 재계산 생략."""
+    if mode not in ASSOC_MODES:
+        raise ValueError(f"Unknown association mode: {mode!r} (expected one of {ASSOC_MODES})")
+    n_det, n_trk = len(det_centers), len(track_positions)
+    if n_det == 0 or n_trk == 0:
+        return np.full(n_det, -1, dtype=np.intp)
+    if cost is None:
+        cost = cost_matrix(det_centers, track_positions, forward_sign, dist_eps, max_dy)
+    if mode == ASSOC_GREEDY_COMPAT:
+        best = np.argmin(cost, axis=1)
+        return np.where(np.isfinite(cost[np.arange(n_det), best]), best, -1).astype(np.intp)
+    if mode == ASSOC_GREEDY:
+        return _greedy_exclusive(cost)
+    return _hungarian(cost)
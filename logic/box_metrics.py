@@ -0,0 +1,111 @@
+# box_metrics.py - track/logic
+"""
+detection 결과 비교용 박스 지표 (벤치마크·회귀 비교 스크립트 공용).
+기준 모델 결과를 정답으로 둔 AP(average_precision, map_50_95)는 양자화 변형 회귀 비교용.
+박스는 (x1, y1, x2, y2), detection은 YOLODetector 반환 dict ("box", "in_roi", "in_eol", ...).
+"""
+from typing import Dict, List, Sequence, Tuple
+
+
+def box_iou(a: Sequence[float], b: Sequence[float]) -> float:
+    ix1, iy1 = max(a[0], b[0]), max(a[1], b[1])
+    ix2, iy2 = min(a[2], b[2]), min(a[3], b[3])
+    iw, ih = max(0.0, ix2 - ix1), max(0.0, iy2 - iy1)
+    inter = iw * ih
+    if inter <= 0:
+        return 0.0
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def match_boxes(ref: Sequence[Sequence[float]], cand: Sequence[Sequence[float]],
+                iou_thr: float = 0.5) -> Tuple[List[Tuple[int, int, float]], List[int], List[int]]:
+    """
+    IoU 내림차순 greedy 1:1 매칭.
+    반환: (matches [(ref_idx, cand_idx, iou)], 매칭 안 된 ref 인덱스, 매칭 안 된 cand 인덱스).
+    """
+    pairs = []
+    for i, r in enumerate(ref):
+        for j, c in enumerate(cand):
+            iou = box_iou(r, c)
+            if iou >= iou_thr:
+                pairs.append((iou, i, j))
+    pairs.sort(reverse=True)
+    used_r, used_c, matches = set(), set(), []
+    for iou, i, j in pairs:
+        if i in used_r or j in used_c:
+            continue
+        used_r.add(i)
+        used_c.add(j)
+        matches.append((i, j, iou))
+    return (matches,
+            [i for i in range(len(ref)) if i not in used_r],
+            [j for j in range(len(cand)) if j not in used_c])
+
+
+def flagged_agreement(ref_dets: Sequence[Dict], cand_dets: Sequence[Dict], iou_thr: float = 0.5) -> Dict[str, float]:
+    """
+    ROI/EOL 플래그가 켜진 detection 기준 일치도.
+    ref_flagged: ref에서 in_roi 또는 in_eol인 수, recall: 그 중 cand에 IoU 매칭되고 플래그까지 같은 비율,
+    extra: cand에만 있는 플래그 detection 수, mean_iou: 매칭 IoU 평균.
+    """
+    ref_f = [d for d in ref_dets if d.get("in_roi") or d.get("in_eol")]
+    cand_f = [d for d in cand_dets if d.get("in_roi") or d.get("in_eol")]
+    matches, _, unmatched_c = match_boxes([d["box"] for d in ref_f], [d["box"] for d in cand_f], iou_thr)
+    same = [m for m in matches
+            if (ref_f[m[0]].get("in_roi"), ref_f[m[0]].get("in_eol"))
+            == (cand_f[m[1]].get("in_roi"), cand_f[m[1]].get("in_eol"))]
+    return {
+        "ref_flagged": len(ref_f),
+        "cand_flagged": len(cand_f),
+        "recall": len(same) / len(ref_f) if ref_f else 1.0,
+        "extra": len(unmatched_c),
+        "mean_iou": sum(m[2] for m in matches) / len(matches) if matches else 0.0,
+    }
+
+
+def average_precision(ref_frames: Sequence[Sequence[Sequence[float]]],
+                      cand_frames: Sequence[Sequence[Sequence[float]]], iou_thr: float = 0.5) -> float:
+    """
+    기준 모델 박스를 정답으로 둔 AP (단일 클래스, all-point 보간).
+    ref_frames: 프레임별 박스 [(x1, y1, x2, y2), ...], cand_frames: 프레임별 [(x1, y1, x2, y2, score), ...].
+    cand는 score 내림차순으로 같은 프레임의 아직 매칭 안 된 ref 중 IoU 최대인 박스와 매칭 (COCO 방식).
+    """
+    n_ref = sum(len(r) for r in ref_frames)
+    dets = sorted(((c[4], f, c[:4]) for f, cands in enumerate(cand_frames) for c in cands),
+                  key=lambda d: d[0], reverse=True)
+    if n_ref == 0:
+        return 1.0 if not dets else 0.0
+    used = [set() for _ in ref_frames]
+    tp = fp = 0
+    recalls, precisions = [], []
+    for _, f, box in dets:
+        best, best_i = iou_thr, -1
+        for i, r in enumerate(ref_frames[f]):
+            if i in used[f]:
+                continue
+            iou = box_iou(r, box)
+            if iou >= best:
+                best, best_i = iou, i
+        if best_i >= 0:
+            used[f].add(best_i)
+            tp += 1
+        else:
+            fp += 1
+        recalls.append(tp / n_ref)
+        precisions.append(tp / (tp + fp))
+    # precision envelope (오른쪽에서 누적 최대) 후 recall 증가분 × precision 합
+    for k in range(len(precisions) - 2, -1, -1):
+        precisions[k] = max(precisions[k], precisions[k + 1])
+    ap, prev_r = 0.0, 0.0
+    for r, p in zip(recalls, precisions):
+        ap += (r - prev_r) * p
+        prev_r = r
+    return ap
+
+
+def map_50_95(ref_frames: Sequence[Sequence[Sequence[float]]],
+              cand_frames: Sequence[Sequence[Sequence[float]]]) -> float:
+    """IoU 0.50:0.95 (0.05 간격) AP 평균."""
+    thrs = [0.5 + 0.05 * k for k in range(10)]
+    return sum(average_precision(ref_frames, cand_frames, t) for t in thrs) / len(thrs)
@@ -2,58 +2,87 @@
 import sys
 from pathlib import Path
 import cv2
-from ultralytics import YOLO
 
 _track_root = Path(__file__).resolve().parent.parent
 if str(_track_root) not in sys.path:
     sys.path.insert(0, str(_track_root))
 import config as track_config
+from logic.inference_backends import create_backend
+from logic.postprocess import postprocess_xyxy, roi_bands, to_dicts
+from logic.preprocess import PreprocessPlan, roi_crops
 
 class YOLODetector:
-    def __init__(self, model_path=None):
+    def __init__(self, model_path=None, roi_crop=False, backend=None):
         path = model_path or track_config.MODEL_PATH
-        self.model = YOLO(str(path))
+        # 추론 백엔드 (logic.inference_backends): ultralytics(.pt) / onnxruntime / openvino (CPU)
+        self.backend = create_backend(
+            backend or getattr(track_config, "INFERENCE_BACKEND", "ultralytics"),
+            path,
+            imgsz=getattr(track_config, "YOLO_IMGSZ", 640),
+            conf=0.25,
+            iou=0.45,
+            threads=getattr(track_config, "INFERENCE_THREADS", 0),
+            auto_export=getattr(track_config, "INFERENCE_AUTO_EXPORT", True),
+        )
+        # ultralytics 백엔드일 때만 YOLO 객체 (그 외 None)
+        self.model = getattr(self.backend, "model", None)
+        # True: crop_bands가 있는 PreprocessPlan 입력이면 ROI/EOL 밴드만 잘라 추론 (get_detections_roi)
+        self.roi_crop = roi_crop
+
+    def _use_roi_crop(self, cfgs):
+        return self.roi_crop and all(isinstance(c, PreprocessPlan) and c.crop_bands for c in cfgs)
 
     def get_detections(self, img, cam_cfg, cam_id):
+        if self._use_roi_crop([cam_cfg]):
+            return self.get_detections_roi([img], [cam_cfg], [cam_id])[0]
 
         # 1. YOLO 추론 실행 (이미지는 main에서 이미 회전/리사이징됨)
-        results = self.model(img, conf=0.25, iou=0.45, verbose=False)[0]
+        xyxy = self.backend.predict([img])[0]
+        return to_dicts(self._filter_xyxy(xyxy, img.shape, cam_cfg, cam_id))
+
+    def get_detections_batch(self, frames, cfgs, cam_ids):
+        """
+        여러 카메라 프레임을 1회 forward로 배치 추론한 뒤 카메라별로 분리·필터링.
+        frames/cfgs/cam_ids는 같은 순서의 리스트. 반환: cam_ids 순서의 detection 리스트들.
+        """
+        if not frames:
+            return []
+        if self._use_roi_crop(cfgs):
+            return self.get_detections_roi(frames, cfgs, cam_ids)
+        # 백엔드가 letterbox 후 하나의 배치 텐서로 묶어 추론 (고정 batch 모델은 장별 실행)
+        batch = self.backend.predict(list(frames))
+        return [
+            to_dicts(self._filter_xyxy(xyxy, img.shape, cfg, cam_id))
+            for xyxy, img, cfg, cam_id in zip(batch, frames, cfgs, cam_ids)
+        ]
 
+    def get_detections_roi(self, frames, plans, cam_ids):
+        """
+        ROI crop 추론: 각 cam의 plan.crop_bands(ROI·EOL 밴드 + 패딩)만 잘라 모든 crop을 1회 배치 forward.
+        모델 입력은 plan.crop_imgsz (전체 프레임 추론과 같은 배율), 박스는 밴드 y0만큼 옮겨 프레임 좌표로 복원.
+        in_roi/in_eol 판정은 프레임 좌표에서 기존과 같은 식으로 수행. 밴드 밖 박스는 반환되지 않음.
+        """
+        crops, owners, imgsz = roi_crops(list(zip(plans, frames)))
+        out = [[] for _ in frames]
+        if not crops:
+            return out
+        batch = self.backend.predict(crops, imgsz=imgsz)
+        for xyxy, (idx, y0) in zip(batch, owners):
+            dets = self._filter_xyxy(xyxy, frames[idx].shape, plans[idx], cam_ids[idx], offset_y=y0)
+            out[idx].extend(to_dicts(dets))
+        return out
+
+    def _filter_xyxy(self, xyxy, img_shape, cam_cfg, cam_id, offset_y=0):
+        """백엔드 박스 (N, 4) xyxy → 구조화 배열 (logic.postprocess.DETECTION_DTYPE)."""
         # 2. ROI 및 가로/세로 영역 설정
-        H, W = img.shape[:2]
-        roi_y = cam_cfg.get("roi_y", 0)
-        roi_margin = cam_cfg.get("roi_margin", 0)
-        roi_top, roi_bot = roi_y - roi_margin, roi_y + roi_margin
-
-        # 가로 범위 설정 (main에서 계산해서 넘겨준 값 사용)
-        roi_x_min = cam_cfg.get('roi_x_min', 0)
-        roi_x_max = cam_cfg.get('roi_x_max', W)
-
-        eol_top = eol_bot = None
-        if cam_id == "RPI_USB3":
-            eol_y = cam_cfg.get("eol_y", 0)
-            eol_margin = cam_cfg.get("eol_margin", 0)
-            eol_top, eol_bot = eol_y - eol_margin, eol_y + eol_margin
-
-        filtered_detections = []
-
-        # 3. 결과 필터링
-        for b in results.boxes:
-            x1, y1, x2, y2 = map(int, b.xyxy[0])
-            cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
-
-            # 가로/세로 범위 동시 체크
-            in_x_range = roi_x_min <= cx <= roi_x_max
-            in_roi = (roi_top < cy < roi_bot) and in_x_range
-            in_eol = (eol_top < cy < eol_bot) and in_x_range if eol_top is not None else False
-
-            # 모든 감지 결과를 반환하되, 영역 내 여부(in_roi) 플래그를 정확히 전달
-            filtered_detections.append({
-                "box": (x1, y1, x2, y2),
-                "center": (cx, cy),
-                "in_roi": in_roi,
-                "in_eol": in_eol,
-                "width": (x2 - x1)
-            })
-
-        return filtered_detections
\ No newline at end of file
+        H, W = img_shape[:2]
+        bands = roi_bands(cam_cfg, cam_id, W)
+        # FramePreprocessor.letterbox() 입력이면 박스를 plan.out_size 이미지 좌표로 되돌림
+        letterbox = None
+        if isinstance(cam_cfg, PreprocessPlan) and cam_cfg.letterbox is not None:
+            size = cam_cfg.letterbox[0]
+            if (W, H) == (size, size) and cam_cfg.out_size != (size, size):
+                letterbox = cam_cfg.letterbox
+
+        # 3. 결과 필터링: 모든 감지 결과를 반환하되, 영역 내 여부(in_roi/in_eol) 플래그를 정확히 전달
+        return postprocess_xyxy(xyxy, bands, letterbox, offset_y)
@@ -0,0 +1,241 @@
+# inference_backends.py - track/logic
+"""
+YOLO 추론 백엔드. YOLODetector는 backend.predict(images, imgsz)만 호출하고,
+결과는 이미지별 (N, 4) xyxy float 배열 (입력 이미지 좌표, conf/NMS 적용 후)로 통일.
+with_scores=True면 (N, 5) [x1, y1, x2, y2, score] (양자화 변형 정확도 비교용).
+- ultralytics: 기존 ultralytics.YOLO (.pt, PyTorch)
+- onnxruntime: export한 .onnx를 onnxruntime CPU로 직접 실행 (letterbox·NMS는 이 모듈에서 처리)
+- openvino: export한 OpenVINO IR(*_openvino_model/)을 CPU 플러그인으로 실행
+ONNX/OpenVINO 모델은 .pt 옆에 export해 캐시 (export_model). 각 런타임 패키지는 해당 백엔드 사용 시에만 import.
+"""
+import logging
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple, Union
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+BACKEND_ULTRALYTICS = "ultralytics"
+BACKEND_ONNXRUNTIME = "onnxruntime"
+BACKEND_OPENVINO = "openvino"
+
+# Ultralytics NMS와 같은 값 (클래스별 NMS를 위한 좌표 offset, 최대 detection 수)
+_MAX_WH = 7680
+_MAX_DET = 300
+_PAD_VALUE = 114
+
+ImgSz = Union[int, Tuple[int, int]]
+
+
+def _as_hw(imgsz: ImgSz) -> Tuple[int, int]:
+    return (imgsz, imgsz) if isinstance(imgsz, int) else (int(imgsz[0]), int(imgsz[1]))
+
+
+def exported_path(model_path: Union[str, Path], fmt: str) -> Path:
+    """Ultralytics export 산출물 위치: parcel.pt → parcel.onnx / parcel_openvino_model/."""
+    p = Path(model_path)
+    if fmt == "onnx":
+        return p.with_suffix(".onnx")
+    if fmt == "openvino":
+        return p.parent / f"{p.stem}_openvino_model"
+    raise ValueError(f"unsupported export format: {fmt}")
+
+
+def export_model(model_path: Union[str, Path], fmt: str = "onnx", imgsz: int = 640, dynamic: bool = True,
+                 half: bool = False, int8: bool = False, force: bool = False, **kwargs) -> Path:
+    """
+    .pt → ONNX / OpenVINO IR export (Ultralytics exporter). .pt보다 새 산출물이 있으면 재사용 (force=False).
+    dynamic=True면 배치·입력 크기 가변 (세트 배치·ROI crop 추론용). kwargs는 model.export로 전달 (data 등).
+    """
+    out = exported_path(model_path, fmt)
+    pt = Path(model_path)
+    if not force and out.exists() and (not pt.exists() or out.stat().st_mtime >= pt.stat().st_mtime):
+        return out
+    from ultralytics import YOLO
+
+    logger.info("Exporting %s -> %s", pt, fmt)
+    produced = YOLO(str(pt)).export(format=fmt, imgsz=imgsz, dynamic=dynamic, half=half, int8=int8, **kwargs)
+    return Path(produced) if produced else out
+
+
+def letterbox_image(img: np.ndarray, size_hw: Tuple[int, int]) -> Tuple[np.ndarray, float, int, int]:
+    """Ultralytics LetterBox(auto=False, center=True) 재현. (letterbox 이미지, 배율, pad_left, pad_top)."""
+    h, w = img.shape[:2]
+    th, tw = size_hw
+    r = min(th / h, tw / w)
+    new_w, new_h = int(round(w * r)), int(round(h * r))
+    dw, dh = (tw - new_w) / 2, (th - new_h) / 2
+    top, bottom = int(round(dh - 0.1)), int(round(dh + 0.1))
+    left, right = int(round(dw - 0.1)), int(round(dw + 0.1))
+    if (new_w, new_h) != (w, h):
+        img = cv2.resize(img, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+    img = cv2.copyMakeBorder(img, top, bottom, left, right, cv2.BORDER_CONSTANT, value=(_PAD_VALUE,) * 3)
+    return img, r, left, top
+
+
+def to_input_tensor(letterboxed: Sequence[np.ndarray]) -> np.ndarray:
+    """BGR HWC uint8 리스트 → RGB NCHW float32 [0, 1]."""
+    batch = np.stack(letterboxed)[..., ::-1].transpose(0, 3, 1, 2)
+    return np.ascontiguousarray(batch, dtype=np.float32) / 255.0
+
+
+def decode_yolo_output(pred: np.ndarray, conf: float = 0.25, iou: float = 0.45,
+                       max_det: int = _MAX_DET) -> np.ndarray:
+    """
+    YOLOv8 계열 head 출력 1장 (4 + nc, anchors) → NMS 후 (N, 6) [x1, y1, x2, y2, score, cls] (모델 입력 좌표).
+    클래스별 NMS는 Ultralytics와 같이 cls * _MAX_WH 좌표 offset으로 처리.
+    """
+    pred = np.asarray(pred, dtype=np.float32)
+    # (anchors, 4 + nc)로 export된 경우 전치 (anchor 수가 채널 수보다 항상 많음)
+    if pred.shape[0] > pred.shape[1]:
+        pred = pred.T
+    scores_all = pred[4:]
+    cls = scores_all.argmax(axis=0)
+    scores = scores_all[cls, np.arange(scores_all.shape[1])]
+    keep = scores > conf
+    if not keep.any():
+        return np.zeros((0, 6), dtype=np.float32)
+    cx, cy, w, h = pred[:4, keep]
+    scores, cls = scores[keep], cls[keep]
+    xyxy = np.stack([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2], axis=1)
+    offset = (cls * _MAX_WH)[:, None].astype(np.float32)
+    shifted = xyxy[:, :2] + offset
+    xywh = np.concatenate([shifted, xyxy[:, 2:] - xyxy[:, :2]], axis=1)
+    idx = cv2.dnn.NMSBoxes(xywh.tolist(), scores.tolist(), conf, iou)
+    idx = np.asarray(idx, dtype=np.int64).reshape(-1)[:max_det]
+    return np.concatenate([xyxy[idx], scores[idx, None], cls[idx, None].astype(np.float32)], axis=1)
+
+
+def scale_boxes_back(xyxy: np.ndarray, r: float, left: int, top: int, shape_hw: Tuple[int, int]) -> np.ndarray:
+    """letterbox 좌표 → 원본 이미지 좌표 (이미지 경계로 clip, Ultralytics scale_boxes와 동일)."""
+    out = (xyxy - (left, top, left, top)) / r
+    out[:, 0::2] = out[:, 0::2].clip(0, shape_hw[1])
+    out[:, 1::2] = out[:, 1::2].clip(0, shape_hw[0])
+    return out
+
+
+class UltralyticsBackend:
+    name = BACKEND_ULTRALYTICS
+
+    def __init__(self, model_path, conf: float = 0.25, iou: float = 0.45, **_):
+        from ultralytics import YOLO
+
+        self.model = YOLO(str(model_path))
+        self.conf = conf
+        self.iou = iou
+
+    def predict(self, images: Sequence[np.ndarray], imgsz: Optional[ImgSz] = None,
+                with_scores: bool = False) -> List[np.ndarray]:
+        kwargs = {"conf": self.conf, "iou": self.iou, "verbose": False}
+        if imgsz is not None:
+            kwargs["imgsz"] = list(_as_hw(imgsz))
+        batch = images[0] if len(images) == 1 else list(images)
+        results = self.model(batch, **kwargs)
+        cols = 5 if with_scores else 4
+        return [res.boxes.data[:, :cols].cpu().numpy() for res in results]
+
+
+class _LetterboxBackend:
+    """onnxruntime/openvino 공통: letterbox → NCHW 배치 → 모델 → decode·NMS → 원본 좌표."""
+
+    name = ""
+
+    def __init__(self, imgsz: ImgSz = 640, conf: float = 0.25, iou: float = 0.45):
+        self.imgsz = _as_hw(imgsz)
+        self.conf = conf
+        self.iou = iou
+        self.dynamic_shape = False
+        self.dynamic_batch = False
+
+    def _run(self, batch: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def predict(self, images: Sequence[np.ndarray], imgsz: Optional[ImgSz] = None,
+                with_scores: bool = False) -> List[np.ndarray]:
+        # 고정 입력 모델은 export 크기로만 실행 (crop 추론의 작은 imgsz는 dynamic export일 때만 적용)
+        size = _as_hw(imgsz) if imgsz is not None and self.dynamic_shape else self.imgsz
+        prepared = [letterbox_image(img, size) for img in images]
+        tensors = [p[0] for p in prepared]
+        if self.dynamic_batch:
+            preds = list(self._run(to_input_tensor(tensors)))
+        else:
+            preds = [self._run(to_input_tensor([t]))[0] for t in tensors]
+        out = []
+        for pred, img, (_, r, left, top) in zip(preds, images, prepared):
+            dets = decode_yolo_output(pred, self.conf, self.iou)
+            boxes = scale_boxes_back(dets[:, :4], r, left, top, img.shape[:2])
+            out.append(np.concatenate([boxes, dets[:, 4:5]], axis=1) if with_scores else boxes)
+        return out
+
+
+class OnnxRuntimeBackend(_LetterboxBackend):
+    name = BACKEND_ONNXRUNTIME
+
+    def __init__(self, model_path, imgsz: ImgSz = 640, conf: float = 0.25, iou: float = 0.45,
+                 threads: int = 0, **_):
+        import onnxruntime as ort
+
+        super().__init__(imgsz, conf, iou)
+        opts = ort.SessionOptions()
+        if threads:
+            opts.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(str(model_path), sess_options=opts,
+                                            providers=["CPUExecutionProvider"])
+        inp = self.session.get_inputs()[0]
+        self.input_name = inp.name
+        batch, _, h, w = inp.shape
+        self.dynamic_batch = not isinstance(batch, int)
+        self.dynamic_shape = not isinstance(h, int) or not isinstance(w, int)
+        if not self.dynamic_shape:
+            self.imgsz = (h, w)
+
+    def _run(self, batch: np.ndarray) -> np.ndarray:
+        return self.session.run(None, {self.input_name: batch})[0]
+
+
+class OpenVINOBackend(_LetterboxBackend):
+    name = BACKEND_OPENVINO
+
+    def __init__(self, model_path, imgsz: ImgSz = 640, conf: float = 0.25, iou: float = 0.45,
+                 threads: int = 0, **_):
+        import openvino as ov
+
+        super().__init__(imgsz, conf, iou)
+        core = ov.Core()
+        path = Path(model_path)
+        xml = next(path.glob("*.xml")) if path.is_dir() else path
+        model = core.read_model(str(xml))
+        config = {"INFERENCE_NUM_THREADS": threads} if threads else {}
+        self.compiled = core.compile_model(model, "CPU", config)
+        shape = model.inputs[0].get_partial_shape()
+        self.dynamic_batch = shape[0].is_dynamic
+        self.dynamic_shape = shape[2].is_dynamic or shape[3].is_dynamic
+        if not self.dynamic_shape:
+            self.imgsz = (shape[2].get_length(), shape[3].get_length())
+
+    def _run(self, batch: np.ndarray) -> np.ndarray:
+        return self.compiled(batch)[0]
+
+
+def create_backend(name: str, model_path, imgsz: ImgSz = 640, conf: float = 0.25, iou: float = 0.45,
+                   threads: int = 0, auto_export: bool = True):
+    """
+    name: ultralytics / onnxruntime / openvino. model_path는 .pt 기준.
+    ONNX/OpenVINO는 .pt 옆 export 산출물을 사용하고, 없으면 auto_export 시 export 후 사용.
+    """
+    if name == BACKEND_ULTRALYTICS:
+        return UltralyticsBackend(model_path, conf=conf, iou=iou)
+    fmt = {BACKEND_ONNXRUNTIME: "onnx", BACKEND_OPENVINO: "openvino"}.get(name)
+    if fmt is None:
+        raise ValueError(f"unknown inference backend: {name}")
+    path = Path(model_path)
+    if path.suffix == ".pt":
+        path = exported_path(path, fmt)
+        if not path.exists():
+            if not auto_export:
+                raise FileNotFoundError(f"{path} not found (export with monitoring/export_model.py)")
+            path = export_model(model_path, fmt, imgsz=imgsz if isinstance(imgsz, int) else max(imgsz))
+    cls = OnnxRuntimeBackend if name == BACKEND_ONNXRUNTIME else OpenVINOBackend
+    return cls(path, imgsz=imgsz, conf=conf, iou=iou, threads=threads)
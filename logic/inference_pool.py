@@ -0,0 +1,144 @@
+# inference_pool.py - track/logic
+"""
+상주 추론 워커 풀. 세트마다 ThreadPoolExecutor를 만들고 버리는 대신, 워커 스레드가 각자
+detector(모델 복제본)를 하나씩 보유하고 bounded 큐에서 작업을 꺼내 처리.
+큐가 가득 차면 submit이 블록(backpressure)하고, 워커별 처리 시간 카운터를 제공.
+"""
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class InferencePool:
+    """
+    detectors: 워커당 1개씩 사용할 detector 목록 (get_detections / get_detections_batch 제공).
+      모델 로드·워밍업(fuse)은 호출 측(메인 스레드)에서 끝낸 뒤 넘김.
+    queue_size: 대기 작업 상한. 가득 차면 submit이 submit_timeout 동안 블록.
+    submit_timeout: None이면 무한 대기. 시간 초과 시 submit은 None 반환 (rejected 카운트 증가).
+    Future 결과: (detections, elapsed_sec). 배치 작업은 detections가 cam 순서의 리스트.
+    """
+
+    def __init__(self, detectors: Sequence[Any], queue_size: int = 8, submit_timeout: Optional[float] = None):
+        if not detectors:
+            raise ValueError("InferencePool needs at least one detector")
+        self._detectors = list(detectors)
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(1, queue_size))
+        self._submit_timeout = submit_timeout
+        self._stats_lock = threading.Lock()
+        self._worker_stats: List[Dict[str, Any]] = [
+            {"jobs": 0, "frames": 0, "busy_sec": 0.0, "last_sec": 0.0, "max_sec": 0.0, "errors": 0}
+            for _ in self._detectors
+        ]
+        self._rejected = 0
+        self._threads: List[threading.Thread] = []
+        self.running = False
+
+    @property
+    def num_workers(self) -> int:
+        return len(self._detectors)
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self.running = True
+        for idx, det in enumerate(self._detectors):
+            t = threading.Thread(target=self._worker_loop, args=(idx, det), daemon=True,
+                                 name=f"inference-worker-{idx}")
+            t.start()
+            self._threads.append(t)
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """대기 중인 작업은 취소(Future.cancel)하고 워커 종료. 큐가 가득 차 있어도 블록하지 않음."""
+        if not self.running:
+            return
+        self.running = False
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                item[1].cancel()
+        for _ in self._threads:
+            try:
+                self._queue.put_nowait(_STOP)
+            except queue.Full:  # 종료 중 submit이 다시 채운 경우: 워커는 daemon이라 join timeout 후 버림
+                break
+        for t in self._threads:
+            t.join(timeout=timeout)
+        self._threads.clear()
+
+    def submit(self, cam_id: str, img, cfg) -> Optional[Future]:
+        """1장 detection 작업 제출."""
+        return self._enqueue(("single", (img, cfg, cam_id), 1))
+
+    def submit_batch(self, frames: Sequence[Any], cfgs: Sequence[Any], cam_ids: Sequence[str]) -> Optional[Future]:
+        """세트 배치 detection 작업 제출 (워커 1개가 get_detections_batch 1회 실행)."""
+        return self._enqueue(("batch", (list(frames), list(cfgs), list(cam_ids)), len(frames)))
+
+    def _enqueue(self, job) -> Optional[Future]:
+        fut: Future = Future()
+        try:
+            self._queue.put((job, fut), timeout=self._submit_timeout)
+        except queue.Full:
+            with self._stats_lock:
+                self._rejected += 1
+            logger.warning("Inference queue full (%d), job rejected", self._queue.maxsize)
+            return None
+        return fut
+
+    def _worker_loop(self, idx: int, detector) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            (kind, payload, n_frames), fut = item
+            if not fut.set_running_or_notify_cancel():
+                continue
+            t0 = time.perf_counter()
+            try:
+                if kind == "batch":
+                    dets = detector.get_detections_batch(*payload)
+                else:
+                    img, cfg, cam_id = payload
+                    dets = detector.get_detections(img, cfg, cam_id)
+            except Exception as e:
+                logger.error("Inference worker %d error: %s", idx, e)
+                with self._stats_lock:
+                    self._worker_stats[idx]["errors"] += 1
+                fut.set_exception(e)
+                continue
+            elapsed = time.perf_counter() - t0
+            with self._stats_lock:
+                st = self._worker_stats[idx]
+                st["jobs"] += 1
+                st["frames"] += n_frames
+                st["busy_sec"] += elapsed
+                st["last_sec"] = elapsed
+                st["max_sec"] = max(st["max_sec"], elapsed)
+            fut.set_result((dets, elapsed))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """큐 깊이, 거절 수, 워커별 latency 카운터 (jobs, frames, mean/last/max sec, errors)."""
+        with self._stats_lock:
+            workers = []
+            for st in self._worker_stats:
+                w = dict(st)
+                w["mean_sec"] = round(st["busy_sec"] / st["jobs"], 4) if st["jobs"] else 0.0
+                w["busy_sec"] = round(st["busy_sec"], 4)
+                w["last_sec"] = round(st["last_sec"], 4)
+                w["max_sec"] = round(st["max_sec"], 4)
+                workers.append(w)
+            return {
+                "queue_depth": self._queue.qsize(),
+                "queue_size": self._queue.maxsize,
+                "rejected": self._rejected,
+                "workers": workers,
+            }
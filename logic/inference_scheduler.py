@@ -0,0 +1,105 @@
+# inference_scheduler.py - track/logic
+"""
+cam별 적응형 추론 주기. 최근 ROI 근처 detection이 없고, active track이 없고, matcher 큐의 다음 master가
+이 cam에 도착할 시간(last_time + AVG_TRAVEL - TIME_MARGIN - lookahead)이 아니면 idle_interval마다 한 번만 추론.
+위 조건 중 하나라도 생기면 즉시 매 세트(전체 주기) 추론으로 복귀.
+스킵된 cam은 detection·_process_with_detections를 모두 건너뜀 (빈 결과로 PENDING 오판 방지).
+시각은 모두 프레임 ts(초) 기준.
+"""
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+import config
+
+# 추론 cam → 이 cam으로 들어오는 matcher 큐 (queue key, 이전 cam, 매칭 cam). RPI_USB3는 EOL 큐도 확인.
+CAM_INBOUND_QUEUES: Dict[str, Tuple[Tuple[str, str, str], ...]] = {
+    "USB_LOCAL": (("q_scan", "Scanner", "USB_LOCAL"),),
+    "RPI_USB1": (("q01", "USB_LOCAL", "RPI_USB1"),),
+    "RPI_USB2": (("q12", "RPI_USB1", "RPI_USB2"),),
+    "RPI_USB3": (("q23", "RPI_USB2", "RPI_USB3"), ("q3e", "RPI_USB3", "RPI_USB3_EOL")),
+}
+
+
+class InferenceScheduler:
+    """
+    matcher: FIFOGlobalMatcher (queue_head_time으로 큐 맨 앞 master 시각만 조회).
+    idle_interval: idle cam 추론 간격(초). idle_after: 마지막 ROI 근처 detection 이후 idle 전환까지(초).
+    lookahead: 도착 예상 구간(expected ± TIME_MARGIN)보다 이만큼 먼저 전체 주기로 복귀(초).
+    """
+
+    def __init__(self, cams: Iterable[str], matcher: Any, idle_interval: float = 2.0,
+                 idle_after: float = 3.0, lookahead: float = 1.0):
+        self.matcher = matcher
+        self.idle_interval = idle_interval
+        self.idle_after = idle_after
+        self.lookahead = lookahead
+        self._state: Dict[str, Dict[str, Any]] = {
+            cam: {"last_run": None, "last_activity": None, "ran": 0, "skipped": 0, "idle": False,
+                  "reasons": {"tracks": 0, "due": 0, "active": 0, "idle_tick": 0}}
+            for cam in cams
+        }
+
+    def _due(self, cam: str, now_s: float) -> bool:
+        """이 cam으로 오는 큐의 맨 앞 master가 도착 예상 구간에 들어왔는지 (FIFO라 맨 앞이 가장 이름)."""
+        for q_key, prev_cam, match_cam in CAM_INBOUND_QUEUES.get(cam, ()):
+            last_time = self.matcher.queue_head_time(q_key)
+            if last_time is None:
+                continue
+            key = (prev_cam, match_cam)
+            start = (last_time + config.AVG_TRAVEL.get(key, 0)
+                     - config.TIME_MARGIN.get(key, 2.0) - self.lookahead)
+            if now_s >= start:
+                return True
+        return False
+
+    def should_run(self, cam: str, now_s: float, has_active_tracks: bool = False) -> bool:
+        st = self._state.get(cam)
+        if st is None:
+            return True
+        if has_active_tracks:
+            reason = "tracks"
+        elif self._due(cam, now_s):
+            reason = "due"
+        elif st["last_activity"] is not None and now_s - st["last_activity"] < self.idle_after:
+            reason = "active"
+        elif st["last_run"] is None or now_s - st["last_run"] >= self.idle_interval or now_s < st["last_run"]:
+            reason = "idle_tick"
+        else:
+            st["skipped"] += 1
+            st["idle"] = True
+            return False
+        st["idle"] = reason == "idle_tick"
+        st["reasons"][reason] += 1
+        st["ran"] += 1
+        st["last_run"] = now_s
+        return True
+
+    def observe(self, cam: str, now_s: float, detections: Sequence[Dict[str, Any]], plan: Optional[Any] = None):
+        """
+        추론 결과 반영. ROI/EOL 안 또는 ROI 밴드 위아래 max_dy 이내 detection이 있으면 활동으로 기록
+        (plan: PreprocessPlan, 없으면 in_roi/in_eol 플래그만 사용).
+        """
+        st = self._state.get(cam)
+        if st is None:
+            return
+        for det in detections:
+            near = det.get("in_roi") or det.get("in_eol")
+            if not near and plan is not None:
+                cy = det["center"][1]
+                near = plan.roi_top - plan.max_dy <= cy <= plan.roi_bot + plan.max_dy
+            if near:
+                st["last_activity"] = now_s
+                st["idle"] = False
+                return
+
+    def get_stats(self) -> Dict[str, Any]:
+        cams = {}
+        for cam, st in self._state.items():
+            total = st["ran"] + st["skipped"]
+            cams[cam] = {
+                "ran": st["ran"],
+                "skipped": st["skipped"],
+                "skip_ratio": round(st["skipped"] / total, 3) if total else 0.0,
+                "idle": st["idle"],
+                "reasons": dict(st["reasons"]),
+            }
+        return {"idle_interval_sec": self.idle_interval, "cams": cams}
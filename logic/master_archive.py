@@ -0,0 +1,61 @@
+# master_archive.py - track/logic
+"""
+종료 상태(PICKUP / DISAPPEAR / MISSING) master 보관소. FIFOGlobalMatcher가 보존 기간이 지난 master를
+masters dict에서 빼서 여기로 옮김. 메모리에는 최근 max_entries개만 uid로 조회 가능하게 유지(초과 시 오래된 것부터 제거),
+jsonl_path를 주면 모든 archive 레코드를 한 줄씩 append (프로세스 수명 동안의 전체 기록).
+"""
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+# archive 레코드에 남기는 master 필드
+ARCHIVE_FIELDS = ("route_code", "status", "start_time", "terminal_time", "last_cam", "last_time", "uids")
+
+
+class MasterArchive:
+    def __init__(self, max_entries: int = 10000, jsonl_path: Optional[Union[str, Path]] = None):
+        self.max_entries = max(0, max_entries)
+        self.jsonl_path = Path(jsonl_path) if jsonl_path else None
+        self._ring: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._file = None
+        self.archived_total = 0
+        self.dropped_total = 0
+
+    def add(self, mid: str, info: Any) -> Dict[str, Any]:
+        """info: MasterRecord 또는 dict. 이름 문자열·일반 dict로 변환해 보관."""
+        if hasattr(info, "to_dict"):
+            info = info.to_dict()
+        record = {"mid": mid, **{k: info.get(k) for k in ARCHIVE_FIELDS}}
+        with self._lock:
+            self.archived_total += 1
+            if self.max_entries:
+                self._ring[mid] = record
+                self._ring.move_to_end(mid)
+                while len(self._ring) > self.max_entries:
+                    self._ring.popitem(last=False)
+                    self.dropped_total += 1
+            else:
+                self.dropped_total += 1
+            if self.jsonl_path is not None:
+                if self._file is None:
+                    self.jsonl_path.parent.mkdir(parents=True, exist_ok=True)
+                    self._file = open(self.jsonl_path, "a", encoding="utf-8")
+                self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                self._file.flush()
+        return record
+
+    def get(self, mid: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._ring.get(mid)
+
+    def __len__(self) -> int:
+        return len(self._ring)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,210 @@
+# master_record.py - track/logic
+"""
+FIFOGlobalMatcher의 master 레코드. 택배 1건당 dict(필드 이름 key + 문자열 상태·cam + uids dict) 대신
+__slots__ 객체에 상태·cam을 IntEnum 정수 코드로, cam별 local uid를 고정 길이 list로 보관해 master당 메모리를 줄임.
+matcher 내부(resolve/위치 갱신)는 속성으로 직접 접근하고, 기존 dict 방식 접근(info["status"], info.get("uids"),
+info["uids"][cam] = uid 등)은 이름 문자열을 돌려주는 호환 view로 계속 동작 (visualizer·CSV·main 이전 기간용).
+"""
+from enum import IntEnum
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+
+class MasterStatus(IntEnum):
+    TRACKING = 1
+    PENDING = 2
+    PICKUP = 3
+    DISAPPEAR = 4
+    MISSING = 5
+
+
+class CameraCode(IntEnum):
+    # 0은 쓰지 않음 (pending_from_cam or last_cam 같은 truthiness 판단에서 Scanner가 False가 되지 않도록)
+    Scanner = 1
+    USB_LOCAL = 2
+    RPI_USB1 = 3
+    RPI_USB2 = 4
+    RPI_USB3 = 5
+    RPI_USB3_EOL = 6
+
+
+N_CAMERAS = len(CameraCode)
+
+
+def as_status(value: Union[str, MasterStatus, None]) -> Optional[MasterStatus]:
+    """상태 이름 문자열 또는 MasterStatus → MasterStatus (None은 그대로)."""
+    if value is None or isinstance(value, MasterStatus):
+        return value
+    return MasterStatus[value]
+
+
+def as_camera(value: Union[str, CameraCode, None]) -> Optional[CameraCode]:
+    """cam 이름 문자열 또는 CameraCode → CameraCode (None은 그대로)."""
+    if value is None or isinstance(value, CameraCode):
+        return value
+    return CameraCode[value]
+
+
+def _name(value: Optional[IntEnum]) -> Optional[str]:
+    return value.name if value is not None else None
+
+
+class UidView:
+    """MasterRecord.uids(cam 코드 순 고정 길이 list)를 cam 이름 key dict처럼 보여 주는 view."""
+
+    __slots__ = ("_uids",)
+
+    def __init__(self, uids: List[Optional[str]]):
+        self._uids = uids
+
+    @staticmethod
+    def _index(cam: Union[str, CameraCode]) -> Optional[int]:
+        if isinstance(cam, CameraCode):
+            return cam - 1
+        code = CameraCode.__members__.get(cam)
+        return code - 1 if code is not None else None
+
+    def get(self, cam: Union[str, CameraCode], default: Any = None) -> Any:
+        i = self._index(cam)
+        uid = self._uids[i] if i is not None else None
+        return uid if uid is not None else default
+
+    def __getitem__(self, cam: Union[str, CameraCode]) -> str:
+        uid = self.get(cam)
+        if uid is None:
+            raise KeyError(cam)
+        return uid
+
+    def __setitem__(self, cam: Union[str, CameraCode], uid: str) -> None:
+        i = self._index(cam)
+        if i is None:
+            raise KeyError(cam)
+        self._uids[i] = uid
+
+    def __contains__(self, cam: object) -> bool:
+        return self.get(cam) is not None  # type: ignore[arg-type]
+
+    def __iter__(self) -> Iterator[str]:
+        return (CameraCode(i + 1).name for i, uid in enumerate(self._uids) if uid is not None)
+
+    def __len__(self) -> int:
+        return sum(uid is not None for uid in self._uids)
+
+    def __bool__(self) -> bool:
+        return any(uid is not None for uid in self._uids)
+
+    def items(self) -> List[Tuple[str, str]]:
+        return [(CameraCode(i + 1).name, uid) for i, uid in enumerate(self._uids) if uid is not None]
+
+    def to_dict(self) -> Dict[str, str]:
+        return dict(self.items())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, UidView):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    def __repr__(self) -> str:
+        return repr(self.to_dict())
+
+
+# dict 방식 접근에서 변환 없이 그대로 읽고 쓰는 필드
+_PLAIN_FIELDS = ("route_code", "last_time", "last_width", "start_time", "total_dist",
+                 "last_sent_dist", "terminal_time")
+_CAMERA_FIELDS = ("last_cam", "pending_from_cam")
+FIELDS = ("last_cam", "last_time", "last_width", "uids", "route_code", "status", "start_time",
+          "total_dist", "pending_from_cam", "last_sent_dist", "terminal_time")
+
+
+class MasterRecord:
+    """
+    master 1건. status·last_cam·pending_from_cam은 IntEnum, uids는 CameraCode - 1 위치의 local uid (없으면 None).
+    dict 방식 접근은 이름 문자열로 변환해 돌려주고, 문자열 대입도 받음. 없는 필드 이름은 KeyError.
+    """
+
+    __slots__ = FIELDS
+
+    def __init__(self, route_code: Optional[str], time_s: float, total_dist: float,
+                 status: Optional[MasterStatus] = None, last_cam: CameraCode = CameraCode.Scanner):
+        self.last_cam = last_cam
+        self.last_time = time_s
+        self.last_width = 0
+        self.uids: List[Optional[str]] = [None] * N_CAMERAS
+        self.route_code = route_code
+        self.status = status
+        self.start_time = time_s
+        self.total_dist = total_dist
+        self.pending_from_cam: Optional[CameraCode] = None
+        self.last_sent_dist: Optional[float] = None
+        self.terminal_time: Optional[float] = None
+
+    def uid_at(self, cam: CameraCode) -> Optional[str]:
+        return self.uids[cam - 1]
+
+    # --- dict 호환 view ---
+    def __getitem__(self, key: str) -> Any:
+        if key in _PLAIN_FIELDS:
+            return getattr(self, key)
+        if key == "status":
+            return _name(self.status)
+        if key in _CAMERA_FIELDS:
+            return _name(getattr(self, key))
+        if key == "uids":
+            return UidView(self.uids)
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in _PLAIN_FIELDS:
+            setattr(self, key, value)
+        elif key == "status":
+            self.status = as_status(value)
+        elif key in _CAMERA_FIELDS:
+            setattr(self, key, as_camera(value))
+        elif key == "uids":
+            uids: List[Optional[str]] = [None] * N_CAMERAS
+            view = UidView(uids)
+            for cam, uid in (value or {}).items():
+                view[cam] = uid
+            self.uids = uids
+        else:
+            raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in FIELDS:
+            return default
+        value = self[key]
+        return value if value is not None else default
+
+    def __contains__(self, key: object) -> bool:
+        return key in FIELDS and getattr(self, key) is not None  # type: ignore[arg-type]
+
+    def update(self, values: Dict[str, Any]) -> None:
+        for key, value in values.items():
+            self[key] = value
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        """optional 필드(terminal_time 등)를 비움. 반환: 이전 값 (없었으면 default)."""
+        value = self.get(key, default)
+        self[key] = None
+        return value
+
+    def keys(self) -> List[str]:
+        return [k for k in FIELDS if getattr(self, k) is not None]
+
+    def items(self) -> List[Tuple[str, Any]]:
+        return [(k, self[k]) for k in self.keys()]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """이름 문자열·uids dict로 된 일반 dict (archive·JSON 기록용)."""
+        d = dict(self.items())
+        d["uids"] = UidView(self.uids).to_dict()
+        return d
+
+    def __repr__(self) -> str:
+        return f"MasterRecord({self.to_dict()!r})"
+
+
+def route_and_status(info: Any) -> Tuple[Optional[str], Optional[MasterStatus]]:
+    """FIFOGlobalMatcher.get_master 결과 (MasterRecord 또는 archive의 이름 문자열 dict) → (route_code, MasterStatus)."""
+    if isinstance(info, MasterRecord):
+        return info.route_code, info.status
+    return info.get("route_code"), as_status(info.get("status"))
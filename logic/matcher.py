@@ -1,17 +1,55 @@
 # matcher.py - track/logic
+import functools
 import sys
+import threading
 from pathlib import Path
 from collections import deque
 import heapq
+from itertools import count
 
 _track_root = Path(__file__).resolve().parent.parent
 if str(_track_root) not in sys.path:
     sys.path.insert(0, str(_track_root))
 import config
+from logic.master_archive import MasterArchive
+from logic.master_record import CameraCode, MasterRecord, MasterStatus, as_camera, as_status
+
+
+_ROUTE_ORDER_XSEA = ["Scanner", "USB_LOCAL", "RPI_USB1", "RPI_USB2", "RPI_USB3"]
+_ROUTE_ORDER_DEFAULT = ["Scanner", "USB_LOCAL", "RPI_USB1", "RPI_USB2", "RPI_USB3", "RPI_USB3_EOL"]
+# 이 상태가 된 master는 MASTER_RETENTION_SEC 후 masters에서 archive로 이동
+TERMINAL_STATUSES = (MasterStatus.PICKUP, MasterStatus.DISAPPEAR, MasterStatus.MISSING)
+# 위치(잔여 거리) API 대상 상태, 전송 단위(m), ROUTE_TOTAL_DIST에 없는 route의 기본 거리
+POSITION_STATUSES = (MasterStatus.TRACKING, MasterStatus.PENDING)
+POSITION_STEP_M = 0.5
+DEFAULT_POSITION_DIST = 12.8
+# cam → 그 cam을 지나 다음 cam을 기다리는 master 큐 key
+_Q_FROM_CAM = {"Scanner": "q_scan", "USB_LOCAL": "q01", "RPI_USB1": "q12", "RPI_USB2": "q23", "RPI_USB3": "q3e"}
+# route별 cam → 다음 cam (XSEA 외 route는 기본 순서)
+_NEXT_CAM = {
+    "XSEA": dict(zip(_ROUTE_ORDER_XSEA, _ROUTE_ORDER_XSEA[1:])),
+    None: dict(zip(_ROUTE_ORDER_DEFAULT, _ROUTE_ORDER_DEFAULT[1:])),
+}
+
+
+def _locked(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
 
 
 class FIFOGlobalMatcher:
-    def __init__(self):
+    """
+    retention_sec: 종료 상태 master를 masters에 남겨 두는 시간(초, 프레임 ts 기준). None이면 config 값.
+    archive: MasterArchive (None이면 config MASTER_ARCHIVE_MAX / MASTER_ARCHIVE_PATH로 생성).
+    """
+
+    def __init__(self, retention_sec=None, archive=None):
+        # masters·큐·상태 index·heap 전체를 보호하는 단일 락 (스캐너 스레드 add_scanner_data ↔ 메인 스레드).
+        # 공개 메서드는 모두 @_locked, 내부(_ 접두) 메서드는 호출 측이 락을 잡은 상태에서만 호출
+        self._lock = threading.RLock()
         self.counter = 0
         self.masters = {}
         self.queues = {
@@ -19,34 +57,253 @@ class FIFOGlobalMatcher:
             "q01": deque(), "q12": deque(), "q23": deque(), "q3e": deque()
         }
         self.last_match_attempt = None
+        # resolve_pending 마감 시각 min-heap: (deadline, token, mid). master별 최신 token만 유효 (lazy 삭제)
+        self._deadline_heap = []
+        self._deadline_token = {}
+        self._tokens = count()
+        # 상태별 master 집합 (set_status에서만 갱신)
+        self.status_index = {}
+        self._status_of = {}
+        # 위치 갱신 min-heap: (다음 0.5m 구간 변경 시각, token, mid). route 거리는 master별 캐시
+        self._position_heap = []
+        self._position_token = {}
+        self._position_dist = {}
+        # 종료 상태 master min-heap: (terminal_time, mid). evict_expired가 보존 기간 지난 것을 archive로 이동
+        self.retention_sec = (retention_sec if retention_sec is not None
+                              else getattr(config, "MASTER_RETENTION_SEC", 120))
+        self.archive = archive if archive is not None else MasterArchive(
+            getattr(config, "MASTER_ARCHIVE_MAX", 10000), getattr(config, "MASTER_ARCHIVE_PATH", None))
+        self._terminal_heap = []
+        self.evicted_total = 0
 
     def _get_next_cam(self, route, cam):
-        if route == "XSEA":
-            order = ["Scanner", "USB_LOCAL", "RPI_USB1", "RPI_USB2", "RPI_USB3"]
+        return _NEXT_CAM.get(route, _NEXT_CAM[None]).get(cam)
+
+    def _pending_deadline(self, info):
+        """resolve_pending이 결정을 내리는 시각 (from_cam, next_cam, expected). 대상이 아니면 None."""
+        if info.status not in POSITION_STATUSES:
+            return None
+        from_cam = (info.pending_from_cam or info.last_cam).name
+        next_cam = self._get_next_cam(info.route_code, from_cam)
+        if not next_cam:
+            return None
+        key = (from_cam, next_cam)
+        if key not in config.AVG_TRAVEL:
+            return None
+        extra_margin = getattr(config, "PENDING_EXTRA_MARGIN_SEC", 0)
+        expected = info.last_time + config.AVG_TRAVEL[key] + config.TIME_MARGIN[key] + extra_margin
+        return from_cam, next_cam, expected
+
+    def _schedule(self, mid):
+        """master 마감 시각 재계산 후 heap에 등록 (이전 항목은 무효화). 매칭·PENDING 전환·취소 시 호출."""
+        info = self.masters.get(mid)
+        deadline = self._pending_deadline(info) if info else None
+        if deadline is None:
+            self._deadline_token.pop(mid, None)
+            return
+        token = next(self._tokens)
+        self._deadline_token[mid] = token
+        heapq.heappush(self._deadline_heap, (deadline[2], token, mid))
+
+    @_locked
+    def set_status(self, mid, status, now_s=None):
+        """
+        master 상태 변경의 단일 경로. 상태별 index·마감 시각·위치 갱신 대상 갱신,
+        종료 상태면 terminal_time 기록 후 eviction 대상 등록.
+        status: 상태 이름 문자열 또는 MasterStatus.
+        now_s: 상태가 바뀐 시각 (프레임 ts). None이면 master의 last_time.
+        """
+        info = self.masters.get(mid)
+        if not info:
+            return False
+        status = as_status(status)
+        info.status = status
+        old = self._status_of.get(mid)
+        if old != status:
+            if old is not None:
+                self.status_index[old].discard(mid)
+            self.status_index.setdefault(status, set()).add(mid)
+            self._status_of[mid] = status
+            if status in POSITION_STATUSES and old not in POSITION_STATUSES:
+                # 위치 대상이 되면 다음 due_position_updates에서 바로 계산
+                self._position_dist[mid] = config.ROUTE_TOTAL_DIST.get(info.route_code, DEFAULT_POSITION_DIST)
+                self._schedule_position(mid, float("-inf"))
+            elif status not in POSITION_STATUSES:
+                self._position_token.pop(mid, None)
+        if status in TERMINAL_STATUSES:
+            info.terminal_time = now_s if now_s is not None else info.last_time
+            heapq.heappush(self._terminal_heap, (info.terminal_time, mid))
         else:
-            order = ["Scanner", "USB_LOCAL", "RPI_USB1", "RPI_USB2", "RPI_USB3", "RPI_USB3_EOL"]
+            info.terminal_time = None
+        self._schedule(mid)
+        return True
+
+    @_locked
+    def mark_pending(self, mid, cam):
+        """cam에서 사라진 TRACKING master를 PENDING으로 전환하고 마감 시각 재등록."""
+        info = self.masters.get(mid)
+        if not info or info.status != MasterStatus.TRACKING:
+            return False
+        info.pending_from_cam = as_camera(cam)
+        return self.set_status(mid, "PENDING")
+
+    @_locked
+    def masters_with_status(self, *statuses):
+        """상태별 index에서 mid 목록 (masters 전체를 순회하지 않음). statuses: 상태 이름 문자열 또는 MasterStatus."""
+        return [mid for st in statuses for mid in list(self.status_index.get(as_status(st), ()))]
+
+    def _schedule_position(self, mid, due):
+        token = next(self._tokens)
+        self._position_token[mid] = token
+        heapq.heappush(self._position_heap, (due, token, mid))
 
-        if cam not in order:
+    @staticmethod
+    def _position_step(total_dist, start_time, now_s):
+        """잔여 거리를 0.5m 단위로 반올림한 값 (기존 main 위치 갱신 계산식)."""
+        rem_dist = max(0.0, total_dist - ((now_s - start_time) * config.BELT_SPEED))
+        return round(rem_dist / POSITION_STEP_M) * POSITION_STEP_M
+
+    @staticmethod
+    def _next_step_change(total_dist, start_time, step, now_s):
+        """
+        step이 다음으로 바뀌는 시각 (now_s 이후). 잔여 거리가 step - 0.25m 경계를 지날 때
+        = start_time + (total_dist - 경계) / BELT_SPEED. 0m 도달 후나 벨트 정지 설정이면 None.
+        """
+        if config.BELT_SPEED <= 0:
             return None
-        idx = order.index(cam)
-        return order[idx + 1] if idx + 1 < len(order) else None
+        boundary = step - POSITION_STEP_M / 2
+        while boundary > 0:
+            t = start_time + (total_dist - boundary) / config.BELT_SPEED
+            if t > now_s:
+                return t
+            boundary -= POSITION_STEP_M
+        return None
+
+    @_locked
+    def due_position_updates(self, now_s):
+        """
+        0.5m 구간이 바뀐 TRACKING/PENDING master만 [(mid, step_dist)] 반환하고 last_sent_dist 갱신.
+        master별 다음 구간 변경 시각을 BELT_SPEED로 계산해 heap에 등록하므로 구간이 그대로인 master는 건드리지 않음.
+        """
+        due = []
+        while self._position_heap and self._position_heap[0][0] <= now_s:
+            _, token, mid = heapq.heappop(self._position_heap)
+            if self._position_token.get(mid) == token:
+                del self._position_token[mid]
+                due.append(mid)
+        updates = []
+        for mid in due:
+            info = self.masters.get(mid)
+            if not info or info.status not in POSITION_STATUSES:
+                continue
+            start_time = info.start_time
+            if start_time is None:
+                # start_time이 생기면(매칭) 다시 계산되도록 다음 호출에서 재확인
+                self._schedule_position(mid, now_s)
+                continue
+            total_dist = self._position_dist[mid]
+            step_dist = self._position_step(total_dist, start_time, now_s)
+            if info.last_sent_dist != step_dist:
+                info.last_sent_dist = step_dist
+                updates.append((mid, step_dist))
+            next_t = self._next_step_change(total_dist, start_time, step_dist, now_s)
+            if next_t is not None:
+                self._schedule_position(mid, next_t)
+        return updates
+
+    @_locked
+    def get_master(self, mid):
+        """uid로 master 조회: masters에 없으면 archive 레코드 (둘 다 없으면 None)."""
+        info = self.masters.get(mid)
+        return info if info is not None else self.archive.get(mid)
+
+    @_locked
+    def queue_head_time(self, q_key):
+        """큐 맨 앞(가장 먼저 도착할) master의 last_time. 큐가 비었거나 master가 없으면 None."""
+        queue = self.queues.get(q_key)
+        if not queue:
+            return None
+        item = queue[0]
+        info = self.masters.get(item[0] if isinstance(item, tuple) else item)
+        return info.last_time if info is not None else None
+
+    def _purge_queues(self, mid):
+        for q_key, queue in self.queues.items():
+            if q_key == "q_scan":
+                kept = [item for item in queue if item[0] != mid]
+                if len(kept) != len(queue):
+                    queue[:] = kept
+                    heapq.heapify(queue)
+            elif mid in queue:
+                queue.remove(mid)
+
+    @_locked
+    def evict_expired(self, now_s):
+        """종료 상태로 retention_sec 이상 지난 master를 masters·큐·마감 heap에서 제거하고 archive로 이동. 반환: 이동 수."""
+        evicted = 0
+        while self._terminal_heap and self._terminal_heap[0][0] + self.retention_sec <= now_s:
+            t, mid = heapq.heappop(self._terminal_heap)
+            info = self.masters.get(mid)
+            # 이후 다시 TRACKING 등으로 바뀌었거나 재종료된 master의 이전 항목은 무시
+            if not info or info.status not in TERMINAL_STATUSES or info.terminal_time != t:
+                continue
+            del self.masters[mid]
+            self._purge_queues(mid)
+            self.status_index[info.status].discard(mid)
+            self._status_of.pop(mid, None)
+            self._position_dist.pop(mid, None)
+            self._deadline_token.pop(mid, None)
+            self._position_token.pop(mid, None)
+            self.archive.add(mid, info)
+            evicted += 1
+        self.evicted_total += evicted
+        return evicted
 
+    @_locked
+    def get_lifecycle_stats(self):
+        return {
+            "live": len(self.masters),
+            "live_by_status": {st.name: len(mids) for st, mids in self.status_index.items() if mids},
+            "archived": len(self.archive),
+            "archived_total": self.archive.archived_total,
+            "archive_dropped": self.archive.dropped_total,
+            "evicted_total": self.evicted_total,
+            "retention_sec": self.retention_sec,
+            "deadline_heap": len(self._deadline_heap),
+            "position_heap": len(self._position_heap),
+        }
+
+    @_locked
+    def resolve_due(self, now_s):
+        """
+        마감 시각이 now_s 이하인 master만 resolve_pending. 반환: [(mid, result)] (결정이 난 것만).
+        결정 없이 남은 master(Phase 2 재확인 등)는 다음 호출부터 다시 대상이 되도록 재등록.
+        """
+        due = []
+        while self._deadline_heap and self._deadline_heap[0][0] <= now_s:
+            _, token, mid = heapq.heappop(self._deadline_heap)
+            if self._deadline_token.get(mid) == token:
+                del self._deadline_token[mid]
+                due.append(mid)
+        resolved = []
+        for mid in due:
+            if mid not in self.masters:
+                continue
+            result = self.resolve_pending(mid, now_s)
+            if result:
+                resolved.append((mid, result))
+            else:
+                self._schedule(mid)
+        return resolved
+
+    @_locked
     def add_scanner_data(self, uid, route_code, time_s):
         mid = uid
         total_dist = config.ROUTE_TOTAL_DIST.get(route_code, 14.08)
 
-        self.masters[mid] = {
-            "last_cam": "Scanner",
-            "last_time": time_s,
-            "last_width": 0,
-            "uids": {},
-            "route_code": route_code,
-            "status": "TRACKING",
-            "start_time": time_s,
-            "total_dist": total_dist,
-            "pending_from_cam": None
-        }
+        self.masters[mid] = MasterRecord(route_code, time_s, total_dist)
         heapq.heappush(self.queues["q_scan"], (mid, route_code))
+        self.set_status(mid, "TRACKING")
         # 큐 상태 확인
         print(f"📥 [Matcher] Q_SCAN updated. Current size: {len(self.queues['q_scan'])}")
 
@@ -64,15 +321,16 @@ class FIFOGlobalMatcher:
         if not info:
             return {"mid": None, "reason": "INVALID_MASTER", "prev_cam": prev_cam}
 
-        if cam in info.get("uids", {}):
-            info.update({"last_width": width})
+        cam_code = CameraCode[cam]
+        if info.uid_at(cam_code) is not None:
+            info.last_width = width
             return {
                 "mid": mid, "reason": "ALREADY_MATCHED_CONTINUE", 
                 "actual_time": round(time_s, 3), "prev_cam": prev_cam
             }
         
         avg_travel = config.AVG_TRAVEL.get((prev_cam, cam), 0)
-        expected = info["last_time"] + avg_travel
+        expected = info.last_time + avg_travel
         margin = config.TIME_MARGIN.get((prev_cam, cam), 2.0)
         diff = time_s - expected
 
@@ -80,7 +338,7 @@ class FIFOGlobalMatcher:
         attempt_detail = {
             "mid": mid,
             "prev_cam": prev_cam,
-            "prev_time": round(info["last_time"], 3),
+            "prev_time": round(info.last_time, 3),
             "expected_time": round(expected, 3),
             "actual_time": round(time_s, 3),
             "diff": round(diff, 3),
@@ -92,7 +350,7 @@ class FIFOGlobalMatcher:
             attempt_detail["reason"] = "OUT_OF_MARGIN"
             return attempt_detail
 
-        if time_s <= info["last_time"]:
+        if time_s <= info.last_time:
             attempt_detail["mid"] = None
             attempt_detail["reason"] = "TIME_REVERSED"
             return attempt_detail
@@ -101,19 +359,18 @@ class FIFOGlobalMatcher:
         if is_q_scan: heapq.heappop(self.queues[q_key])
         else: queue.popleft()
 
-        info.update({
-            "last_cam": cam, 
-            "last_time": time_s, 
-            "last_width": width, 
-            "status": "TRACKING"
-        })
-        info["uids"][cam] = uid
-        if info["start_time"] is None: info["start_time"] = time_s
+        info.last_cam = cam_code
+        info.last_time = time_s
+        info.last_width = width
+        info.uids[cam_code - 1] = uid
+        if info.start_time is None: info.start_time = time_s
         if next_q_key: self.queues[next_q_key].append(mid)
+        self.set_status(mid, "TRACKING")
 
         attempt_detail["reason"] = "SUCCESS"
         return attempt_detail
 
+    @_locked
     def try_match(self, cam, time_s, width, uid):
         # 반환값이 이제 mid가 아니라 딕셔너리입니다.
         if cam == "USB_LOCAL":
@@ -128,20 +385,14 @@ class FIFOGlobalMatcher:
             return self._try_fifo("q3e", "RPI_USB3", cam, time_s, width, uid)
         return {"mid": None, "reason": "UNKNOWN_CAM"}
 
+    @_locked
     def resolve_pending(self, mid, now_s):
         info = self.masters[mid]
-        if info["status"] not in ["PENDING", "TRACKING"]:
+        deadline = self._pending_deadline(info)
+        if deadline is None:
             return None
-        from_cam = info.get("pending_from_cam") or info["last_cam"]
-        route = info["route_code"]
-        next_cam = self._get_next_cam(route, from_cam)
-        if not next_cam:
-            return None
-        key = (from_cam, next_cam)
-        if key not in config.AVG_TRAVEL:
-            return None
-        extra_margin = getattr(config, "PENDING_EXTRA_MARGIN_SEC", 0)
-        expected = info["last_time"] + config.AVG_TRAVEL[key] + config.TIME_MARGIN[key] + extra_margin
+        from_cam, next_cam, expected = deadline
+        route = info.route_code
         if now_s < expected:
             return None
         if route == "XSEA":
@@ -151,18 +402,18 @@ class FIFOGlobalMatcher:
         else:
             decision = "DISAPPEAR"
         # Phase 2: 재확인 — 이미 다음 카메라에서 이 master가 매칭되었으면 DISAPPEAR 하지 않음
-        if decision == "DISAPPEAR" and info.get("uids") and info["uids"].get(next_cam):
-            info["status"] = "TRACKING"
-            info["pending_from_cam"] = None
+        if decision == "DISAPPEAR" and info.uid_at(CameraCode[next_cam]):
+            info.pending_from_cam = None
             self.cancel_pending(from_cam, mid)
+            self.set_status(mid, "TRACKING")
             return None
-        info["status"] = decision
         self.cancel_pending(from_cam, mid)
+        self.set_status(mid, decision, now_s)
         return {"decision": decision, "from_cam": from_cam, "next_cam": next_cam, "expected": expected}
 
+    @_locked
     def cancel_pending(self, from_cam, mid):
-        q_map = {"Scanner": "q_scan", "USB_LOCAL": "q01", "RPI_USB1": "q12", "RPI_USB2": "q23", "RPI_USB3": "q3e"}
-        q_key = q_map.get(from_cam)
+        q_key = _Q_FROM_CAM.get(from_cam)
         if q_key and self.queues[q_key]:
             if q_key == "q_scan":
                 if self.queues[q_key][0][0] == mid:
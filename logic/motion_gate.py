@@ -0,0 +1,97 @@
+# motion_gate.py - track/logic
+"""
+detection 전 단계 motion gate. 전처리 이미지의 ROI/EOL 밴드(위아래 max_dy 확장, roi_x 범위)만 grayscale →
+1/downsample 축소해, 마지막으로 추론한 프레임의 같은 밴드와 픽셀 차이를 비교.
+변화 픽셀 비율이 min_changed_ratio 미만이고 직전 추론 결과가 비어 있으면 추론을 생략하고 빈 결과를 재사용
+(호출 측은 빈 detection으로 _process_with_detections를 그대로 호출해 pending/resolve는 계속 진행).
+안전장치: 연속 force_every 프레임 생략 후에는 변화가 없어도 강제 추론.
+"""
+from typing import Any, Dict, Optional, Sequence
+
+import cv2
+import numpy as np
+
+from logic.preprocess import PreprocessPlan, roi_crop_bands
+
+
+class MotionGate:
+    """
+    downsample: 밴드 축소 배율. pixel_thresh: 변화로 볼 gray 차이(0~255).
+    min_changed_ratio: 밴드 픽셀 중 변화 픽셀 비율이 이 값 이상이면 추론.
+    force_every: 연속 생략 상한 (이 횟수만큼 생략했으면 다음 프레임은 강제 추론). 0이면 강제 없음.
+    """
+
+    def __init__(self, downsample: int = 4, pixel_thresh: int = 20, min_changed_ratio: float = 0.002,
+                 force_every: int = 10):
+        self.downsample = max(1, downsample)
+        self.pixel_thresh = pixel_thresh
+        self.min_changed_ratio = min_changed_ratio
+        self.force_every = force_every
+        self._state: Dict[str, Dict[str, Any]] = {}
+
+    def _cam(self, cam: str) -> Dict[str, Any]:
+        st = self._state.get(cam)
+        if st is None:
+            st = {"ref": None, "last_empty": False, "since_run": 0,
+                  "frames": 0, "skipped": 0, "forced": 0, "motion": 0, "last_score": 0.0}
+            self._state[cam] = st
+        return st
+
+    def band_signature(self, img: np.ndarray, plan: PreprocessPlan) -> Optional[np.ndarray]:
+        """ROI/EOL 밴드 gray 축소본 (밴드 여러 개면 세로로 이어 붙임). 밴드가 없으면 None."""
+        H, W = img.shape[:2]
+        x0, x1 = max(0, int(plan.roi_x_min)), min(W, int(plan.roi_x_max))
+        bands = roi_crop_bands(H, plan.roi_top, plan.roi_bot, plan.eol_top, plan.eol_bot, plan.max_dy)
+        if x1 <= x0 or not bands:
+            return None
+        parts = []
+        for y0, y1 in bands:
+            gray = cv2.cvtColor(img[y0:y1, x0:x1], cv2.COLOR_BGR2GRAY)
+            size = (max(1, (x1 - x0) // self.downsample), max(1, (y1 - y0) // self.downsample))
+            parts.append(cv2.resize(gray, size, interpolation=cv2.INTER_AREA))
+        return parts[0] if len(parts) == 1 else np.vstack(parts)
+
+    def should_run(self, cam: str, img: np.ndarray, plan: PreprocessPlan) -> bool:
+        """True면 추론, False면 직전(빈) 결과 재사용. True일 때 현재 밴드를 다음 비교 기준으로 저장."""
+        st = self._cam(cam)
+        st["frames"] += 1
+        sig = self.band_signature(img, plan)
+        ref = st["ref"]
+        if sig is None or ref is None or ref.shape != sig.shape or not st["last_empty"]:
+            run = True
+        elif self.force_every and st["since_run"] >= self.force_every:
+            st["forced"] += 1
+            run = True
+        else:
+            changed = cv2.absdiff(sig, ref) > self.pixel_thresh
+            st["last_score"] = float(changed.mean())
+            run = st["last_score"] >= self.min_changed_ratio
+            if run:
+                st["motion"] += 1
+        if run:
+            st["ref"] = sig
+            st["since_run"] = 0
+        else:
+            st["skipped"] += 1
+            st["since_run"] += 1
+        return run
+
+    def record(self, cam: str, detections: Sequence[Any]) -> None:
+        """추론 결과 반영: 비어 있을 때만 다음 프레임 생략 가능."""
+        self._cam(cam)["last_empty"] = len(detections) == 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "force_every": self.force_every,
+            "cams": {
+                cam: {
+                    "frames": st["frames"],
+                    "skipped": st["skipped"],
+                    "skip_ratio": round(st["skipped"] / st["frames"], 3) if st["frames"] else 0.0,
+                    "forced": st["forced"],
+                    "motion": st["motion"],
+                    "last_score": round(st["last_score"], 4),
+                }
+                for cam, st in self._state.items()
+            },
+        }
@@ -0,0 +1,99 @@
+# postprocess.py - track/logic
+"""
+YOLO 박스 후처리 벡터화. results.boxes.xyxy를 CPU numpy로 한 번만 가져와 좌표 복원(letterbox·crop offset),
+정수화, 중심·폭, ROI/EOL 판정을 배열 연산으로 처리하고 구조화 배열(DETECTION_DTYPE)로 반환.
+기존 호출부용 list-of-dicts 변환은 to_dicts().
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from logic.preprocess import PreprocessPlan
+
+DETECTION_DTYPE = np.dtype([
+    ("x1", np.int32), ("y1", np.int32), ("x2", np.int32), ("y2", np.int32),
+    ("cx", np.float64), ("cy", np.float64),
+    ("width", np.int32),
+    ("in_roi", np.bool_), ("in_eol", np.bool_),
+])
+
+# (roi_top, roi_bot, roi_x_min, roi_x_max, eol_top, eol_bot)
+Bands = Tuple[float, float, float, float, Optional[float], Optional[float]]
+
+
+def roi_bands(cam_cfg, cam_id: str, W: int) -> Bands:
+    """cam_cfg는 PreprocessPlan 또는 픽셀 값 dict (roi_y, roi_margin, [roi_x_min/max], [eol_y, eol_margin])."""
+    if isinstance(cam_cfg, PreprocessPlan):
+        # plan에 미리 계산된 픽셀 밴드 사용 (EOL 없는 설정이면 빈 밴드로 처리)
+        eol_top = eol_bot = None
+        if cam_id == "RPI_USB3":
+            eol_top = cam_cfg.eol_top if cam_cfg.eol_top is not None else 0
+            eol_bot = cam_cfg.eol_bot if cam_cfg.eol_bot is not None else 0
+        return cam_cfg.roi_top, cam_cfg.roi_bot, cam_cfg.roi_x_min, cam_cfg.roi_x_max, eol_top, eol_bot
+
+    roi_y = cam_cfg.get("roi_y", 0)
+    roi_margin = cam_cfg.get("roi_margin", 0)
+    # 가로 범위 설정 (main에서 계산해서 넘겨준 값 사용)
+    roi_x_min = cam_cfg.get("roi_x_min", 0)
+    roi_x_max = cam_cfg.get("roi_x_max", W)
+    eol_top = eol_bot = None
+    if cam_id == "RPI_USB3":
+        eol_y = cam_cfg.get("eol_y", 0)
+        eol_margin = cam_cfg.get("eol_margin", 0)
+        eol_top, eol_bot = eol_y - eol_margin, eol_y + eol_margin
+    return roi_y - roi_margin, roi_y + roi_margin, roi_x_min, roi_x_max, eol_top, eol_bot
+
+
+def postprocess_xyxy(xyxy: np.ndarray, bands: Bands, letterbox: Optional[Tuple] = None,
+                     offset_y: int = 0) -> np.ndarray:
+    """
+    xyxy: (N, 4) float 박스 (모델 입력 좌표). letterbox: PreprocessPlan.letterbox (입력이 letterbox인 경우),
+    offset_y: crop 밴드 시작 y. 정수화는 기존 int() 변환과 같은 0 방향 절삭.
+    """
+    xyxy = np.asarray(xyxy, dtype=np.float64).reshape(-1, 4)
+    out = np.empty(len(xyxy), dtype=DETECTION_DTYPE)
+    if not len(xyxy):
+        return out
+    if letterbox is not None:
+        _, scale, pad_left, pad_top, _, _ = letterbox
+        xyxy = (xyxy - (pad_left, pad_top, pad_left, pad_top)) / scale
+    boxes = np.trunc(xyxy).astype(np.int32)
+    if offset_y:
+        boxes[:, 1] += offset_y
+        boxes[:, 3] += offset_y
+    x1, y1, x2, y2 = boxes.T
+    cx = (x1 + x2) / 2
+    cy = (y1 + y2) / 2
+    roi_top, roi_bot, roi_x_min, roi_x_max, eol_top, eol_bot = bands
+    in_x = (roi_x_min <= cx) & (cx <= roi_x_max)
+    out["x1"], out["y1"], out["x2"], out["y2"] = x1, y1, x2, y2
+    out["cx"], out["cy"] = cx, cy
+    out["width"] = x2 - x1
+    out["in_roi"] = (roi_top < cy) & (cy < roi_bot) & in_x
+    if eol_top is not None:
+        out["in_eol"] = (eol_top < cy) & (cy < eol_bot) & in_x
+    else:
+        out["in_eol"] = False
+    return out
+
+
+def to_dicts(dets: np.ndarray) -> List[Dict[str, Any]]:
+    """구조화 배열 → 기존 detection dict 리스트 (box/center/in_roi/in_eol/width, Python 기본 타입)."""
+    return [
+        {
+            "box": (x1, y1, x2, y2),
+            "center": (cx, cy),
+            "in_roi": in_roi,
+            "in_eol": in_eol,
+            "width": width,
+        }
+        for x1, y1, x2, y2, cx, cy, width, in_roi, in_eol in dets.tolist()
+    ]
+
+
+def boxes_to_numpy(boxes) -> np.ndarray:
+    """Ultralytics Boxes → (N, 4) float numpy. 텐서는 한 번만 CPU로 복사."""
+    xyxy = boxes.xyxy
+    if hasattr(xyxy, "cpu"):
+        xyxy = xyxy.cpu().numpy()
+    return np.asarray(xyxy, dtype=np.float64)
@@ -0,0 +1,285 @@
+# preprocess.py - track/logic
+"""
+카메라별 전처리 계획(PreprocessPlan). 입력 해상도가 같으면 회전·리사이즈 크기·픽셀 ROI/EOL·추적 임계값이
+매 프레임 같으므로 (cam, 입력 해상도)당 한 번만 계산해 불변 객체로 캐시.
+전역 config.CAM_SETTINGS는 읽기만 하고, 계산 결과는 plan(및 읽기 전용 plan.cfg)으로 detector/추적에 전달.
+FramePreprocessor: 리사이즈 → 회전 순서(작은 이미지를 회전)로 cam별 미리 잡은 버퍼에 기록,
+선택적으로 Ultralytics 입력 크기(정사각 letterbox)까지 만들어 모델 쪽 letterbox를 생략.
+"""
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import cv2
+import numpy as np
+
+ROTATE_CODES = {
+    90: cv2.ROTATE_90_CLOCKWISE,
+    180: cv2.ROTATE_180,
+    270: cv2.ROTATE_90_COUNTERCLOCKWISE,
+}
+
+
+@dataclass(frozen=True)
+class PreprocessPlan:
+    cam_id: str
+    src_size: Tuple[int, int]          # 입력 (w, h)
+    rotate: int                        # 0/90/180/270
+    rotate_code: Optional[int]         # cv2.ROTATE_* 또는 None
+    out_size: Tuple[int, int]          # 회전·리사이즈 후 (w, h)
+    interpolation: int
+    roi_y: int
+    roi_margin: int
+    roi_top: int
+    roi_bot: int
+    roi_x_min: int
+    roi_x_max: int
+    eol_y: Optional[int]
+    eol_margin: Optional[int]
+    eol_top: Optional[int]
+    eol_bot: Optional[int]
+    dist_eps: int
+    max_dy: int
+    forward_sign: int
+    # 기존 cfg dict 형태 (CAM_SETTINGS 원본 + 픽셀 값), 읽기 전용
+    cfg: Mapping[str, Any]
+    # letterbox 사용 시 (size, scale, pad_left, pad_top, new_w, new_h): out_size 이미지 → size x size 변환
+    letterbox: Optional[Tuple[int, float, int, int, int, int]] = None
+    # ROI crop 추론 사용 시: out_size 이미지의 세로 밴드 [(y0, y1), ...] (겹치면 병합)
+    crop_bands: Tuple[Tuple[int, int], ...] = ()
+    # crop 모델 입력 (h, w): 전체 프레임 추론과 같은 배율로 가장 높은 밴드를 담는 32 배수 크기
+    crop_imgsz: Optional[Tuple[int, int]] = None
+
+
+def letterbox_params(out_w: int, out_h: int, size: int) -> Tuple[int, float, int, int, int, int]:
+    """Ultralytics LetterBox(auto=False, center=True)와 같은 배율·패딩."""
+    scale = min(size / out_w, size / out_h)
+    new_w, new_h = int(round(out_w * scale)), int(round(out_h * scale))
+    pad_left = int(round((size - new_w) / 2 - 0.1))
+    pad_top = int(round((size - new_h) / 2 - 0.1))
+    return size, scale, pad_left, pad_top, new_w, new_h
+
+
+def _ceil_stride(v: float, stride: int = 32) -> int:
+    return max(stride, int(-(-v // stride)) * stride)
+
+
+def roi_crop_bands(H: int, roi_top: int, roi_bot: int, eol_top: Optional[int], eol_bot: Optional[int],
+                   pad: int) -> Tuple[Tuple[int, int], ...]:
+    """ROI(·EOL) 밴드를 위아래 pad만큼 넓혀 [0, H)로 자르고, 겹치거나 맞닿은 밴드는 하나로 병합."""
+    bands = [(max(0, roi_top - pad), min(H, roi_bot + pad))]
+    if eol_top is not None:
+        bands.append((max(0, eol_top - pad), min(H, eol_bot + pad)))
+    bands.sort()
+    merged = [bands[0]]
+    for y0, y1 in bands[1:]:
+        if y0 <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], y1))
+        else:
+            merged.append((y0, y1))
+    return tuple(b for b in merged if b[1] > b[0])
+
+
+def build_plan(cam_id: str, cam_cfg: Mapping[str, Any], src_w: int, src_h: int,
+               target_width: int = 640, interpolation: int = cv2.INTER_AREA,
+               letterbox_size: Optional[int] = None, roi_crop_pad_rate: Optional[float] = None,
+               model_imgsz: int = 640) -> PreprocessPlan:
+    """
+    회전 → target_width 리사이즈 기준으로 픽셀 값 계산 (기존 main._preprocess_frame 계산식과 동일).
+    letterbox_size 지정 시 모델 입력용 정사각 letterbox 파라미터도 계산.
+    roi_crop_pad_rate 지정 시 ROI crop 추론용 밴드 계산: pad = max(H * rate, max_dy) (밴드 중심 근처 박스가
+    잘리지 않고, 직전 위치에서 max_dy만큼 이동한 박스까지 잡히도록).
+    """
+    rotate = cam_cfg.get("rotate", 0)
+    rotate_code = ROTATE_CODES.get(rotate)
+    rot_w, rot_h = (src_h, src_w) if rotate in (90, 270) else (src_w, src_h)
+    target_w = cam_cfg.get("target_width", target_width)
+    target_h = int(rot_h * (target_w / rot_w))
+    H, W = target_h, target_w
+
+    roi_y = int(H * cam_cfg.get("roi_y_rate", 0))
+    roi_margin = int(H * cam_cfg.get("roi_margin_rate", 0))
+    eol_y = eol_margin = eol_top = eol_bot = None
+    if "eol_y_rate" in cam_cfg:
+        eol_y = int(H * cam_cfg["eol_y_rate"])
+        eol_margin = int(H * cam_cfg["eol_margin_rate"])
+        eol_top, eol_bot = eol_y - eol_margin, eol_y + eol_margin
+    dist_eps = int(H * cam_cfg.get("dist_eps_rate", 0))
+    max_dy = int(H * cam_cfg.get("max_dy_rate", 0))
+
+    crop_bands: Tuple[Tuple[int, int], ...] = ()
+    crop_imgsz = None
+    if roi_crop_pad_rate is not None:
+        pad = max(int(H * roi_crop_pad_rate), max_dy)
+        crop_bands = roi_crop_bands(H, roi_y - roi_margin, roi_y + roi_margin, eol_top, eol_bot, pad)
+        # 전체 프레임 추론(imgsz letterbox)과 같은 배율 → 객체 픽셀 크기가 달라지지 않음
+        scale = min(model_imgsz / W, model_imgsz / H)
+        band_h = max(y1 - y0 for y0, y1 in crop_bands)
+        crop_imgsz = (_ceil_stride(band_h * scale), _ceil_stride(W * scale))
+
+    cfg: Dict[str, Any] = dict(cam_cfg)
+    cfg.update(roi_y=roi_y, roi_margin=roi_margin, dist_eps=dist_eps, max_dy=max_dy)
+    if eol_y is not None:
+        cfg.update(eol_y=eol_y, eol_margin=eol_margin)
+
+    return PreprocessPlan(
+        cam_id=cam_id,
+        src_size=(src_w, src_h),
+        rotate=rotate,
+        rotate_code=rotate_code,
+        out_size=(W, H),
+        interpolation=interpolation,
+        roi_y=roi_y,
+        roi_margin=roi_margin,
+        roi_top=roi_y - roi_margin,
+        roi_bot=roi_y + roi_margin,
+        roi_x_min=cam_cfg.get("roi_x_min", 0),
+        roi_x_max=cam_cfg.get("roi_x_max", W),
+        eol_y=eol_y,
+        eol_margin=eol_margin,
+        eol_top=eol_top,
+        eol_bot=eol_bot,
+        dist_eps=dist_eps,
+        max_dy=max_dy,
+        forward_sign=cam_cfg.get("forward_sign", 1),
+        cfg=MappingProxyType(cfg),
+        letterbox=letterbox_params(W, H, letterbox_size) if letterbox_size else None,
+        crop_bands=crop_bands,
+        crop_imgsz=crop_imgsz,
+    )
+
+
+class PreprocessPlanCache:
+    """
+    cam별 plan 1개 보관. get(cam_id, shape)은 입력 해상도가 바뀌었을 때만 새로 계산 (그 외 dict 조회 1회).
+    cam_settings: config.CAM_SETTINGS (읽기 전용으로 사용).
+    """
+
+    def __init__(self, cam_settings: Mapping[str, Mapping[str, Any]], target_width: int = 640,
+                 letterbox_size: Optional[int] = None, roi_crop_pad_rate: Optional[float] = None,
+                 model_imgsz: int = 640):
+        self._cam_settings = cam_settings
+        self._target_width = target_width
+        self._letterbox_size = letterbox_size
+        self._roi_crop_pad_rate = roi_crop_pad_rate
+        self._model_imgsz = model_imgsz
+        self._plans: Dict[str, PreprocessPlan] = {}
+        self._lock = threading.Lock()
+
+    def get(self, cam_id: str, shape) -> Optional[PreprocessPlan]:
+        """shape: 입력 프레임 shape (h, w[, c]). 설정 없는 cam이면 None."""
+        h, w = shape[:2]
+        plan = self._plans.get(cam_id)
+        if plan is not None and plan.src_size == (w, h):
+            return plan
+        cam_cfg = self._cam_settings.get(cam_id)
+        if not cam_cfg:
+            return None
+        plan = build_plan(cam_id, cam_cfg, w, h, self._target_width, letterbox_size=self._letterbox_size,
+                          roi_crop_pad_rate=self._roi_crop_pad_rate, model_imgsz=self._model_imgsz)
+        with self._lock:
+            self._plans[cam_id] = plan
+        return plan
+
+    def invalidate(self, cam_id: Optional[str] = None) -> None:
+        """CAM_SETTINGS 변경 시 호출. cam_id 생략 시 전체."""
+        with self._lock:
+            if cam_id is None:
+                self._plans.clear()
+            else:
+                self._plans.pop(cam_id, None)
+
+
+def _resize_size(plan: PreprocessPlan) -> Tuple[int, int]:
+    """회전 전에 리사이즈할 (w, h). 90/270도면 out_size의 가로·세로를 뒤바꾼 크기."""
+    W, H = plan.out_size
+    return (H, W) if plan.rotate in (90, 270) else (W, H)
+
+
+def apply_plan(plan: PreprocessPlan, img: np.ndarray) -> np.ndarray:
+    """
+    plan대로 out_size 이미지 생성. 리사이즈 후 회전 (회전은 픽셀 재배치라 순서를 바꿔도 결과 동일,
+    전체 해상도 대신 축소된 이미지를 회전). 항상 새 배열 반환 (입력은 읽기 전용일 수 있음).
+    """
+    resized = cv2.resize(img, _resize_size(plan), interpolation=plan.interpolation)
+    if plan.rotate_code is None:
+        return resized
+    return cv2.rotate(resized, plan.rotate_code)
+
+
+def unletterbox_xyxy(plan: PreprocessPlan, x1: float, y1: float, x2: float, y2: float):
+    """letterbox 좌표 박스 → out_size 이미지 좌표."""
+    _, scale, pad_left, pad_top, _, _ = plan.letterbox
+    return ((x1 - pad_left) / scale, (y1 - pad_top) / scale,
+            (x2 - pad_left) / scale, (y2 - pad_top) / scale)
+
+
+def roi_crops(plans_and_frames):
+    """
+    [(plan, img), ...] → (crops, owners, imgsz).
+    crops: 각 plan.crop_bands의 img 세로 슬라이스 (복사 없음), owners: crop별 (입력 인덱스, y0),
+    imgsz: 배치 공통 모델 입력 (h, w) = crop_imgsz의 최대값.
+    """
+    crops, owners = [], []
+    imgsz_h = imgsz_w = 0
+    for idx, (plan, img) in enumerate(plans_and_frames):
+        for y0, y1 in plan.crop_bands:
+            crops.append(img[y0:y1])
+            owners.append((idx, y0))
+        if plan.crop_imgsz:
+            imgsz_h = max(imgsz_h, plan.crop_imgsz[0])
+            imgsz_w = max(imgsz_w, plan.crop_imgsz[1])
+    return crops, owners, ((imgsz_h, imgsz_w) if imgsz_h else None)
+
+
+class FramePreprocessor:
+    """
+    cam별 출력 버퍼를 한 번 잡아두고 재사용하는 전처리기.
+    slots: cam별 버퍼 벌 수. run()은 cam마다 slot을 돌아가며 쓰므로, 돌려준 배열은 같은 cam의 slots번째
+    다음 run()에서 덮어써짐 (세트 파이프라인은 동시에 처리 중인 세트 수만큼 slot 필요).
+    그 이후까지 보관할 부분(썸네일 crop 등)은 호출 측에서 복사.
+    letterbox(): 같은 cam의 마지막 run() 결과를 그 slot의 plan.letterbox 크기 정사각 버퍼에 (패딩 114) 배치해 모델 입력으로 사용.
+    """
+
+    PAD_VALUE = 114
+
+    def __init__(self, slots: int = 1):
+        self.slots = max(1, slots)
+        self._buffers: Dict[str, Dict[str, np.ndarray]] = {}
+        self._slot: Dict[str, int] = {}
+
+    def _buffer(self, cam_id: str, name: str, shape, dtype, fill=None) -> np.ndarray:
+        bufs = self._buffers.setdefault(cam_id, {})
+        name = f"{name}@{self._slot.get(cam_id, 0)}"
+        buf = bufs.get(name)
+        if buf is None or buf.shape != shape or buf.dtype != dtype:
+            buf = np.empty(shape, dtype=dtype)
+            if fill is not None:
+                buf.fill(fill)
+            bufs[name] = buf
+        return buf
+
+    def run(self, plan: PreprocessPlan, img: np.ndarray) -> np.ndarray:
+        self._slot[plan.cam_id] = (self._slot.get(plan.cam_id, -1) + 1) % self.slots
+        W, H = plan.out_size
+        extra = img.shape[2:]
+        out = self._buffer(plan.cam_id, "out", (H, W) + extra, img.dtype)
+        if plan.rotate_code is None:
+            cv2.resize(img, (W, H), dst=out, interpolation=plan.interpolation)
+            return out
+        rw, rh = _resize_size(plan)
+        tmp = self._buffer(plan.cam_id, "resized", (rh, rw) + extra, img.dtype)
+        cv2.resize(img, (rw, rh), dst=tmp, interpolation=plan.interpolation)
+        cv2.rotate(tmp, plan.rotate_code, dst=out)
+        return out
+
+    def letterbox(self, plan: PreprocessPlan, img: np.ndarray) -> np.ndarray:
+        """run() 결과(out_size) → size x size letterbox. 패딩 영역은 버퍼 할당 시 한 번만 채움."""
+        size, _, pad_left, pad_top, new_w, new_h = plan.letterbox
+        # 패딩 위치가 바뀌면(입력 해상도 변경) 다른 버퍼를 쓰도록 배치 크기로 구분
+        box = self._buffer(plan.cam_id, f"letterbox:{new_w}x{new_h}", (size, size) + img.shape[2:], img.dtype,
+                           self.PAD_VALUE)
+        cv2.resize(img, (new_w, new_h), dst=box[pad_top:pad_top + new_h, pad_left:pad_left + new_w],
+                   interpolation=cv2.INTER_LINEAR)
+        return box
@@ -7,6 +7,7 @@ _track_root = Path(__file__).resolve().parent.parent
 if str(_track_root) not in sys.path:
     sys.path.insert(0, str(_track_root))
 import config
+from logic.master_record import MasterStatus, route_and_status
 
 
 class TrackingVisualizer:
@@ -14,34 +15,42 @@ class TrackingVisualizer:
         self.enabled = enabled if enabled is not None else config.SAVE_VIDEO
         self.writers = {}
 
-    def draw_and_write(self, cam, img, detections, masters, frame_ts, active_tracks):
+    def draw_and_write(self, cam, img, detections, get_master, frame_ts, active_tracks, det_tracks=None):
+        """
+        get_master: master uid → MasterRecord/archive 레코드 조회 함수 (FIFOGlobalMatcher.get_master, 없으면 None).
+        det_tracks: detection index → active_tracks[cam] track uid (main의 association 결과).
+        None이면 track last_pos와 detection 중심이 같은 track을 찾아 라벨링.
+        """
         if not self.enabled:
             return
 
         disp = img.copy()
 
-        for det in detections:
+        tracks = active_tracks.get(cam, {})
+        for det_idx, det in enumerate(detections):
             x1, y1, x2, y2 = det['box']
             cx, cy = det['center']
 
             color = (0, 0, 255)
             display_text = "Unmatched"
 
-            for uid, info in active_tracks.get(cam, {}).items():
-                if info["last_pos"] == (cx, cy):
-                    mid = info["master_id"]
-                    if mid and mid in masters:
-                        status = masters[mid].get("status")
-                        if status == "MISSING":
-                            color = (255, 0, 255)
-                            display_text = f"!! MISSING !! ID: {mid}"
-                        else:
-                            color = (0, 255, 0)
-                            display_text = f"ID: {mid}"
+            if det_tracks is not None:
+                uid = det_tracks.get(det_idx)
+            else:
+                uid = next((u for u, info in tracks.items() if info["last_pos"] == (cx, cy)), None)
+            if uid in tracks:
+                mid = tracks[uid]["master_id"]
+                m_info = get_master(mid) if mid else None
+                if m_info is not None:
+                    if route_and_status(m_info)[1] == MasterStatus.MISSING:
+                        color = (255, 0, 255)
+                        display_text = f"!! MISSING !! ID: {mid}"
                     else:
-                        color = (0, 255, 255)
-                        display_text = uid
-                    break
+                        color = (0, 255, 0)
+                        display_text = f"ID: {mid}"
+                else:
+                    color = (0, 255, 255)
+                    display_text = uid
 
             cv2.rectangle(disp, (x1, y1), (x2, y2), color, 3 if display_text.startswith("!!") else 2)
             (w, h), _ = cv2.getTextSize(display_text, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)
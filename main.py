@@ -10,6 +10,7 @@ import os
 import signal
 import sys
 import time
+from collections import deque
 import cv2
 import numpy as np
 from pathlib import Path
@@ -44,11 +45,20 @@ if str(TRACK_ROOT) not in sys.path:
 import config
 from ingest.config_loader import ConfigLoader
 from ingest.frame_aggregator import FrameAggregator
+from ingest.decode_pool import DecodePool
 from ingest.frame_receiver import FrameReceiver
 from ingest.time_ordered_buffer import TimeOrderedFrameBuffer
 from ingest.usb_camera_worker import USBCameraWorker
+from ingest.wire_format import choose_reduce_factor
+from ingest.zmq_reactor import ZmqReactor, configure_sub_socket
+from logic.association import associate
 from logic.detector import YOLODetector
+from logic.inference_pool import InferencePool
+from logic.inference_scheduler import InferenceScheduler
+from logic.master_record import MasterStatus, route_and_status
 from logic.matcher import FIFOGlobalMatcher
+from logic.motion_gate import MotionGate
+from logic.preprocess import FramePreprocessor, PreprocessPlanCache, apply_plan, build_plan
 from logic.visualizer import TrackingVisualizer
 from logic import api_helper
 from logic.scanner_listener import ScannerListener
@@ -75,16 +85,40 @@ def main():
     loader = ConfigLoader()
     loader.load()
     use_time_ordered = getattr(config, "USE_TIME_ORDERED_BUFFER", False)
+    # zero-copy: 수신 frame 소유권을 sink로 넘기고 읽기 전용으로 공유 (전처리는 항상 새 배열 생성)
+    zero_copy = getattr(config, "INGEST_ZERO_COPY", True)
     if use_time_ordered:
         maxlen = getattr(config, "TIME_ORDERED_BUFFER_MAXLEN", 60)
-        frame_sink = TimeOrderedFrameBuffer(config.TRACKING_CAMS, maxlen_per_cam=maxlen)
+        frame_sink = TimeOrderedFrameBuffer(
+            config.TRACKING_CAMS, maxlen_per_cam=maxlen, zero_copy=zero_copy,
+            arena=getattr(config, "TIME_ORDERED_BUFFER_ARENA", False),
+        )
     else:
-        frame_sink = FrameAggregator()
+        frame_sink = FrameAggregator(zero_copy=zero_copy)
 
     # ZMQ: one SUB socket per rbp_client, FrameReceiver with callback
+    # reactor 모드: 소켓마다 polling 스레드 대신 Poller 스레드 1개가 모든 소켓을 블로킹 대기
     import zmq
     ctx = zmq.Context()
     receivers = []
+    use_reactor = getattr(config, "ZMQ_USE_REACTOR", True)
+    reactor = ZmqReactor(
+        poll_timeout_ms=getattr(config, "ZMQ_POLL_TIMEOUT_MS", 100),
+        max_batch=getattr(config, "ZMQ_DRAIN_BATCH", 64),
+    ) if use_reactor else None
+    # 디코딩 워커 풀: 수신 스레드에서 LZ4/base64/imdecode를 떼어내 병렬 처리 (카메라별 수신 순서 유지)
+    decode_pool = None
+    decode_workers = getattr(config, "DECODE_WORKERS", 2)
+    if decode_workers > 0:
+        max_backlog = getattr(config, "DECODE_MAX_BACKLOG", None)
+        if max_backlog is None and use_time_ordered:
+            max_backlog = maxlen
+        decode_pool = DecodePool(
+            workers=decode_workers,
+            queue_size=getattr(config, "DECODE_QUEUE_SIZE", 64),
+            max_backlog=max_backlog,
+        )
+        decode_pool.start()
     stream_cfg = loader.get_stream_config()
     use_lz4 = stream_cfg.get("use_lz4", True)
 
@@ -96,6 +130,20 @@ def main():
                 frame_sink.put(cam_id, frame, ts)
         return cb
 
+    # 축소 디코딩: 카메라별 target_width(회전 반영) 이상으로 남는 최대 1/2^k 해상도로 JPEG 디코딩.
+    reduced_decode = getattr(config, "ZMQ_REDUCED_DECODE", True)
+    default_target_w = getattr(config, "PREPROCESS_TARGET_WIDTH", 640)
+
+    def make_reduce_factor_fn(rpi_id):
+        def fn(camera_name, width, height):
+            cam_id = config.ZMQ_CAM_MAPPING.get(f"{rpi_id}:{camera_name}")
+            cfg = config.CAM_SETTINGS.get(cam_id)
+            if not cfg:
+                return 1
+            return choose_reduce_factor(width, height, cfg.get("rotate", 0),
+                                        cfg.get("target_width", default_target_w))
+        return fn
+
     for client in loader.get_rbp_clients():
         rpi_id = client.get("id", "rpi1")
         ip = client.get("ip", "127.0.0.1")
@@ -103,13 +151,27 @@ def main():
         addr = f"tcp://{ip}:{port}"
         sock = ctx.socket(zmq.SUB)
         sock.setsockopt(zmq.SUBSCRIBE, b"")
+        configure_sub_socket(sock, rcvhwm=client.get("rcvhwm", getattr(config, "ZMQ_RCVHWM", None)))
         sock.connect(addr)
-        recv = FrameReceiver(sock, use_lz4=use_lz4, output_bgr=True)
+        recv = FrameReceiver(sock, use_lz4=use_lz4, output_bgr=True, zero_copy=zero_copy,
+                             wire_format=client.get("wire_format", "auto"),
+                             decode_pool=decode_pool, source_id=rpi_id,
+                             reduce_factor_fn=make_reduce_factor_fn(rpi_id) if reduced_decode else None)
         recv.set_frame_callback(make_zmq_callback(rpi_id))
-        recv.start()
+        if reactor:
+            reactor.add(recv, conflate=client.get("conflate", False))
+        else:
+            recv.start()
         receivers.append(recv)
+    if reactor:
+        reactor.start()
+
+    # USB: local cameras -> sink with USB_LOCAL (캡처 스레드가 새 프레임마다 1번 push)
+    def make_usb_callback(cam_id):
+        def cb(camera_name, frame, ts):
+            frame_sink.put(cam_id, frame, ts)
+        return cb
 
-    # USB: local cameras -> aggregator with USB_LOCAL
     usb_workers = []
     for cam_name, cam_cfg in loader.get_local_usb_cameras().items():
         if not cam_cfg.get("enabled", True):
@@ -119,44 +181,51 @@ def main():
             continue
         cam_id = config.ZMQ_CAM_MAPPING[key]
         worker = USBCameraWorker(cam_name, cam_cfg)
+        worker.set_frame_callback(make_usb_callback(cam_id))
         if worker.start():
             usb_workers.append((worker, cam_id))
 
-    # USB feeder thread: periodically put latest frame into sink
-    def usb_feeder_loop():
-        while _running:
-            for worker, cam_id in usb_workers:
-                frame = worker.get_latest_frame()
-                if frame is not None:
-                    frame_sink.put(cam_id, frame, worker.latest_timestamp)
-            time.sleep(0.02)
-    import threading
     _running = True
 
     def shutdown(*_):
         nonlocal _running
         _running = False
 
-    usb_feeder = threading.Thread(target=usb_feeder_loop, daemon=True)
-    usb_feeder.start()
-
     # Logic: detector, matcher, visualizer (optional)
-    detector = YOLODetector(config.MODEL_PATH)
-    # 워밍업: YOLO11+ThreadPool 시 setup_model/fuse를 메인 스레드에서 먼저 실행해 fuse() Conv.bn 오류 방지
-    if use_time_ordered:
-        import numpy as np
+    # ROI crop 추론: cam별 ROI/EOL 밴드(+패딩)만 잘라 배치 추론 (밴드 밖 detection은 반환되지 않음)
+    use_roi_crop = getattr(config, "YOLO_ROI_CROP", False)
+    detector = YOLODetector(config.MODEL_PATH, roi_crop=use_roi_crop)
+
+    def _warmup_detector(det):
+        """워밍업: setup_model/fuse를 메인 스레드에서 먼저 실행해 워커 스레드의 fuse() Conv.bn 오류 방지."""
         _dummy = np.zeros((640, 640, 3), dtype=np.uint8) # 640으로 워밍업
-        _cfg = config.CAM_SETTINGS.get("USB_LOCAL", {}).copy() # 원본 보존을 위해 copy
-        if _cfg:
-            # 워밍업용 가상 해상도(1280) 기준으로 픽셀 값 계산
-            _h_warm = 1280
-            _cfg['roi_y'] = int(_h_warm * _cfg.get('roi_y_rate', 0.5))
-            _cfg['roi_margin'] = int(_h_warm * _cfg.get('roi_margin_rate', 0.1))
-            _cfg['dist_eps'] = int(_h_warm * _cfg.get('dist_eps_rate', 0.05))
-            _cfg['max_dy'] = int(_h_warm * _cfg.get('max_dy_rate', 0.1))
-            
-            detector.get_detections(_dummy, _cfg, "USB_LOCAL")
+        if "USB_LOCAL" in config.CAM_SETTINGS:
+            _plan = build_plan("USB_LOCAL", config.CAM_SETTINGS["USB_LOCAL"], 640, 640, default_target_w)
+            det.get_detections(_dummy, _plan, "USB_LOCAL")
+
+    # 세트 모드: 상주 추론 워커 풀 (워커마다 모델 복제본 1개, 첫 워커는 detector 재사용)
+    inference_pool = None
+    if use_time_ordered:
+        n_workers = max(1, getattr(config, "INFERENCE_WORKERS", 1))
+        pool_detectors = [detector] + [YOLODetector(config.MODEL_PATH, roi_crop=use_roi_crop) for _ in range(n_workers - 1)]
+        for det in pool_detectors:
+            _warmup_detector(det)
+        inference_pool = InferencePool(
+            pool_detectors,
+            queue_size=getattr(config, "INFERENCE_QUEUE_SIZE", 8),
+            submit_timeout=getattr(config, "INFERENCE_SUBMIT_TIMEOUT_SEC", None),
+        )
+        inference_pool.start()
     matcher = FIFOGlobalMatcher()
+    # cam별 적응형 추론 주기: ROI 근처 활동·active track·도착 예정 master가 없는 cam은 idle 간격으로만 추론
+    inference_scheduler = None
+    if getattr(config, "INFERENCE_SCHEDULER", False):
+        inference_scheduler = InferenceScheduler(
+            config.TRACKING_CAMS, matcher,
+            idle_interval=getattr(config, "SCHEDULER_IDLE_INTERVAL_SEC", 2.0),
+            idle_after=getattr(config, "SCHEDULER_IDLE_AFTER_SEC", 3.0),
+            lookahead=getattr(config, "SCHEDULER_LOOKAHEAD_SEC", 1.0),
+        )
     visualizer = TrackingVisualizer(enabled=args.video)
 
     # Scanner listener (required)
@@ -194,6 +263,7 @@ def main():
     frame_sync_log_file = None
     processing_times_log_file = None
     last_stats_time = time.time()
+    pool_stats_interval = getattr(config, "INFERENCE_POOL_STATS_INTERVAL_SEC", 10)
     T_cur = None
     t_last_set = time.time()
     sets_formed_this_second = 0
@@ -214,103 +284,140 @@ def main():
     last_consumed_ts = {cam: None for cam in config.TRACKING_CAMS}
     stale_sec = getattr(config, "STALE_FRAME_SEC", 30)
     resolve_ts_ahead_sec = getattr(config, "RESOLVE_PENDING_TS_AHEAD_SEC", 5)
+    association_mode = getattr(config, "ASSOCIATION_MODE", "greedy_compat")
+
+    # cam별 전처리 계획: 입력 해상도가 바뀔 때만 재계산, config.CAM_SETTINGS는 수정하지 않음
+    # letterbox: 전처리에서 YOLO_IMGSZ 정사각 입력까지 만들어 Ultralytics letterbox를 생략 (박스는 detector가 되돌림)
+    # ROI crop 모드는 전처리 이미지에서 밴드를 잘라 쓰므로 letterbox를 만들지 않음
+    use_letterbox = getattr(config, "PREPROCESS_LETTERBOX", False) and not use_roi_crop
+    yolo_imgsz = getattr(config, "YOLO_IMGSZ", 640)
+    preprocess_plans = PreprocessPlanCache(
+        config.CAM_SETTINGS, default_target_w,
+        letterbox_size=yolo_imgsz if use_letterbox else None,
+        roi_crop_pad_rate=getattr(config, "ROI_CROP_PAD_RATE", 0.1) if use_roi_crop else None,
+        model_imgsz=yolo_imgsz,
+    )
+    # motion gate: ROI/EOL 밴드 프레임 차이로 빈 컨베이어 구간의 detection 생략 (MOTION_GATE_FORCE_EVERY마다 강제 추론)
+    motion_gate = None
+    if getattr(config, "MOTION_GATE", False):
+        motion_gate = MotionGate(
+            downsample=getattr(config, "MOTION_GATE_DOWNSAMPLE", 4),
+            pixel_thresh=getattr(config, "MOTION_GATE_PIXEL_THRESH", 20),
+            min_changed_ratio=getattr(config, "MOTION_GATE_MIN_CHANGED_RATIO", 0.002),
+            force_every=getattr(config, "MOTION_GATE_FORCE_EVERY", 10),
+        )
+    # 세트 파이프라인 깊이: 워커가 여러 개면 세트 N의 결과를 처리하기 전에 N+1..을 미리 제출해 워커를 동시에 사용.
+    # 스케줄러·motion gate는 cam별 직전 세트 결과로 다음 세트의 추론 여부를 정하므로 함께 켜면 깊이 1
+    pipeline_depth = 1
+    if inference_pool and inference_pool.num_workers > 1:
+        if inference_scheduler or motion_gate:
+            print("⚠️ INFERENCE_WORKERS > 1 but INFERENCE_SCHEDULER/MOTION_GATE is on: set pipelining disabled")
+        else:
+            pipeline_depth = inference_pool.num_workers
+    # 재사용 버퍼: 프레임마다 새 배열을 만들지 않고 cam별 버퍼에 리사이즈 → 회전 결과를 기록
+    # (파이프라인 중인 세트가 서로의 버퍼를 덮어쓰지 않도록 깊이만큼 slot)
+    frame_preprocessor = (FramePreprocessor(slots=pipeline_depth)
+                          if getattr(config, "PREPROCESS_REUSE_BUFFERS", True) else None)
+
+    def _preprocess_frame(cam, img):
+        """카메라 1프레임 전처리: plan대로 640 리사이즈 → 회전. (img, plan) 또는 None."""
+        if img is None:
+            return None
+        plan = preprocess_plans.get(cam, img.shape)
+        if plan is None:
+            return None
+        if frame_preprocessor is not None:
+            return frame_preprocessor.run(plan, img), plan
+        return apply_plan(plan, img), plan
+
+    def _model_input(img, plan):
+        """detector 입력: letterbox 모드면 정사각 버퍼, 아니면 전처리 이미지 그대로."""
+        if plan.letterbox is None:
+            return img
+        if frame_preprocessor is not None:
+            return frame_preprocessor.letterbox(plan, img)
+        return FramePreprocessor().letterbox(plan, img)
+
+    def _draw_roi_guides(img, plan):
+        """ROI 가이드라인 시각화 (display 옵션 시). detection 이후에 그려 YOLO 입력을 오염시키지 않음."""
+        H, W = img.shape[:2]
+        cv2.line(img, (0, plan.roi_y), (W, plan.roi_y), (0, 255, 255), 2)
+        overlay = img.copy()
+        y_min = max(0, plan.roi_top)
+        y_max = min(H, plan.roi_bot)
+        cv2.rectangle(overlay, (0, y_min), (W, y_max), (0, 0, 255), -1)
+        cv2.addWeighted(overlay, 0.2, img, 0.8, 0, img)
+        if plan.eol_y is not None:
+            cv2.line(img, (0, plan.eol_y), (W, plan.eol_y), (255, 0, 255), 2)
 
     def process_one_frame(cam, img, ts, time_s):
-        """한 카메라 프레임에 대한 전처리 및 감지 로직 호출."""
-        cfg = config.CAM_SETTINGS.get(cam)
-        if not cfg:
+        """한 카메라 프레임에 대한 전처리 및 감지 로직 호출 (FrameAggregator 모드)."""
+        prepared = _preprocess_frame(cam, img)
+        if prepared is None:
             return
-
-        # 1. 이미지 회전
-        rotate_val = cfg.get("rotate", 0)
-        if rotate_val == 90:
-            img = cv2.rotate(img, cv2.ROTATE_90_CLOCKWISE)
-        elif rotate_val == 180:
-            img = cv2.rotate(img, cv2.ROTATE_180)
-        elif rotate_val == 270:
-            img = cv2.rotate(img, cv2.ROTATE_90_COUNTERCLOCKWISE)
-
-        # 2. 병목 방지를 위한 640 리사이징
-        target_w = 640
-        h_orig, w_orig = img.shape[:2]
-        scale = target_w / w_orig
-        target_h = int(h_orig * scale)
-        img = cv2.resize(img, (target_w, target_h), interpolation=cv2.INTER_AREA)
-
-        # 3. 실시간 해상도 기반 비율 설정 계산하여 cfg 업데이트
-        H, W = img.shape[:2]
-        cfg['roi_y'] = int(H * cfg.get('roi_y_rate', 0))
-        cfg['roi_margin'] = int(H * cfg.get('roi_margin_rate', 0))
-        cfg['dist_eps'] = int(H * cfg.get('dist_eps_rate', 0))
-        cfg['max_dy'] = int(H * cfg.get('max_dy_rate', 0))
-        if 'eol_y_rate' in cfg:
-            cfg['eol_y'] = int(H * cfg['eol_y_rate'])
-            cfg['eol_margin'] = int(H * cfg['eol_margin_rate'])
-
-        # 4. ROI 가이드라인 시각화 (display 옵션 시)
+        img, plan = prepared
+        if motion_gate and not motion_gate.should_run(cam, img, plan):
+            detections = []
+        else:
+            detections = detector.get_detections(_model_input(img, plan), plan, cam)
+            if motion_gate:
+                motion_gate.record(cam, detections)
+        if inference_scheduler:
+            inference_scheduler.observe(cam, time_s, detections, plan)
         if args.display:
-            cv2.line(img, (0, cfg['roi_y']), (W, cfg['roi_y']), (0, 255, 255), 2)
-            overlay = img.copy()
-            y_min = max(0, cfg['roi_y'] - cfg['roi_margin'])
-            y_max = min(H, cfg['roi_y'] + cfg['roi_margin'])
-            cv2.rectangle(overlay, (0, y_min), (W, y_max), (0, 0, 255), -1)
-            cv2.addWeighted(overlay, 0.2, img, 0.8, 0, img)
-            if 'eol_y' in cfg:
-                cv2.line(img, (0, cfg['eol_y']), (W, cfg['eol_y']), (255, 0, 255), 2)
-
-        detections = detector.get_detections(img, cfg, cam)
-        _process_with_detections(cam, img, ts, time_s, detections)
-
-    def _process_with_detections(cam, img, ts, time_s, detections, thumbnail_crops=None):
-        """detection 결과를 받아 matching, pending, resolve, position API, video/display 수행."""
+            _draw_roi_guides(img, plan)
+        _process_with_detections(cam, img, ts, time_s, detections, plan)
+
+    def _process_with_detections(cam, img, ts, time_s, detections, plan, thumbnail_crops=None):
+        """detection 결과를 받아 matching, pending, resolve, position API, video/display 수행. plan: PreprocessPlan."""
         global cv2
-        cfg = config.CAM_SETTINGS.get(cam)
-        if not cfg:
-            return
         
-        # (img는 process_one_frame에서 이미 회전/리사이징됨)
+        # (img는 _preprocess_frame에서 이미 회전/리사이징됨)
         new_active = {}
+        # new_active track uid → 그 track을 마지막으로 갱신한 detection index (visualizer 라벨용)
+        track_det = {}
         if thumbnail_crops is None:
             thumbnail_crops = {}
 
-        for det in detections:
+        # detection ↔ active track 비용 행렬 한 번에 계산 후 배정 (-1 = 새 track)
+        track_uids = list(active_tracks[cam])
+        assigned = associate([det["center"] for det in detections],
+                             [active_tracks[cam][uid]["last_pos"] for uid in track_uids],
+                             plan.forward_sign, plan.dist_eps, plan.max_dy, association_mode)
+
+        for det_idx, det in enumerate(detections):
             x1, y1, x2, y2 = det["box"]
             cx, cy = det["center"]
 
-            best_uid, best_score = None, 1e9
-            for uid, info in active_tracks[cam].items():
-                dx = abs(cx - info["last_pos"][0])
-                dy = (cy - info["last_pos"][1]) * cfg["forward_sign"]
-                if dx > cfg["dist_eps"] or dy < -5 or dy > cfg["max_dy"]:
-                    continue
-                score = dx + dy * 0.3
-                if score < best_score:
-                    best_uid, best_score = uid, score
+            best_uid = track_uids[assigned[det_idx]] if assigned[det_idx] >= 0 else None
 
             route, mid, event_type = "UNKNOWN", None, "UNMATCHED"
 
             if best_uid:
                 mid = active_tracks[cam][best_uid]["master_id"]
-                if mid and mid in matcher.masters:
-                    route = matcher.masters[mid]["route_code"]
-                    if matcher.masters[mid]["status"] == "MISSING":
+                # archive로 옮겨진 master도 조회 (MISSING 추적은 계속 제외)
+                m_info = matcher.get_master(mid) if mid else None
+                if m_info is not None:
+                    route, status = route_and_status(m_info)
+                    if status == MasterStatus.MISSING:
                         continue
                     event_type = "TRACKING"
             else:
                 local_uid_counter[cam] += 1
                 best_uid = f"{cam}_{local_uid_counter[cam]:03d}"
                 match_cam = "RPI_USB3_EOL" if det.get("in_eol") else cam
-                mid = matcher.try_match(match_cam, time_s, det["width"], best_uid)
+                mid = matcher.try_match(match_cam, time_s, det["width"], best_uid).get("mid")
 
-                if mid and mid in matcher.masters:
-                    route = matcher.masters[mid]["route_code"]
+                m_info = matcher.get_master(mid) if mid else None
+                if m_info is not None:
+                    route, status = route_and_status(m_info)
                     if (route == "XSEA" and cam == "RPI_USB3") or (route == "XSEB" and match_cam == "RPI_USB3_EOL"):
-                        if matcher.masters[mid]["status"] != "MISSING":
-                            matcher.masters[mid]["status"] = "MISSING"
+                        if status != MasterStatus.MISSING:
+                            matcher.set_status(mid, "MISSING", time_s)
                             api_helper.api_missing(mid)
                         event_type = "MISSING"
                     else:
-                        matcher.masters[mid]["status"] = "TRACKING"
+                        matcher.set_status(mid, "TRACKING")
                         event_type = "MATCHED"
 
             if args.csv and csv_writer:
@@ -321,11 +428,13 @@ def main():
             
             if event_type != "MISSING":
                 new_active[best_uid] = {"last_pos": (cx, cy), "master_id": mid}
+                track_det[best_uid] = det_idx
                 # 썸네일: USB_LOCAL 일 때만 TRACKING/MATCHED 시 crop → NFS 저장
                 if mid and event_type in ("TRACKING", "MATCHED"):
                     if cam == "USB_LOCAL":
                         h, w = img.shape[:2]
-                        crop = img[max(0, y1):min(h, y2), max(0, x1):min(w, x2)]
+                        # img는 전처리 재사용 버퍼이므로 보관용 crop은 복사
+                        crop = img[max(0, y1):min(h, y2), max(0, x1):min(w, x2)].copy()
                         if crop.size > 0:
                             save_thumbnail_to_nfs(mid, crop)
                             set_thumbnail_crops[mid] = crop
@@ -334,9 +443,8 @@ def main():
         for old_uid, old_info in active_tracks[cam].items():
             if old_uid not in new_active:
                 mid = old_info["master_id"]
-                if mid and mid in matcher.masters and matcher.masters[mid]["status"] == "TRACKING":
-                    matcher.masters[mid]["status"] = "PENDING"
-                    matcher.masters[mid]["pending_from_cam"] = cam
+                if mid:
+                    matcher.mark_pending(mid, cam)
 
         # Resolve pending (Phase 4: stale 또는 now_s가 너무 앞서면 생략)
         skip_resolve = False
@@ -349,16 +457,17 @@ def main():
                 skip_resolve = True
         
         if not skip_resolve:
-            for mid in list(matcher.masters.keys()):
-                result = matcher.resolve_pending(mid, time_s)
+            # 마감 시각이 지난 master만 (matcher deadline heap)
+            for mid, result in matcher.resolve_due(time_s):
                 if result:
                     decision = result["decision"]
+                    route = route_and_status(matcher.get_master(mid))[0]
                     if decision == "PICKUP":
                         api_helper.api_pickup(mid)
                         if args.csv and csv_writer:
                             csv_writer.writerow({
                                 "timestamp": ts, "cam": result["from_cam"], "local_uid": "",
-                                "master_id": mid, "route": matcher.masters[mid]["route_code"],
+                                "master_id": mid, "route": route,
                                 "x1": "", "y1": "", "x2": "", "y2": "", "event": "PICKUP"
                             })
                     elif decision == "DISAPPEAR":
@@ -366,28 +475,20 @@ def main():
                         if args.csv and csv_writer:
                             csv_writer.writerow({
                                 "timestamp": ts, "cam": "", "local_uid": "", "master_id": mid,
-                                "route": matcher.masters[mid]["route_code"],
+                                "route": route,
                                 "x1": "", "y1": "", "x2": "", "y2": "", "event": "DISAPPEAR"
                             })
+            # 종료 상태로 보존 기간이 지난 master는 masters에서 archive로 이동 (이후 순회 비용 감소)
+            matcher.evict_expired(time_s)
 
         # Distance / position API (TRACKING or PENDING)
-        for mid, m_info in matcher.masters.items():
-            if m_info["status"] in ["TRACKING", "PENDING"] and m_info.get("start_time") is not None:
-                total_dist = config.ROUTE_TOTAL_DIST.get(m_info["route_code"], 12.8)
-                elapsed_time = time_s - m_info["start_time"]
-                rem_dist = max(0.0, total_dist - (elapsed_time * config.BELT_SPEED))
-                step_dist = round(rem_dist / 0.5) * 0.5
-                if m_info.get("last_sent_dist") != step_dist:
-                    api_helper.api_update_position(
-                        mid, step_dist,
-                        thumbnail_image=set_thumbnail_crops.get(mid),
-                    )
-                    m_info["last_sent_dist"] = step_dist
+        time_based_position_update(time_s)
 
         if args.video:
             atracks = dict(active_tracks)
             atracks[cam] = new_active
-            visualizer.draw_and_write(cam, img, detections, matcher.masters, ts, atracks)
+            det_tracks = {det_idx: uid for uid, det_idx in track_det.items()}
+            visualizer.draw_and_write(cam, img, detections, matcher.get_master, ts, atracks, det_tracks)
         
         if args.display:
             cv2.putText(img, f"CAM: {cam} | Resized: {img.shape[1]}x{img.shape[0]}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
@@ -395,83 +496,174 @@ def main():
         
         active_tracks[cam] = new_active
 
-    def _timed_get_detections(cam, img, cfg):
-        """get_detections 실행 + 소요 시간(초) 반환."""
-        t0 = time.perf_counter()
-        dets = detector.get_detections(img, cfg, cam)
-        return (dets, time.perf_counter() - t0)
-
-    def run_detections_for_set(set_):
-        """4 cam detection을 병렬 실행."""
-        from concurrent.futures import ThreadPoolExecutor
-        out = {}
+    # True: 세트의 4 cam을 get_detections_batch 1회로 추론. False: cam별 get_detections 스레드 병렬.
+    use_batch_inference = getattr(config, "YOLO_BATCH_INFERENCE", True)
+
+    def submit_detections_for_set(set_):
+        """
+        세트 파이프라인 1단계: 카메라당 1회 전처리 후 상주 추론 풀에 4 cam detection 제출 (결과는 기다리지 않음).
+        Returns: collect_detections에 넘길 제출 상태 dict.
+        """
+        prepared = {}
+        t_set0 = t_pre = time.perf_counter()
+        for cam in config.TRACKING_CAMS:
+            if cam not in set_:
+                continue
+            img, ts = set_[cam]
+            # 스케줄러가 쉬게 한 cam은 전처리·detection·matching 모두 생략
+            if inference_scheduler and not inference_scheduler.should_run(cam, ts, bool(active_tracks[cam])):
+                continue
+            pre = _preprocess_frame(cam, img)
+            if pre is None:
+                continue
+            prepared[cam] = (pre[0], pre[1], ts)
+        # 전처리가 새 버퍼에 기록했으므로 원본 프레임(arena 모드면 슬롯 view)은 여기서 반납
+        frame_sink.release_frames(set_)
+        # motion gate: 밴드 변화가 없고 직전 결과가 빈 cam은 추론 없이 빈 결과 재사용 (matching·resolve는 진행)
+        gated = []
+        if motion_gate:
+            gated = [cam for cam, (img, plan, _) in prepared.items() if not motion_gate.should_run(cam, img, plan)]
+        to_infer = {cam: v for cam, v in prepared.items() if cam not in gated}
+        preprocess_sec = time.perf_counter() - t_pre
+
+        pending = {"prepared": prepared, "gated": gated, "t_set0": t_set0, "preprocess_sec": preprocess_sec,
+                   "t0": time.perf_counter(), "batch": None, "futures": {}}
+        if use_batch_inference and to_infer:
+            # 4 cam 프레임을 1회 forward로 배치 추론
+            cams = list(to_infer.keys())
+            pending["batch"] = (cams, inference_pool.submit_batch(
+                [_model_input(prepared[c][0], prepared[c][1]) for c in cams], [prepared[c][1] for c in cams], cams
+            ))
+        else:
+            pending["futures"] = {
+                cam: inference_pool.submit(cam, _model_input(img, plan), plan)
+                for cam, (img, plan, _) in to_infer.items()
+            }
+        return pending
+
+    def collect_detections(pending):
+        """
+        세트 파이프라인 2단계: 제출한 detection 결과 대기.
+        Returns: (prepared, dets_per_cam, per_cam_sec, wall_sec, preprocess_sec, gated)
+          prepared: cam -> (전처리된 img, plan, ts) — _process_with_detections가 같은 img를 재사용.
+          gated: motion gate로 추론을 생략한 cam 목록 (dets_per_cam에는 빈 결과).
+          wall_sec: 제출부터 결과 수신까지 (파이프라인 중에는 앞 세트 처리 시간 포함).
+        """
+        gated = pending["gated"]
+        out = {cam: [] for cam in gated}
         per_cam_sec = {}
-        t0 = time.perf_counter()
-        with ThreadPoolExecutor(max_workers=4) as ex:
-            futures = {}
-            for cam in config.TRACKING_CAMS:
-                if cam not in set_:
-                    continue
-                img, _ = set_[cam]
-                cfg = config.CAM_SETTINGS.get(cam)
-                if not cfg or img is None:
-                    continue
-                
-                # 1. 회전
-                rotate_val = cfg.get("rotate", 0)
-                if rotate_val == 90: img = cv2.rotate(img, cv2.ROTATE_90_CLOCKWISE)
-                elif rotate_val == 180: img = cv2.rotate(img, cv2.ROTATE_180)
-                elif rotate_val == 270: img = cv2.rotate(img, cv2.ROTATE_90_COUNTERCLOCKWISE)
-
-                # 2. 리사이징
-                target_w = 640
-                h_orig, w_orig = img.shape[:2]
-                scale = target_w / w_orig
-                img = cv2.resize(img, (target_w, int(h_orig * scale)), interpolation=cv2.INTER_AREA)
-
-                # 3. 비율 기반 계산
-                H_new, W_new = img.shape[:2]
-                cfg['roi_y'] = int(H_new * cfg.get('roi_y_rate', 0))
-                cfg['roi_margin'] = int(H_new * cfg.get('roi_margin_rate', 0))
-                cfg['dist_eps'] = int(H_new * cfg.get('dist_eps_rate', 0))
-                cfg['max_dy'] = int(H_new * cfg.get('max_dy_rate', 0))
-                if 'eol_y_rate' in cfg:
-                    cfg['eol_y'] = int(H_new * cfg['eol_y_rate'])
-                    cfg['eol_margin'] = int(H_new * cfg['eol_margin_rate'])
-                
-                # 가이드라인 시각화 (set 모드에서도 시각화 필요시)
-                if args.display:
-                    cv2.line(img, (0, cfg['roi_y']), (W_new, cfg['roi_y']), (0, 255, 255), 2)
-
-                futures[cam] = ex.submit(_timed_get_detections, cam, img, cfg)
-            
-            for cam, fut in futures.items():
-                dets, elapsed = fut.result()
-                out[cam] = dets
-                per_cam_sec[cam] = round(elapsed, 4)
-        wall_sec = time.perf_counter() - t0
-        return out, per_cam_sec, wall_sec
+        if pending["batch"] is not None:
+            # per_cam_sec는 배치 시간을 cam 수로 나눈 값
+            cams, fut = pending["batch"]
+            if fut is not None:
+                batch_dets, elapsed = fut.result()
+                for cam, dets in zip(cams, batch_dets):
+                    out[cam] = dets
+                    per_cam_sec[cam] = round(elapsed / len(cams), 4)
+        for cam, fut in pending["futures"].items():
+            if fut is None:
+                continue
+            dets, elapsed = fut.result()
+            out[cam] = dets
+            per_cam_sec[cam] = round(elapsed, 4)
+        wall_sec = time.perf_counter() - pending["t0"]
+        if motion_gate:
+            for cam in out:
+                if cam not in gated:
+                    motion_gate.record(cam, out[cam])
+        return pending["prepared"], out, per_cam_sec, wall_sec, pending["preprocess_sec"], gated
+
+    def process_set(pending):
+        """세트 파이프라인: 제출한 detection 결과로 cam별 matching 처리 + PROCESSING_TIMES 로그."""
+        nonlocal last_stats_time
+        t_set0 = pending["t_set0"]
+        set_thumbnail_crops.clear()
+        prepared, dets_per_cam, detection_per_cam_sec, detection_wall_sec, preprocess_sec, gated = (
+            collect_detections(pending)
+        )
+        process_per_cam_sec = {}
+        for cam in config.TRACKING_CAMS:
+            # 큐 포화로 detection이 거절된 cam은 이번 세트에서 처리하지 않음 (빈 결과로 PENDING 오판 방지)
+            if cam not in prepared or cam not in dets_per_cam:
+                continue
+            img, plan, ts = prepared[cam]
+            t0 = time.perf_counter()
+            if inference_scheduler:
+                inference_scheduler.observe(cam, ts, dets_per_cam[cam], plan)
+            if args.display:
+                _draw_roi_guides(img, plan)
+            _process_with_detections(cam, img, ts, ts, dets_per_cam[cam], plan)
+            process_per_cam_sec[cam] = round(time.perf_counter() - t0, 4)
+
+        if processing_times_log_file:
+            n_inferred = len(dets_per_cam) - len(gated)
+            processing_times_log_file.write(json.dumps({
+                "event": "PROCESSING_TIMES",
+                "wall_ts": round(time.time(), 3),
+                "detection_mode": "batch" if use_batch_inference else "threads",
+                "detector_calls": min(1, n_inferred) if use_batch_inference else n_inferred,
+                "scheduled_cams": list(prepared.keys()),
+                "motion_skipped_cams": gated,
+                "preprocess_wall_sec": round(preprocess_sec, 4),
+                "detection_wall_sec": round(detection_wall_sec, 4),
+                "detection_per_cam_sec": detection_per_cam_sec,
+                "pipeline_depth": pipeline_depth,
+                "process_per_cam_sec": process_per_cam_sec,
+                "process_wall_sec": round(sum(process_per_cam_sec.values()), 4),
+                "set_total_wall_sec": round(time.perf_counter() - t_set0, 4),
+            }, ensure_ascii=False) + "\n")
+            if time.time() - last_stats_time >= pool_stats_interval:
+                processing_times_log_file.write(json.dumps({
+                    "event": "INFERENCE_POOL_STATS",
+                    "wall_ts": round(time.time(), 3),
+                    **inference_pool.get_stats(),
+                }, ensure_ascii=False) + "\n")
+                if decode_pool:
+                    processing_times_log_file.write(json.dumps({
+                        "event": "DECODE_POOL_STATS",
+                        "wall_ts": round(time.time(), 3),
+                        **decode_pool.get_stats(),
+                    }, ensure_ascii=False) + "\n")
+                processing_times_log_file.write(json.dumps({
+                    "event": "MATCHER_LIFECYCLE_STATS",
+                    "wall_ts": round(time.time(), 3),
+                    **matcher.get_lifecycle_stats(),
+                }, ensure_ascii=False) + "\n")
+                if inference_scheduler:
+                    processing_times_log_file.write(json.dumps({
+                        "event": "INFERENCE_SCHEDULER_STATS",
+                        "wall_ts": round(time.time(), 3),
+                        **inference_scheduler.get_stats(),
+                    }, ensure_ascii=False) + "\n")
+                if motion_gate:
+                    processing_times_log_file.write(json.dumps({
+                        "event": "MOTION_GATE_STATS",
+                        "wall_ts": round(time.time(), 3),
+                        **motion_gate.get_stats(),
+                    }, ensure_ascii=False) + "\n")
+                last_stats_time = time.time()
+            processing_times_log_file.flush()
 
     def time_based_position_update(now_s: float) -> None:
-        """세트 스킵 시 now_s 기준으로 거리 갱신."""
-        for mid, m_info in matcher.masters.items():
-            if m_info["status"] in ["TRACKING", "PENDING"] and m_info.get("start_time") is not None:
-                total_dist = config.ROUTE_TOTAL_DIST.get(m_info["route_code"], 12.8)
-                elapsed_time = now_s - m_info["start_time"]
-                rem_dist = max(0.0, total_dist - (elapsed_time * config.BELT_SPEED))
-                step_dist = round(rem_dist / 0.5) * 0.5
-                if m_info.get("last_sent_dist") != step_dist:
-                    api_helper.api_update_position(
-                        mid, step_dist,
-                        thumbnail_image=set_thumbnail_crops.get(mid),
-                    )
-                    m_info["last_sent_dist"] = step_dist
+        """now_s 기준 거리 갱신 (프레임 처리 후·세트 스킵 시). 0.5m 구간이 바뀐 master만 matcher가 반환."""
+        for mid, step_dist in matcher.due_position_updates(now_s):
+            api_helper.api_update_position(
+                mid, step_dist,
+                thumbnail_image=set_thumbnail_crops.get(mid),
+            )
 
     # 500ms 윈도우 세트 모드
     window_interval = getattr(config, "WINDOW_SET_INTERVAL_SEC", 0.5)
     max_wait_wall = getattr(config, "WINDOW_MAX_WAIT_WALL_SEC", 0.5)
     THEORETICAL_MAX_SETS_PER_SEC = 2
 
+    # 제출만 하고 아직 matching 처리하지 않은 세트 (시간순)
+    in_flight_sets = deque()
+
+    def drain_sets(keep=0):
+        while len(in_flight_sets) > keep:
+            process_set(in_flight_sets.popleft())
+
     try:
         while _running:
             if use_time_ordered:
@@ -483,26 +675,21 @@ def main():
 
                 set_ = frame_sink.extract_set_for_interval(T_cur, T_cur + window_interval)
                 if set_ is not None:
-                    set_thumbnail_crops.clear()
-                    dets_per_cam, detection_per_cam_sec, detection_wall_sec = run_detections_for_set(set_)
-                    for cam in config.TRACKING_CAMS:
-                        if cam not in set_: continue
-                        img, ts = set_[cam]
-                        if img is None: continue
-                        # _process_with_detections 내부에서 img를 사용하여 display/video 처리
-                        # run_detections_for_set 내부에서 전처리된 img를 다시 가져오는 구조는 복잡하므로 
-                        # 여기서는 단순화하여 process_one_frame 흐름과 유사하게 맞춤
-                        process_one_frame(cam, img, ts, ts) 
+                    in_flight_sets.append(submit_detections_for_set(set_))
+                    drain_sets(pipeline_depth - 1)
 
                     sets_formed_this_second += 1
                     T_cur += window_interval
                     t_last_set = time.time()
                 elif time.time() - t_last_set >= max_wait_wall:
+                    drain_sets()
                     time_based_position_update(T_cur + window_interval)
                     frame_sink.remove_frames_in_interval(T_cur, T_cur + window_interval)
                     T_cur += window_interval
                     t_last_set = time.time()
                 else:
+                    # 다음 세트가 아직 없으면 제출해 둔 세트를 먼저 처리 (지연 누적 방지)
+                    drain_sets()
                     time.sleep(0.01)
             else:
                 # 일반 FrameAggregator 모드 (개별 카메라 순회)
@@ -514,6 +701,8 @@ def main():
                     if last_processed_ts[cam] is not None and abs(ts - last_processed_ts[cam]) < target_interval * 0.5:
                         continue
                     last_processed_ts[cam] = ts
+                    if inference_scheduler and not inference_scheduler.should_run(cam, ts, bool(active_tracks[cam])):
+                        continue
                     process_one_frame(cam, img, ts, ts)
 
             if args.display:
@@ -523,12 +712,17 @@ def main():
 
     finally:
         _running = False
+        if reactor: reactor.stop()
         for recv in receivers: recv.stop()
+        if decode_pool: decode_pool.stop()
         for worker, _ in usb_workers: worker.stop()
+        if inference_pool: inference_pool.stop()
         scanner_listener.stop()
+        matcher.archive.close()
         visualizer.release_all()
         if csv_file: csv_file.close()
         if frame_sync_log_file: frame_sync_log_file.close()
+        if processing_times_log_file: processing_times_log_file.close()
         if args.display: cv2.destroyAllWindows()
         ctx.term()
 
@@ -10,7 +10,6 @@ import signal
 import sys
 import time
 import cv2
-import threading
 import numpy as np
 from pathlib import Path
 
@@ -96,20 +95,10 @@ def main():
         if key not in config.ZMQ_CAM_MAPPING: continue
         cam_id = config.ZMQ_CAM_MAPPING[key]
         worker = USBCameraWorker(cam_name, cam_cfg)
+        worker.set_frame_callback(lambda _name, frame, ts, cam_id=cam_id: frame_sink.put(cam_id, frame, ts))
         if worker.start():
             usb_workers.append((worker, cam_id))
 
-    def usb_feeder_loop():
-        while _running:
-            for worker, cam_id in usb_workers:
-                frame = worker.get_latest_frame()
-                if frame is not None:
-                    frame_sink.put(cam_id, frame, worker.latest_timestamp)
-            time.sleep(0.02)
-
-    usb_feeder = threading.Thread(target=usb_feeder_loop, daemon=True)
-    usb_feeder.start()
-
     scanner_listener = ScannerListener(matcher, host=config.SCANNER_HOST, port=config.SCANNER_PORT)
     scanner_listener.start()
 
@@ -284,12 +273,12 @@ def main():
                         # step_dist = round(rem_dist / 0.5) * 0.5
                         
                         m_info = matcher.masters[mid]
-                        if m_info.get("start_time") is not None:
+                        if m_info.start_time is not None:
                             # 1. 해당 경로의 전체 거리 가져오기 (기본값 12.8m)
-                            total_dist = config.ROUTE_TOTAL_DIST.get(m_info["route_code"], 12.8)
+                            total_dist = config.ROUTE_TOTAL_DIST.get(m_info.route_code, 12.8)
                             
                             # 2. 현재 시간(ts_today)과 시작 시간 차이 계산
-                            elapsed_time = ts_today - m_info["start_time"]
+                            elapsed_time = ts_today - m_info.start_time
                             
                             # 3. 잔여 거리 계산: 전체 거리 - (경과 시간 * 벨트 속도)
                             rem_dist = max(0.0, total_dist - (elapsed_time * config.BELT_SPEED))
@@ -298,9 +287,9 @@ def main():
                             step_dist = round(rem_dist / 0.5) * 0.5
                             
                             # 5. 값이 변했을 때만 API 호출 (중복 호출 방지)
-                            if m_info.get("last_sent_dist") != step_dist:
+                            if m_info.last_sent_dist != step_dist:
                                 api_helper.api_update_position(mid, step_dist, thumbnail_image=None)
-                                m_info["last_sent_dist"] = step_dist
+                                m_info.last_sent_dist = step_dist
 
                         if cam == "USB_LOCAL":
                             crop = img[max(0, y1):min(H, y2), max(0, x1):min(W, x2)]
@@ -323,9 +312,8 @@ def main():
                 for old_uid, old_info in active_tracks[cam].items():
                     if old_uid not in new_active:
                         m_id = old_info["master_id"]
-                        if m_id and m_id in matcher.masters:
-                            matcher.masters[m_id]["status"] = "PENDING"
-                            matcher.masters[m_id]["pending_from_cam"] = cam
+                        if m_id:
+                            matcher.mark_pending(m_id, cam)
 
                 for mid_res in list(matcher.masters.keys()):
                     result = matcher.resolve_pending(mid_res, ts_today)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+MODEL_PATH(.pt) → ONNX / OpenVINO IR export 후 백엔드별 CPU 추론 시간·박스 일치도 비교.
+산출물은 .pt 옆에 캐시 (parcel_ver0123.onnx, parcel_ver0123_openvino_model/), .pt보다 새로우면 재사용.
+실행: python3 monitoring/export_model.py [--formats onnx,openvino] [--force] [--static] [--repeat N]
+  --static: 배치·입력 크기 고정 export (기본 dynamic: 세트 배치·ROI crop 추론 가능)
+출력: monitoring/export_model_results.json
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import cv2
+
+TRACK_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(TRACK_ROOT))
+import config as track_config
+from logic.box_metrics import match_boxes
+from logic.inference_backends import (
+    BACKEND_ONNXRUNTIME,
+    BACKEND_OPENVINO,
+    BACKEND_ULTRALYTICS,
+    create_backend,
+    export_model,
+)
+
+_FORMAT_BACKEND = {"onnx": BACKEND_ONNXRUNTIME, "openvino": BACKEND_OPENVINO}
+
+
+def time_backend(backend, img, repeat):
+    backend.predict([img])  # 워밍업
+    times_ms = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        boxes = backend.predict([img])[0]
+        times_ms.append((time.perf_counter() - t0) * 1000)
+    return boxes, {
+        "mean_ms": round(sum(times_ms) / len(times_ms), 2),
+        "min_ms": round(min(times_ms), 2),
+        "max_ms": round(max(times_ms), 2),
+    }
+
+
+def main():
+    p = argparse.ArgumentParser(description="Export YOLO model and compare CPU inference backends")
+    p.add_argument("--formats", default="onnx,openvino")
+    p.add_argument("--force", action="store_true")
+    p.add_argument("--static", action="store_true")
+    p.add_argument("--repeat", type=int, default=20)
+    args = p.parse_args()
+
+    model_path = track_config.MODEL_PATH
+    imgsz = getattr(track_config, "YOLO_IMGSZ", 640)
+    threads = getattr(track_config, "INFERENCE_THREADS", 0)
+    img = cv2.resize(cv2.imread(str(TRACK_ROOT / "tests" / "parcel.jpeg")), (640, 360))
+    report = {"model_path": str(model_path), "imgsz": imgsz, "dynamic": not args.static, "exports": {}}
+
+    ref_boxes, report[BACKEND_ULTRALYTICS] = time_backend(
+        create_backend(BACKEND_ULTRALYTICS, model_path), img, args.repeat)
+    for fmt in [f.strip() for f in args.formats.split(",") if f.strip()]:
+        name = _FORMAT_BACKEND[fmt]
+        try:
+            out = export_model(model_path, fmt, imgsz=imgsz, dynamic=not args.static, force=args.force)
+            report["exports"][fmt] = str(out)
+            boxes, timing = time_backend(create_backend(name, model_path, imgsz=imgsz, threads=threads),
+                                         img, args.repeat)
+        except Exception as e:
+            report[name] = {"error": str(e)}
+            continue
+        matches, miss, extra = match_boxes(ref_boxes.tolist(), boxes.tolist(), 0.5)
+        timing.update({
+            "boxes": len(boxes),
+            "matched": len(matches),
+            "missed": len(miss),
+            "extra": len(extra),
+            "mean_iou": round(sum(m[2] for m in matches) / len(matches), 4) if matches else None,
+        })
+        report[name] = timing
+
+    out_path = TRACK_ROOT / "monitoring" / "export_model_results.json"
+    out_path.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+master 레코드 메모리·순회 비용 벤치마크. 기존 dict master(필드 이름 key + 문자열 상태 + uids dict)와
+logic.master_record.MasterRecord(__slots__ + IntEnum 코드 + 고정 길이 uid list)를 같은 내용으로 N개 만들어
+tracemalloc으로 master당 / 10k개당 메모리를 비교하고, FIFOGlobalMatcher에 N개를 넣은 뒤
+resolve 1회(resolve_due / 전체 resolve_pending) · 위치 갱신 1회(due_position_updates / 전체 순회) 시간을 측정.
+실행: python3 monitoring/master_record_benchmark.py [--n 10000] [--repeat 5]
+출력: monitoring/master_record_benchmark_results.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+TRACK_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(TRACK_ROOT))
+import config as track_config
+from logic.master_record import CameraCode, MasterRecord, MasterStatus
+from logic.matcher import FIFOGlobalMatcher
+
+# 벤치마크 master가 지나간 cam (uids 채움)
+SEEN_CAMS = ("USB_LOCAL", "RPI_USB1", "RPI_USB2")
+
+
+def legacy_master(i, t):
+    """비교 기준 dict master: 필드 이름 key, 상태·cam은 문자열, uids는 cam 이름 → uid dict.
+    add_scanner_data 후 SEEN_CAMS에서 한 번씩 매칭된 상태와 같은 내용."""
+    info = {
+        "last_cam": "Scanner", "last_time": t, "last_width": 0, "uids": {}, "route_code": "XSEB",
+        "status": "TRACKING", "start_time": t, "total_dist": 14.08, "pending_from_cam": None,
+    }
+    for k, cam in enumerate(SEEN_CAMS):
+        info["uids"][cam] = f"{cam}_{i:05d}"
+        info.update({"last_cam": cam, "last_time": t + k, "last_width": 50})
+    return info
+
+
+def record_master(i, t):
+    rec = MasterRecord("XSEB", t, 14.08, MasterStatus.TRACKING)
+    for k, cam in enumerate(SEEN_CAMS):
+        code = CameraCode[cam]
+        rec.uids[code - 1] = f"{cam}_{i:05d}"
+        rec.last_cam, rec.last_time, rec.last_width = code, t + k, 50
+    return rec
+
+
+def measure_memory(factory, n):
+    """factory로 n개 생성 시 늘어난 메모리 (bytes). uid 문자열 등 공통 내용도 포함."""
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    masters = {f"uid_{i:05d}": factory(i, 100.0 + i * 0.01) for i in range(n)}
+    used = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    del masters
+    return used
+
+
+def build_matcher(n):
+    """n개 master: 절반은 USB_LOCAL에서 사라져 PENDING, 나머지는 TRACKING."""
+    m = FIFOGlobalMatcher(retention_sec=1e9)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(n):
+            m.add_scanner_data(f"uid_{i:05d}", "XSEB", 100.0 + i * 0.01)
+        for i in range(n):
+            m.try_match("USB_LOCAL", 106.0 + i * 0.01, 50, f"USB_LOCAL_{i:05d}")
+    for i in range(0, n, 2):
+        m.mark_pending(f"uid_{i:05d}", "USB_LOCAL")
+    return m
+
+
+def timed(fn, repeat):
+    times_ms = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times_ms.append((time.perf_counter() - t0) * 1000)
+    return {"median_ms": round(statistics.median(times_ms), 3), "min_ms": round(min(times_ms), 3)}
+
+
+def full_scan_positions(m, now_s, sent):
+    """기존 main time_based_position_update 전체 순회 (dict 방식 접근)."""
+    for mid, info in m.masters.items():
+        if info["status"] in ["TRACKING", "PENDING"] and info.get("start_time") is not None:
+            total_dist = track_config.ROUTE_TOTAL_DIST.get(info["route_code"], 12.8)
+            rem_dist = max(0.0, total_dist - ((now_s - info["start_time"]) * track_config.BELT_SPEED))
+            step_dist = round(rem_dist / 0.5) * 0.5
+            if sent.get(mid) != step_dist:
+                sent[mid] = step_dist
+
+
+def main():
+    parser = argparse.ArgumentParser(description="master 레코드 메모리·순회 비용 벤치마크")
+    parser.add_argument("--n", type=int, default=10000, help="master 수")
+    parser.add_argument("--repeat", type=int, default=5, help="순회 측정 반복 횟수")
+    args = parser.parse_args()
+    n = args.n
+
+    legacy_bytes = measure_memory(legacy_master, n)
+    record_bytes = measure_memory(record_master, n)
+    report = {
+        "n": n,
+        "memory": {
+            "legacy_dict": {"bytes_per_master": round(legacy_bytes / n, 1),
+                            "mb_per_10k": round(legacy_bytes / n * 10000 / 2**20, 3)},
+            "master_record": {"bytes_per_master": round(record_bytes / n, 1),
+                              "mb_per_10k": round(record_bytes / n * 10000 / 2**20, 3)},
+            "ratio": round(record_bytes / legacy_bytes, 3) if legacy_bytes else None,
+        },
+    }
+
+    # resolve / 위치 갱신 1회: 마감 전(대부분 결정 없음) 시각 기준으로 같은 matcher를 반복 측정
+    m = build_matcher(n)
+    now_s = 110.0
+    full_resolve = lambda: [m.resolve_pending(mid, now_s) for mid in list(m.masters)]  # noqa: E731
+    sent = {}
+    full_scan_positions(m, now_s, sent)
+    m.due_position_updates(now_s)
+    report["passes"] = {
+        "resolve_full_scan": timed(full_resolve, args.repeat),
+        "resolve_due": timed(lambda: m.resolve_due(now_s), args.repeat),
+        "position_full_scan_dict_view": timed(lambda: full_scan_positions(m, now_s + 0.01, sent), args.repeat),
+        "due_position_updates": timed(lambda: m.due_position_updates(now_s + 0.01), args.repeat),
+    }
+    report["live_by_status"] = m.get_lifecycle_stats()["live_by_status"]
+
+    out_path = TRACK_ROOT / "monitoring" / "master_record_benchmark_results.json"
+    out_path.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+전처리 마이크로벤치마크 (1280x720 BGR 입력, CAM_SETTINGS의 각 회전값).
+  two_step: 기존 방식 cv2.rotate(전체 해상도) → cv2.resize (매번 새 배열)
+  fused: logic.preprocess.FramePreprocessor.run (리사이즈 → 회전, cam별 버퍼 재사용)
+  fused_letterbox: fused + YOLO_IMGSZ 정사각 letterbox 버퍼
+실행: python3 monitoring/preprocess_benchmark.py [--iters N]
+출력: monitoring/preprocess_benchmark_results.json (ms/frame, two_step 대비 최대 픽셀 차이)
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+TRACK_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(TRACK_ROOT))
+import config as track_config
+from logic.preprocess import FramePreprocessor, build_plan
+
+
+def make_test_frame(w=1280, h=720):
+    img = cv2.imread(str(TRACK_ROOT / "tests" / "parcel.jpeg"))
+    if img is not None:
+        return cv2.resize(img, (w, h))
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 255, (h, w, 3), dtype=np.uint8)
+
+
+def two_step(img, rotate, target_w):
+    """기존 main._preprocess_frame 경로."""
+    if rotate == 90:
+        img = cv2.rotate(img, cv2.ROTATE_90_CLOCKWISE)
+    elif rotate == 180:
+        img = cv2.rotate(img, cv2.ROTATE_180)
+    elif rotate == 270:
+        img = cv2.rotate(img, cv2.ROTATE_90_COUNTERCLOCKWISE)
+    h, w = img.shape[:2]
+    return cv2.resize(img, (target_w, int(h * (target_w / w))), interpolation=cv2.INTER_AREA)
+
+
+def time_ms(fn, iters):
+    fn()  # 버퍼 할당·캐시 워밍업
+    t0 = time.perf_counter()
+    for _ in range(iters):
+        fn()
+    return (time.perf_counter() - t0) / iters * 1000
+
+
+def main():
+    p = argparse.ArgumentParser(description="Preprocess microbenchmark (two-step vs fused)")
+    p.add_argument("--iters", type=int, default=300)
+    args = p.parse_args()
+
+    frame = make_test_frame()
+    frame.flags.writeable = False
+    target_w = getattr(track_config, "PREPROCESS_TARGET_WIDTH", 640)
+    imgsz = getattr(track_config, "YOLO_IMGSZ", 640)
+    results = []
+    for cam in track_config.TRACKING_CAMS:
+        cfg = track_config.CAM_SETTINGS[cam]
+        rotate = cfg.get("rotate", 0)
+        plan = build_plan(cam, cfg, frame.shape[1], frame.shape[0], target_w, letterbox_size=imgsz)
+        pre = FramePreprocessor()
+        ref = two_step(frame, rotate, target_w)
+        fused = pre.run(plan, frame)
+        results.append({
+            "cam": cam,
+            "rotate": rotate,
+            "out_shape": list(fused.shape),
+            "two_step_ms": round(time_ms(lambda: two_step(frame, rotate, target_w), args.iters), 3),
+            "fused_ms": round(time_ms(lambda: pre.run(plan, frame), args.iters), 3),
+            "fused_letterbox_ms": round(
+                time_ms(lambda: pre.letterbox(plan, pre.run(plan, frame)), args.iters), 3),
+            "max_abs_diff": int(np.abs(ref.astype(np.int16) - fused.astype(np.int16)).max()),
+        })
+
+    report = {"input_shape": list(frame.shape), "iters": args.iters, "results": results}
+    out_path = TRACK_ROOT / "monitoring" / "preprocess_benchmark_results.json"
+    out_path.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+양자화 모델 변형 생성 (ONNX Runtime CPU용). 기준 FP32 ONNX는 export_model로 .pt 옆에 export/재사용.
+  int8_dynamic: 가중치 INT8, activation은 실행 시 동적 양자화 (캘리브레이션 불필요)
+  int8_static: QDQ INT8, 카메라 캡처 프레임으로 activation 범위 캘리브레이션
+  fp16: 가중치·연산 FP16 (입출력은 FP32 유지). CPU EP는 cast가 들어가 오히려 느릴 수 있음 → 회귀 비교로 확인
+산출물: parcel_ver0123_<variant>.onnx (.pt 옆). 정확도·latency 비교는 monitoring/variant_regression.py.
+실행: python3 monitoring/quantize_model.py --frames DIR [--variants int8_dynamic,int8_static,fp16] [--limit N] [--force]
+  --frames: 캡처 프레임 폴더. DIR/<CAM_ID>/*.jpg면 cam별 PreprocessPlan(회전·리사이즈) 적용, DIR/*.jpg면 그대로 사용
+필요 패키지: onnx, onnxruntime (fp16은 onnxconverter-common 추가)
+"""
+import argparse
+import sys
+from pathlib import Path
+
+import cv2
+
+TRACK_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(TRACK_ROOT))
+import config as track_config
+from logic.inference_backends import export_model, letterbox_image, to_input_tensor
+from logic.preprocess import apply_plan, build_plan
+
+VARIANTS = ("int8_dynamic", "int8_static", "fp16")
+_IMAGE_EXTS = {".jpg", ".jpeg", ".png"}
+
+
+def variant_path(model_path, variant):
+    p = Path(model_path)
+    return p.parent / f"{p.stem}_{variant}.onnx"
+
+
+def load_frame_set(frames_dir, limit=None):
+    """
+    캡처 프레임 로드 → [(cam_id, 모델 입력 이미지)].
+    하위 폴더 이름이 CAM_SETTINGS의 cam이면 main과 같은 전처리 (PREPROCESS_TARGET_WIDTH) 적용.
+    """
+    root = Path(frames_dir)
+    target_w = getattr(track_config, "PREPROCESS_TARGET_WIDTH", 640)
+    groups = [(d.name, d) for d in sorted(root.iterdir()) if d.is_dir()] or [("", root)]
+    frames = []
+    for cam, folder in groups:
+        cfg = track_config.CAM_SETTINGS.get(cam)
+        paths = sorted(p for p in folder.iterdir() if p.suffix.lower() in _IMAGE_EXTS)
+        for p in paths[:limit]:
+            img = cv2.imread(str(p))
+            if img is None:
+                continue
+            if cfg is not None:
+                img = apply_plan(build_plan(cam, cfg, img.shape[1], img.shape[0], target_w), img)
+            frames.append((cam, img))
+    return frames
+
+
+def _calibration_reader(input_name, frames, imgsz):
+    from onnxruntime.quantization import CalibrationDataReader
+
+    class FrameCalibrationReader(CalibrationDataReader):
+        def __init__(self):
+            self._it = iter(frames)
+
+        def get_next(self):
+            item = next(self._it, None)
+            if item is None:
+                return None
+            return {input_name: to_input_tensor([letterbox_image(item[1], (imgsz, imgsz))[0]])}
+
+    return FrameCalibrationReader()
+
+
+def quantize(base_onnx, variant, out_path, frames=None, imgsz=640):
+    import onnx
+    import onnxruntime as ort
+    from onnxruntime.quantization import QuantFormat, QuantType, quantize_dynamic, quantize_static
+    from onnxruntime.quantization.shape_inference import quant_pre_process
+
+    if variant == "fp16":
+        from onnxconverter_common import float16
+
+        onnx.save(float16.convert_float_to_float16(onnx.load(str(base_onnx)), keep_io_types=True), str(out_path))
+        return
+    # shape inference·graph 최적화 전처리 (권장 단계)
+    prep = out_path.with_name(out_path.stem + "_prep.onnx")
+    quant_pre_process(str(base_onnx), str(prep))
+    try:
+        if variant == "int8_dynamic":
+            quantize_dynamic(str(prep), str(out_path), weight_type=QuantType.QUInt8)
+        elif variant == "int8_static":
+            if not frames:
+                raise ValueError("int8_static needs calibration frames (--frames)")
+            input_name = ort.InferenceSession(str(prep), providers=["CPUExecutionProvider"]).get_inputs()[0].name
+            quantize_static(str(prep), str(out_path), _calibration_reader(input_name, frames, imgsz),
+                            quant_format=QuantFormat.QDQ, activation_type=QuantType.QUInt8,
+                            weight_type=QuantType.QInt8, per_channel=True)
+        else:
+            raise ValueError(f"unknown variant: {variant}")
+    finally:
+        prep.unlink(missing_ok=True)
+
+
+def main():
+    p = argparse.ArgumentParser(description="Build quantized ONNX variants of the parcel model")
+    p.add_argument("--frames", default=None)
+    p.add_argument("--variants", default=",".join(VARIANTS))
+    p.add_argument("--limit", type=int, default=100, help="cam(폴더)별 캘리브레이션 프레임 상한")
+    p.add_argument("--force", action="store_true")
+    args = p.parse_args()
+
+    model_path = track_config.MODEL_PATH
+    imgsz = getattr(track_config, "YOLO_IMGSZ", 640)
+    base = export_model(model_path, "onnx", imgsz=imgsz, dynamic=True)
+    frames = load_frame_set(args.frames, args.limit) if args.frames else []
+    print(f"base: {base}, calibration frames: {len(frames)}")
+    for variant in [v.strip() for v in args.variants.split(",") if v.strip()]:
+        out = variant_path(model_path, variant)
+        if not args.force and out.exists() and out.stat().st_mtime >= base.stat().st_mtime:
+            print(f"{variant}: {out} (cached)")
+            continue
+        try:
+            quantize(base, variant, out, frames, imgsz)
+            print(f"{variant}: {out}")
+        except Exception as e:
+            print(f"{variant}: failed ({e})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+ROI crop 추론 vs 전체 프레임 추론 (YOLO_IMGSZ) 비교 벤치마크.
+같은 프레임 세트(4 cam)를 두 방식으로 배치 추론해 latency와, 전체 프레임 결과에서 ROI/EOL 플래그가 켜진
+detection이 crop 결과에서도 같은 플래그로 나오는지(recall, extra, mean IoU) 측정.
+실행: python3 monitoring/roi_crop_benchmark.py [--images DIR] [--repeat N] [--pad-rate R]
+  --images: 카메라 원본 프레임 jpg 폴더 (없으면 tests/parcel.jpeg를 1280x720으로 사용)
+출력: monitoring/roi_crop_benchmark_results.json
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import cv2
+
+TRACK_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(TRACK_ROOT))
+import config as track_config
+from logic.box_metrics import flagged_agreement
+from logic.detector import YOLODetector
+from logic.preprocess import FramePreprocessor, PreprocessPlanCache
+
+
+def load_frames(images_dir):
+    paths = sorted(Path(images_dir).glob("*.jpg")) if images_dir else [TRACK_ROOT / "tests" / "parcel.jpeg"]
+    frames = []
+    for p in paths:
+        img = cv2.imread(str(p))
+        if img is not None:
+            frames.append(img if images_dir else cv2.resize(img, (1280, 720)))
+    return frames
+
+
+def main():
+    p = argparse.ArgumentParser(description="ROI crop vs full-frame inference benchmark")
+    p.add_argument("--images", default=None)
+    p.add_argument("--repeat", type=int, default=10)
+    p.add_argument("--pad-rate", type=float, default=getattr(track_config, "ROI_CROP_PAD_RATE", 0.1))
+    args = p.parse_args()
+
+    frames = load_frames(args.images)
+    if not frames:
+        print("no frames")
+        return
+    imgsz = getattr(track_config, "YOLO_IMGSZ", 640)
+    target_w = getattr(track_config, "PREPROCESS_TARGET_WIDTH", 640)
+    cams = list(track_config.TRACKING_CAMS)
+    full_plans = PreprocessPlanCache(track_config.CAM_SETTINGS, target_w, model_imgsz=imgsz)
+    crop_plans = PreprocessPlanCache(track_config.CAM_SETTINGS, target_w, roi_crop_pad_rate=args.pad_rate,
+                                     model_imgsz=imgsz)
+    detector = YOLODetector(track_config.MODEL_PATH)
+    pre = FramePreprocessor()
+
+    full_ms, crop_ms, per_cam = [], [], {c: [] for c in cams}
+    for frame in frames:
+        imgs = [pre.run(full_plans.get(c, frame.shape), frame).copy() for c in cams]
+        fplans = [full_plans.get(c, frame.shape) for c in cams]
+        cplans = [crop_plans.get(c, frame.shape) for c in cams]
+        # 워밍업 1회 후 측정
+        detector.get_detections_batch(imgs, fplans, cams)
+        detector.get_detections_roi(imgs, cplans, cams)
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            full = detector.get_detections_batch(imgs, fplans, cams)
+            full_ms.append((time.perf_counter() - t0) * 1000)
+            t0 = time.perf_counter()
+            crop = detector.get_detections_roi(imgs, cplans, cams)
+            crop_ms.append((time.perf_counter() - t0) * 1000)
+        for cam, f_dets, c_dets in zip(cams, full, crop):
+            per_cam[cam].append(flagged_agreement(f_dets, c_dets))
+
+    def _sum(cam, key):
+        return sum(r[key] for r in per_cam[cam])
+
+    report = {
+        "frames": len(frames),
+        "repeat": args.repeat,
+        "pad_rate": args.pad_rate,
+        "full_imgsz": imgsz,
+        "crop_imgsz": {c: crop_plans.get(c, frames[0].shape).crop_imgsz for c in cams},
+        "crop_bands": {c: crop_plans.get(c, frames[0].shape).crop_bands for c in cams},
+        "full_set_ms_mean": round(sum(full_ms) / len(full_ms), 2),
+        "crop_set_ms_mean": round(sum(crop_ms) / len(crop_ms), 2),
+        "accuracy": {
+            c: {
+                "ref_flagged": _sum(c, "ref_flagged"),
+                "crop_flagged": _sum(c, "cand_flagged"),
+                "recall": round(sum(r["recall"] * r["ref_flagged"] for r in per_cam[c])
+                                / max(1, _sum(c, "ref_flagged")), 4),
+                "extra": _sum(c, "extra"),
+            }
+            for c in cams
+        },
+    }
+    out_path = TRACK_ROOT / "monitoring" / "roi_crop_benchmark_results.json"
+    out_path.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+모델 변형 정확도·latency 회귀 비교. 캡처 프레임 세트를 각 변형으로 재생해 FP32 기준 결과를 정답으로 둔
+AP50 / mAP50-95 (logic.box_metrics)와 프레임당 latency(mean/p50/p95)를 cam별·전체로 보고 → cam별 변형 선택 근거.
+변형: fp32(.pt, ultralytics), onnx_fp32, openvino, 그리고 monitoring/quantize_model.py 산출물 (int8_dynamic 등).
+실행: python3 monitoring/variant_regression.py --frames DIR [--variants onnx_fp32,int8_dynamic,...] [--baseline fp32]
+  --frames: quantize_model.py와 같은 형식 (DIR/<CAM_ID>/*.jpg 또는 DIR/*.jpg). 없으면 tests/parcel.jpeg 1장
+출력: monitoring/variant_regression_results.json
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+TRACK_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(TRACK_ROOT))
+import config as track_config
+from logic.box_metrics import average_precision, map_50_95
+from logic.inference_backends import (
+    BACKEND_ONNXRUNTIME,
+    BACKEND_OPENVINO,
+    BACKEND_ULTRALYTICS,
+    create_backend,
+    exported_path,
+)
+from quantize_model import VARIANTS, load_frame_set, variant_path
+
+
+def resolve_variant(name, model_path):
+    """변형 이름 → (backend 이름, 모델 경로)."""
+    if name == "fp32":
+        return BACKEND_ULTRALYTICS, model_path
+    if name == "onnx_fp32":
+        return BACKEND_ONNXRUNTIME, exported_path(model_path, "onnx")
+    if name == "openvino":
+        return BACKEND_OPENVINO, exported_path(model_path, "openvino")
+    return BACKEND_ONNXRUNTIME, variant_path(model_path, name)
+
+
+def default_variants(model_path):
+    names = ["onnx_fp32"]
+    if exported_path(model_path, "openvino").exists():
+        names.append("openvino")
+    return names + [v for v in VARIANTS if variant_path(model_path, v).exists()]
+
+
+def replay(backend, frames, warmup=2):
+    """프레임별 (N, 5) 박스와 latency(ms)."""
+    for _, img in frames[:warmup]:
+        backend.predict([img])
+    boxes, times_ms = [], []
+    for _, img in frames:
+        t0 = time.perf_counter()
+        boxes.append(backend.predict([img], with_scores=True)[0])
+        times_ms.append((time.perf_counter() - t0) * 1000)
+    return boxes, times_ms
+
+
+def summarize(ref, cand, times_ms):
+    ref_boxes = [r[:, :4].tolist() for r in ref]
+    cand_boxes = [c.tolist() for c in cand]
+    t = np.asarray(times_ms)
+    return {
+        "frames": len(cand),
+        "ref_boxes": sum(len(r) for r in ref),
+        "boxes": sum(len(c) for c in cand),
+        "ap50": round(average_precision(ref_boxes, cand_boxes, 0.5), 4),
+        "map50_95": round(map_50_95(ref_boxes, cand_boxes), 4),
+        "ms_mean": round(float(t.mean()), 2) if len(t) else None,
+        "ms_p50": round(float(np.percentile(t, 50)), 2) if len(t) else None,
+        "ms_p95": round(float(np.percentile(t, 95)), 2) if len(t) else None,
+    }
+
+
+def main():
+    p = argparse.ArgumentParser(description="Accuracy/latency regression of model variants vs FP32")
+    p.add_argument("--frames", default=None)
+    p.add_argument("--limit", type=int, default=200, help="cam(폴더)별 프레임 상한")
+    p.add_argument("--variants", default=None)
+    p.add_argument("--baseline", default="fp32")
+    args = p.parse_args()
+
+    model_path = track_config.MODEL_PATH
+    imgsz = getattr(track_config, "YOLO_IMGSZ", 640)
+    threads = getattr(track_config, "INFERENCE_THREADS", 0)
+    if args.frames:
+        frames = load_frame_set(args.frames, args.limit)
+    else:
+        frames = [("", cv2.resize(cv2.imread(str(TRACK_ROOT / "tests" / "parcel.jpeg")), (640, 360)))]
+    if not frames:
+        print("no frames")
+        return
+    names = [v.strip() for v in args.variants.split(",")] if args.variants else default_variants(model_path)
+    cams = sorted({cam for cam, _ in frames})
+
+    backend, path = resolve_variant(args.baseline, model_path)
+    ref, ref_ms = replay(create_backend(backend, path, imgsz=imgsz, threads=threads, auto_export=False), frames)
+    report = {
+        "model_path": str(model_path),
+        "frames": len(frames),
+        "baseline": args.baseline,
+        "variants": {args.baseline: {"all": summarize(ref, ref, ref_ms)}},
+    }
+    for name in names:
+        if name == args.baseline:
+            continue
+        backend, path = resolve_variant(name, model_path)
+        try:
+            cand, times_ms = replay(create_backend(backend, path, imgsz=imgsz, threads=threads,
+                                                   auto_export=False), frames)
+        except Exception as e:
+            report["variants"][name] = {"error": str(e)}
+            continue
+        entry = {"path": str(path), "all": summarize(ref, cand, times_ms)}
+        for cam in cams:
+            idx = [i for i, (c, _) in enumerate(frames) if c == cam]
+            entry[cam or "frames"] = summarize([ref[i] for i in idx], [cand[i] for i in idx],
+                                               [times_ms[i] for i in idx])
+        report["variants"][name] = entry
+
+    out_path = TRACK_ROOT / "monitoring" / "variant_regression_results.json"
+    out_path.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+ZMQ 프레임 전송 포맷 벤치마크: json(LZ4+JSON+base64) vs binary(header + JPEG/raw).
+FramePublisher → FrameReceiver 를 inproc:// 또는 ipc:// 로 연결해 측정.
+실행: python3 monitoring/wire_format_benchmark.py [--transport inproc|ipc] [--frames N]
+출력: monitoring/wire_format_benchmark_results.json
+  encode_ms(송신 측 인코딩), bytes_per_msg, latency_ms(송신→콜백), recv_fps, received/sent
+"""
+import argparse
+import json
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+import zmq
+
+TRACK_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(TRACK_ROOT))
+from ingest.frame_publisher import FramePublisher
+from ingest.frame_receiver import FrameReceiver
+
+VARIANTS = [
+    ("json_lz4", {"wire_format": "json", "use_lz4": True}),
+    ("binary_jpeg", {"wire_format": "binary", "encoding": "jpeg"}),
+    ("binary_raw_bgr", {"wire_format": "binary", "encoding": "raw_bgr"}),
+]
+
+
+def make_test_frame(w=1280, h=720):
+    """tests/parcel.jpeg를 1280x720으로 (없으면 그라디언트+노이즈)."""
+    img = cv2.imread(str(TRACK_ROOT / "tests" / "parcel.jpeg"))
+    if img is not None:
+        return cv2.resize(img, (w, h))
+    rng = np.random.default_rng(0)
+    grad = np.tile(np.linspace(0, 255, w, dtype=np.uint8), (h, 1))
+    return np.dstack([grad, grad[::-1], rng.integers(0, 255, (h, w), dtype=np.uint8)])
+
+
+def run_variant(ctx, endpoint, name, pub_kwargs, frame, n_frames, interval_sec):
+    pub_sock = ctx.socket(zmq.PUB)
+    pub_sock.setsockopt(zmq.SNDHWM, 0)
+    pub_sock.bind(endpoint)
+    sub_sock = ctx.socket(zmq.SUB)
+    sub_sock.setsockopt(zmq.RCVHWM, 0)
+    sub_sock.setsockopt(zmq.SUBSCRIBE, b"")
+    sub_sock.connect(endpoint)
+
+    latencies = []
+    done = threading.Event()
+
+    def cb(camera_name, f, ts):
+        latencies.append(time.time() - ts)
+        if len(latencies) >= n_frames:
+            done.set()
+
+    recv = FrameReceiver(sub_sock, use_lz4=pub_kwargs.get("use_lz4", True), output_bgr=True,
+                         wire_format=pub_kwargs["wire_format"])
+    recv.set_frame_callback(cb)
+    recv.start()
+    publisher = FramePublisher(pub_sock, **pub_kwargs)
+    time.sleep(0.3)  # slow joiner
+
+    encode_ms = []
+    t_start = time.perf_counter()
+    for _ in range(n_frames):
+        t0 = time.perf_counter()
+        parts = publisher.encode("bench", frame, time.time())
+        encode_ms.append((time.perf_counter() - t0) * 1000)
+        pub_sock.send_multipart(parts)
+        publisher.sent_count += 1
+        publisher.sent_bytes += sum(len(p) for p in parts)
+        if interval_sec:
+            time.sleep(interval_sec)
+    done.wait(timeout=10)
+    elapsed = time.perf_counter() - t_start
+    recv.stop()
+    pub_sock.close(linger=0)
+    sub_sock.close(linger=0)
+
+    lat_ms = sorted(x * 1000 for x in latencies)
+    return {
+        "variant": name,
+        "sent": publisher.sent_count,
+        "received": len(latencies),
+        "bytes_per_msg": round(publisher.sent_bytes / max(1, publisher.sent_count)),
+        "encode_ms_mean": round(sum(encode_ms) / len(encode_ms), 3),
+        "latency_ms_mean": round(sum(lat_ms) / len(lat_ms), 3) if lat_ms else None,
+        "latency_ms_p95": round(lat_ms[int(len(lat_ms) * 0.95) - 1], 3) if lat_ms else None,
+        "recv_fps": round(len(latencies) / elapsed, 2) if elapsed > 0 else None,
+    }
+
+
+def main():
+    p = argparse.ArgumentParser(description="ZMQ wire format benchmark (json vs binary)")
+    p.add_argument("--transport", choices=("inproc", "ipc"), default="inproc")
+    p.add_argument("--frames", type=int, default=200)
+    p.add_argument("--interval", type=float, default=0.0, help="송신 간격(초). 0이면 최대 속도")
+    args = p.parse_args()
+
+    frame = make_test_frame()
+    ctx = zmq.Context()
+    tmpdir = tempfile.mkdtemp(prefix="wire_bench_")
+    results = []
+    for name, kwargs in VARIANTS:
+        if args.transport == "ipc":
+            endpoint = f"ipc://{tmpdir}/{name}.sock"
+        else:
+            endpoint = f"inproc://wire-bench-{name}"
+        results.append(run_variant(ctx, endpoint, name, kwargs, frame, args.frames, args.interval))
+    ctx.term()
+
+    report = {"transport": args.transport, "frame_shape": list(frame.shape), "results": results}
+    out_path = TRACK_ROOT / "monitoring" / "wire_format_benchmark_results.json"
+    out_path.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
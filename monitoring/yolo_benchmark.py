@@ -56,7 +56,7 @@ def run_inference_benchmark(model_path, imgsz_list=(640, 480, 320), warmup=3, re
         times_ms = []
         for i in range(warmup + repeat):
             t0 = time.perf_counter()
-            detector.model(img, conf=0.25, iou=0.45, verbose=False, imgsz=imgsz)[0]
+            detector.backend.predict([img], imgsz=imgsz)
             elapsed_ms = (time.perf_counter() - t0) * 1000
             if i >= warmup:
                 times_ms.append(elapsed_ms)
@@ -103,6 +103,46 @@ def run_batch_benchmark(model_path, batch_sizes=(1, 4), imgsz=640, warmup=2, rep
     return results
 
 
+def run_set_benchmark(model_path, n_cams=4, warmup=2, repeat=10):
+    """
+    500ms 세트 1회 detection: 스레드 4개(모델 1개 공유) vs get_detections_batch 1회.
+    입력: main 전처리와 같은 640폭 프레임 (1280x720 → 640x360).
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from logic.detector import YOLODetector
+
+    detector = YOLODetector(model_path)
+    frames = [np.zeros((360, 640, 3), dtype=np.uint8) + 128 for _ in range(n_cams)]
+    cams = list(track_config.TRACKING_CAMS[:n_cams])
+    cfgs = [{"roi_y": 211, "roi_margin": 28} for _ in cams]
+
+    def threaded():
+        with ThreadPoolExecutor(max_workers=n_cams) as ex:
+            futures = [ex.submit(detector.get_detections, f, c, cam) for f, c, cam in zip(frames, cfgs, cams)]
+            return [fut.result() for fut in futures]
+
+    def batched():
+        return detector.get_detections_batch(frames, cfgs, cams)
+
+    results = {}
+    for name, fn in (("threads", threaded), ("batch", batched)):
+        times_ms = []
+        for i in range(warmup + repeat):
+            t0 = time.perf_counter()
+            fn()
+            if i >= warmup:
+                times_ms.append((time.perf_counter() - t0) * 1000)
+        mean_ms = sum(times_ms) / len(times_ms)
+        results[name] = {
+            "mean_ms": round(mean_ms, 2),
+            "min_ms": round(min(times_ms), 2),
+            "max_ms": round(max(times_ms), 2),
+            "sets_per_sec": round(1000.0 / mean_ms, 2) if mean_ms > 0 else None,
+            "n": len(times_ms),
+        }
+    return results
+
+
 def main():
     out_path = TRACK_ROOT / "monitoring" / "yolo_benchmark_results.json"
     model_path = track_config.MODEL_PATH
@@ -112,8 +152,9 @@ def main():
         "model_info": get_model_info(),
         "input_resolution_capture": "1280x720 (USB_LOCAL from config)",
         "detector_imgsz": "default 640 (not passed in detector.py)",
+        "inference_backend": getattr(track_config, "INFERENCE_BACKEND", "ultralytics"),
         "tensorrt": "not used (no export to engine)",
-        "batch_in_detector": "1 (single image per call)",
+        "batch_in_detector": "get_detections (1장) / get_detections_batch (세트 1회 forward)",
     }
 
     if not model_path.exists():
@@ -129,6 +170,10 @@ def main():
         report["batch_benchmark"] = run_batch_benchmark(model_path)
     except Exception as e:
         report["batch_benchmark_error"] = str(e)
+    try:
+        report["set_benchmark"] = run_set_benchmark(model_path)
+    except Exception as e:
+        report["set_benchmark_error"] = str(e)
 
     out_path.write_text(json.dumps(report, indent=2, ensure_ascii=False))
 
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Unit tests for logic.association (detection ↔ track 배정)."""
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from logic.association import (
+    ASSOC_GREEDY,
+    ASSOC_GREEDY_COMPAT,
+    ASSOC_HUNGARIAN,
+    associate,
+    cost_matrix,
+)
+
+try:
+    import scipy  # noqa: F401
+    HAS_SCIPY = True
+except ImportError:
+    HAS_SCIPY = False
+
+
+def legacy_assign(dets, tracks, forward_sign, dist_eps, max_dy):
+    """기존 main _process_with_detections 루프."""
+    out = []
+    for cx, cy in dets:
+        best, best_score = -1, 1e9
+        for t, (tx, ty) in enumerate(tracks):
+            dx = abs(cx - tx)
+            dy = (cy - ty) * forward_sign
+            if dx > dist_eps or dy < -5 or dy > max_dy:
+                continue
+            score = dx + dy * 0.3
+            if score < best_score:
+                best, best_score = t, score
+        out.append(best)
+    return out
+
+
+class TestAssociation(unittest.TestCase):
+    def test_greedy_compat_matches_legacy_loop(self):
+        rng = np.random.default_rng(0)
+        for trial in range(300):
+            sign = 1 if trial % 2 else -1
+            dets = [tuple(int(v) for v in p) for p in rng.integers(0, 200, (rng.integers(0, 8), 2))]
+            tracks = [tuple(int(v) for v in p) for p in rng.integers(0, 200, (rng.integers(0, 8), 2))]
+            got = associate(dets, tracks, sign, 40.0, 60.0, ASSOC_GREEDY_COMPAT)
+            self.assertEqual(got.tolist(), legacy_assign(dets, tracks, sign, 40.0, 60.0), trial)
+
+    def test_gates(self):
+        cost = cost_matrix([(100, 100)], [(100, 106), (100, 104), (141, 100), (100, 39)], 1, 40, 60)
+        # dy = -6 (뒤로 5px 초과), dy = -4 허용, dx 41 > dist_eps, dy 61 > max_dy
+        self.assertEqual(np.isfinite(cost).tolist(), [[False, True, False, False]])
+        self.assertAlmostEqual(cost[0, 1], -4 * 0.3)
+
+    def test_exclusive_modes_assign_each_track_once(self):
+        dets = [(100, 110), (102, 112)]
+        tracks = [(100, 100), (300, 100)]
+        self.assertEqual(associate(dets, tracks, 1, 40, 60, ASSOC_GREEDY_COMPAT).tolist(), [0, 0])
+        self.assertEqual(associate(dets, tracks, 1, 40, 60, ASSOC_GREEDY).tolist(), [0, -1])
+        self.assertEqual(associate([], tracks, 1, 40, 60, ASSOC_GREEDY).tolist(), [])
+        with self.assertRaises(ValueError):
+            associate(dets, tracks, 1, 40, 60, "nearest")
+
+    @unittest.skipUnless(HAS_SCIPY, "scipy not installed")
+    def test_hungarian_minimizes_total_cost(self):
+        # greedy는 det0 → track0 (비용 0)을 먼저 잡아 det1이 배정 없음, hungarian은 둘 다 배정
+        dets = [(100, 100), (130, 100)]
+        tracks = [(100, 100), (65, 100)]
+        self.assertEqual(associate(dets, tracks, 1, 40, 60, ASSOC_GREEDY).tolist(), [0, -1])
+        self.assertEqual(associate(dets, tracks, 1, 40, 60, ASSOC_HUNGARIAN).tolist(), [1, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""Unit tests for logic.box_metrics."""
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from logic.box_metrics import average_precision, box_iou, flagged_agreement, map_50_95, match_boxes
+
+
+def _det(box, in_roi=False, in_eol=False):
+    return {"box": box, "in_roi": in_roi, "in_eol": in_eol}
+
+
+class TestBoxMetrics(unittest.TestCase):
+    def test_iou(self):
+        self.assertAlmostEqual(box_iou((0, 0, 10, 10), (0, 0, 10, 10)), 1.0)
+        self.assertAlmostEqual(box_iou((0, 0, 10, 10), (5, 0, 15, 10)), 50 / 150)
+        self.assertEqual(box_iou((0, 0, 10, 10), (20, 20, 30, 30)), 0.0)
+
+    def test_match_is_one_to_one_by_best_iou(self):
+        ref = [(0, 0, 10, 10), (100, 100, 110, 110)]
+        cand = [(1, 0, 11, 10), (0, 0, 10, 10), (300, 300, 310, 310)]
+        matches, un_r, un_c = match_boxes(ref, cand)
+        self.assertEqual([(i, j) for i, j, _ in matches], [(0, 1)])
+        self.assertEqual(un_r, [1])
+        self.assertEqual(un_c, [0, 2])
+
+    def test_flagged_agreement(self):
+        ref = [_det((0, 0, 10, 10), in_roi=True), _det((50, 50, 60, 60), in_eol=True), _det((90, 0, 99, 9))]
+        cand = [_det((0, 0, 10, 10), in_roi=True), _det((50, 50, 60, 60), in_roi=True),
+                _det((200, 0, 210, 10), in_roi=True)]
+        r = flagged_agreement(ref, cand)
+        self.assertEqual(r["ref_flagged"], 2)
+        self.assertAlmostEqual(r["recall"], 0.5)
+        self.assertEqual(r["extra"], 1)
+
+    def test_average_precision(self):
+        ref = [[(0, 0, 10, 10), (20, 0, 30, 10)], [(0, 0, 10, 10)]]
+        same = [[(*b, 0.9) for b in f] for f in ref]
+        self.assertAlmostEqual(average_precision(ref, same), 1.0)
+        self.assertAlmostEqual(map_50_95(ref, same), 1.0)
+        # 높은 점수의 오검출 1개 + 정답 2/3 → recall 2/3, precision 2/3에서 포화
+        cand = [[(100, 100, 110, 110, 0.95), (0, 0, 10, 10, 0.9)], [(0, 0, 10, 10, 0.8)]]
+        self.assertAlmostEqual(average_precision(ref, cand), 1 / 3 * 2 / 3 + 1 / 3 * 2 / 3)
+        # 같은 ref에 중복 매칭은 FP
+        dup = [[(0, 0, 10, 10, 0.9), (0, 0, 10, 10, 0.8)], []]
+        self.assertAlmostEqual(average_precision(ref, dup), 1 / 3)
+        self.assertEqual(average_precision([[]], [[]]), 1.0)
+        self.assertEqual(average_precision([[]], [[(0, 0, 1, 1, 0.5)]]), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Unit tests for ingest.decode_pool (순서 보장, backlog 스킵, FrameReceiver 연동)."""
+import json
+import random
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from ingest.decode_pool import DecodePool
+from ingest.frame_receiver import FrameReceiver
+from ingest.wire_format import encode_binary_message
+
+
+def _wait_for(pred, timeout=3.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if pred():
+            return True
+        time.sleep(0.005)
+    return pred()
+
+
+class TestDecodePool(unittest.TestCase):
+    def test_delivers_in_submit_order_per_stream(self):
+        pool = DecodePool(workers=4, queue_size=64)
+        pool.start()
+        out = {"a": [], "b": []}
+        rng = random.Random(0)
+
+        def job(i):
+            def decode():
+                time.sleep(rng.random() * 0.003)
+                return i
+            return decode
+
+        try:
+            for i in range(40):
+                for key in ("a", "b"):
+                    pool.submit(key, job(i), out[key].append)
+            self.assertTrue(_wait_for(lambda: len(out["a"]) == 40 and len(out["b"]) == 40))
+        finally:
+            pool.stop()
+        self.assertEqual(out["a"], list(range(40)))
+        self.assertEqual(out["b"], list(range(40)))
+        stats = pool.get_stats()
+        self.assertEqual(stats["decoded"], 80)
+        self.assertEqual(stats["streams"]["a"]["backlog"], 0)
+
+    def test_failed_decode_does_not_block_order(self):
+        pool = DecodePool(workers=2)
+        pool.start()
+        out = []
+        try:
+            pool.submit("s", lambda: None, out.append)
+            pool.submit("s", lambda: 1 / 0, out.append)
+            pool.submit("s", lambda: "ok", out.append)
+            self.assertTrue(_wait_for(lambda: out == ["ok"]))
+        finally:
+            pool.stop()
+        self.assertEqual(pool.get_stats()["failed"], 2)
+
+    def test_backlog_skips_frames_that_would_be_evicted(self):
+        pool = DecodePool(workers=1, queue_size=64, max_backlog=3)
+        out = []
+        decoded = []
+
+        def job(i):
+            def decode():
+                decoded.append(i)
+                return i
+            return decode
+
+        # 워커 시작 전 10개 적재 → 최신 3개만 디코딩
+        for i in range(10):
+            pool.submit("cam", job(i), out.append)
+        pool.start()
+        try:
+            self.assertTrue(_wait_for(lambda: pool.get_stats()["streams"]["cam"]["backlog"] == 0))
+        finally:
+            pool.stop()
+        self.assertEqual(out, [7, 8, 9])
+        self.assertEqual(decoded, [7, 8, 9])
+        self.assertEqual(pool.get_stats()["streams"]["cam"]["skipped"], 7)
+
+    def test_backlogged_streams_skip_without_blocking_submit(self):
+        # 기본값 (DECODE_QUEUE_SIZE=64, max_backlog=TIME_ORDERED_BUFFER_MAXLEN=60)으로 4개 stream 동시 적체
+        gate = threading.Event()
+        pool = DecodePool(workers=2, queue_size=64, max_backlog=60)
+        pool.start()
+        streams = ("rpi1:usb1", "rpi1:usb2", "rpi2:usb1", "rpi2:usb2")
+        out = {key: [] for key in streams}
+
+        def job(i):
+            def decode():
+                gate.wait()
+                return i
+            return decode
+
+        def produce():
+            for i in range(200):
+                for key in streams:
+                    pool.submit(key, job(i), out[key].append)
+
+        producer = threading.Thread(target=produce, daemon=True)
+        try:
+            producer.start()
+            producer.join(timeout=2.0)
+            # 워커가 모두 막혀 있어도 submit은 블록하지 않음
+            self.assertFalse(producer.is_alive())
+            self.assertLessEqual(pool.get_stats()["queue_depth"], 60 * len(streams))
+            gate.set()
+            self.assertTrue(_wait_for(lambda: all(s["backlog"] == 0 for s in pool.get_stats()["streams"].values())))
+        finally:
+            gate.set()
+            pool.stop()
+        stats = pool.get_stats()["streams"]
+        for key in streams:
+            self.assertEqual(out[key], sorted(out[key]))
+            self.assertEqual(out[key][-60:], list(range(140, 200)))
+            self.assertEqual(stats[key]["decoded"] + stats[key]["skipped"], 200)
+            self.assertGreaterEqual(stats[key]["skipped"], 200 - 60 - 2)
+
+    def test_frame_receiver_uses_pool(self):
+        pool = DecodePool(workers=3)
+        pool.start()
+        recv = FrameReceiver(None, wire_format="binary", decode_pool=pool, source_id="rpi1")
+        got = []
+        lock = threading.Lock()
+
+        def cb(camera, frame, ts):
+            with lock:
+                got.append((camera, ts, frame.shape))
+
+        recv.set_frame_callback(cb)
+        frame = np.zeros((16, 24, 3), dtype=np.uint8)
+        try:
+            for i in range(20):
+                recv.handle_message(encode_binary_message("usb1", "usb1", frame, float(i)))
+            self.assertTrue(_wait_for(lambda: len(got) == 20))
+        finally:
+            pool.stop()
+        self.assertEqual([ts for _, ts, _ in got], [float(i) for i in range(20)])
+        self.assertEqual(got[0][2], (16, 24, 3))
+        self.assertIn("rpi1:usb1", pool.get_stats()["streams"])
+
+    def test_stop_with_full_queue_does_not_block(self):
+        gate = threading.Event()
+        pool = DecodePool(workers=1, queue_size=1)
+        pool.start()
+        pool.submit("s", lambda: gate.wait() and 1, lambda _: None)
+        _wait_for(lambda: pool.get_stats()["queue_depth"] == 0)
+        pool.submit("s", lambda: 2, lambda _: None)
+        t0 = time.perf_counter()
+        pool.stop(timeout=0.1)
+        self.assertLess(time.perf_counter() - t0, 1.0)
+        gate.set()
+
+    def test_error_counts_exact_with_concurrent_workers(self):
+        pool = DecodePool(workers=4, queue_size=256)
+        pool.start()
+        recv = FrameReceiver(None, use_lz4=False, wire_format="json", decode_pool=pool, source_id="rpi1")
+        bad = json.dumps({"camera": "usb1", "frame": ""}).encode("utf-8")
+        try:
+            for _ in range(200):
+                recv.handle_message([b"usb1", bad])
+            self.assertTrue(_wait_for(lambda: pool.get_stats()["streams"]["rpi1:usb1"]["backlog"] == 0))
+        finally:
+            pool.stop()
+        self.assertEqual(recv.error_counts, {"usb1": 200})
+
+
+if __name__ == "__main__":
+    unittest.main()
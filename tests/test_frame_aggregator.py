@@ -59,6 +59,23 @@ class TestFrameAggregator(unittest.TestCase):
         agg.put("cam1", None, 1.0)
         self.assertIsNone(agg.get("cam1"))
 
+    def test_zero_copy_shares_readonly_frame(self):
+        agg = FrameAggregator(zero_copy=True)
+        frame = np.ones((10, 10, 3), dtype=np.uint8)
+        agg.put("cam1", frame, 1.0)
+        out1, _ = agg.get("cam1")
+        out2, _ = agg.get("cam1")
+        self.assertIs(out1, frame)
+        self.assertIs(out1, out2)
+        self.assertFalse(out1.flags.writeable)
+        with self.assertRaises(ValueError):
+            out1[0, 0, 0] = 5
+
+    def test_zero_copy_put_none_frame(self):
+        agg = FrameAggregator(zero_copy=True)
+        agg.put("cam1", None, 1.0)
+        self.assertIsNone(agg.get("cam1"))
+
     def test_thread_safety(self):
         agg = FrameAggregator()
         results = []
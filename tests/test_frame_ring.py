@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""Unit tests for ingest.frame_ring (FrameRing) and TimeOrderedFrameBuffer arena mode."""
+import sys
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from ingest.frame_ring import FrameRing
+from ingest.time_ordered_buffer import TimeOrderedFrameBuffer
+
+
+def _frame(value, shape=(4, 6, 3)):
+    return np.full(shape, value, dtype=np.uint8)
+
+
+class TestFrameRing(unittest.TestCase):
+    def test_arena_allocated_once_and_reused(self):
+        ring = FrameRing(3, arena=True)
+        ring.append(_frame(1), 1.0, 1.0)
+        arena = ring._arena
+        for i in range(2, 10):
+            ring.append(_frame(i), float(i), float(i))
+        self.assertIs(ring._arena, arena)
+        self.assertEqual(arena.shape, (3, 4, 6, 3))
+        self.assertEqual(ring.nbytes(), arena.nbytes)
+        # 가장 최근 3장만 남음
+        self.assertEqual([ring.timestamp(s) for s in ring.slots()], [7.0, 8.0, 9.0])
+        self.assertEqual([int(ring.frame(s)[0, 0, 0]) for s in ring.slots()], [7, 8, 9])
+
+    def test_arena_frame_is_readonly_view(self):
+        ring = FrameRing(2, arena=True)
+        src = _frame(5)
+        ring.append(src, 1.0, 1.0)
+        src[:] = 0
+        out = ring.frame(ring.head_slot())
+        self.assertEqual(int(out.max()), 5)
+        self.assertFalse(out.flags.writeable)
+        self.assertTrue(np.shares_memory(out, ring._arena))
+
+    def test_leased_slot_not_overwritten_until_released(self):
+        ring = FrameRing(2, arena=True)
+        ring.append(_frame(1), 1.0, 1.0)
+        slot = ring.head_slot()
+        view = ring.frame(slot)
+        ring.remove(slot)
+        for i in range(2, 5):
+            ring.append(_frame(i), float(i), float(i))
+        # 슬롯 차례가 다시 왔어도 lease 중이면 view 내용 유지, 새 프레임은 별도 배열
+        self.assertEqual(int(view[0, 0, 0]), 1)
+        self.assertEqual([int(ring.frame(s)[0, 0, 0]) for s in ring.slots()], [3, 4])
+        self.assertTrue(ring.release(view))
+        self.assertFalse(ring.release(_frame(0)))
+        for i in range(5, 7):
+            ring.append(_frame(i), float(i), float(i))
+        self.assertEqual(int(view[0, 0, 0]), 5)
+
+    def test_reference_mode_keeps_same_array(self):
+        ring = FrameRing(2, arena=False)
+        src = _frame(5)
+        ring.append(src, 1.0, 1.0)
+        self.assertIs(ring.frame(ring.head_slot()), src)
+        self.assertEqual(ring.nbytes(), 0)
+
+    def test_remove_middle_then_head_trims(self):
+        ring = FrameRing(4)
+        for i in range(4):
+            ring.append(_frame(i), float(i), float(i))
+        slots = list(ring.slots())
+        ring.remove(slots[1])
+        self.assertEqual(len(ring), 3)
+        self.assertEqual([ring.timestamp(s) for s in ring.slots()], [0.0, 2.0, 3.0])
+        ring.remove(slots[0])
+        self.assertEqual(ring.timestamp(ring.head_slot()), 2.0)
+
+    def test_none_frame_entry(self):
+        ring = FrameRing(2)
+        ring.append(None, 1.0, 1.0)
+        slot = ring.head_slot()
+        self.assertFalse(ring.has_frame(slot))
+        self.assertIsNone(ring.frame(slot))
+        self.assertEqual(len(ring), 1)
+
+    def test_shape_change_reallocates(self):
+        ring = FrameRing(3, arena=True)
+        ring.append(_frame(1), 1.0, 1.0)
+        ring.append(_frame(2, shape=(2, 2, 3)), 2.0, 2.0)
+        self.assertEqual(ring._arena.shape, (3, 2, 2, 3))
+        # 이전 shape 프레임도 버리지 않음
+        self.assertEqual(len(ring), 2)
+        self.assertEqual([ring.frame(s).shape for s in ring.slots()], [(4, 6, 3), (2, 2, 3)])
+        self.assertEqual(int(ring.frame(ring.head_slot())[0, 0, 0]), 1)
+
+    def test_slots_between_after_wraparound(self):
+        ring = FrameRing(5)
+        for i in range(12):
+            ring.append(_frame(i), float(i), float(i))
+        # 7..11 남음, 물리 슬롯은 wrap 상태
+        got = [ring.receive_ts(s) for s in ring.slots_between(8.0, 10.5)]
+        self.assertEqual(got, [8.0, 9.0, 10.0])
+        self.assertEqual(ring.slots_between(20.0, 30.0), [])
+        self.assertEqual([ring.receive_ts(s) for s in ring.slots_between(0.0, 7.5)], [7.0])
+
+    def test_slots_between_skips_tombstones(self):
+        ring = FrameRing(5)
+        for i in range(5):
+            ring.append(_frame(i), float(i), float(i))
+        ring.remove(ring.find_receive_ts(2.0))
+        self.assertEqual([ring.receive_ts(s) for s in ring.slots_between(1.0, 4.0)], [1.0, 3.0])
+
+    def test_receive_ts_kept_monotonic(self):
+        ring = FrameRing(4)
+        ring.append(_frame(0), 1.0, 10.0)
+        ring.append(_frame(1), 2.0, 9.0)  # 시계 역행
+        self.assertEqual([ring.receive_ts(s) for s in ring.slots()], [10.0, 10.0])
+        self.assertEqual(len(ring.slots_between(10.0, 11.0)), 2)
+
+    def test_remove_between_prefix_advances_head(self):
+        ring = FrameRing(6)
+        for i in range(6):
+            ring.append(_frame(i), float(i), float(i))
+        self.assertEqual(ring.remove_between(0.0, 3.0), 3)
+        self.assertEqual(len(ring), 3)
+        self.assertEqual(ring.receive_ts(ring.head_slot()), 3.0)
+        # 비워진 슬롯은 다시 append에 사용됨 (drop 없이 3장 추가 가능)
+        for i in range(6, 9):
+            ring.append(_frame(i), float(i), float(i))
+        self.assertEqual([ring.receive_ts(s) for s in ring.slots()], [3.0, 4.0, 5.0, 6.0, 7.0, 8.0])
+
+    def test_remove_between_middle(self):
+        ring = FrameRing(6)
+        for i in range(6):
+            ring.append(_frame(i), float(i), float(i))
+        self.assertEqual(ring.remove_between(2.0, 4.0), 2)
+        self.assertEqual([ring.receive_ts(s) for s in ring.slots()], [0.0, 1.0, 4.0, 5.0])
+
+
+class TestTimeOrderedFrameBufferArena(unittest.TestCase):
+    CAMS = ["USB_LOCAL", "RPI_USB1", "RPI_USB2", "RPI_USB3"]
+
+    def test_extract_set_returns_readonly_views(self):
+        buf = TimeOrderedFrameBuffer(self.CAMS, maxlen_per_cam=5, arena=True)
+        t0 = time.time()
+        for i, cam in enumerate(self.CAMS):
+            buf.put(cam, _frame(i + 1), 100.0 + i)
+        selected = buf.extract_set_for_interval(t0 - 1, time.time() + 1)
+        self.assertIsNotNone(selected)
+        self.assertEqual(set(selected), set(self.CAMS))
+        frame, ts = selected["RPI_USB2"]
+        self.assertEqual(ts, 102.0)
+        self.assertEqual(int(frame[0, 0, 0]), 3)
+        self.assertFalse(frame.flags.writeable)
+        self.assertEqual(buf.buffer_lengths(), {cam: 0 for cam in self.CAMS})
+        self.assertGreater(buf.arena_nbytes(), 0)
+        buf.release_frames(selected)
+
+    def test_copies_per_frame(self):
+        src = {cam: _frame(i + 1) for i, cam in enumerate(self.CAMS)}
+        for arena, expected_copies in ((False, 0), (True, 1)):
+            buf = TimeOrderedFrameBuffer(self.CAMS, maxlen_per_cam=5, zero_copy=True, arena=arena)
+            t0 = time.time()
+            with mock.patch("ingest.frame_ring.np.copyto", wraps=np.copyto) as copyto:
+                for i, cam in enumerate(self.CAMS):
+                    buf.put(cam, src[cam], 100.0 + i)
+                selected = buf.extract_set_for_interval(t0 - 1, time.time() + 1)
+            self.assertEqual(copyto.call_count, expected_copies * len(self.CAMS), arena)
+            for cam, (frame, _) in selected.items():
+                if arena:
+                    # 꺼낼 때 복사 없음: arena 슬롯 view
+                    self.assertTrue(np.shares_memory(frame, buf._buffers[cam]._arena))
+                else:
+                    self.assertIs(frame, src[cam])
+
+    def test_get_oldest_and_interval_do_not_lease_slots(self):
+        buf = TimeOrderedFrameBuffer(["A"], maxlen_per_cam=2, arena=True)
+        buf.put("A", _frame(1), 1.0)
+        buf.put("A", _frame(2), 2.0)
+        items = buf.get_frames_in_interval(0.0, time.time() + 1)["A"]
+        _, oldest, _ = buf.get_oldest()
+        ring = buf._buffers["A"]
+        self.assertFalse(ring._leased.any())
+        self.assertFalse(np.shares_memory(oldest, ring._arena))
+        # 이후 put은 계속 arena 슬롯에 제자리 복사 (별도 배열 보관 없음)
+        for i in range(3, 7):
+            buf.put("A", _frame(i), float(i))
+        self.assertEqual(ring._refs, [None, None])
+        self.assertEqual([int(x["frame"][0, 0, 0]) for x in items], [1, 2])
+        self.assertEqual(int(oldest[0, 0, 0]), 1)
+
+    def test_remove_frames_in_interval(self):
+        buf = TimeOrderedFrameBuffer(["A"], maxlen_per_cam=5, arena=True)
+        buf.put("A", _frame(1), 1.0)
+        buf.put("A", _frame(2), 2.0)
+        buf.remove_frames_in_interval(0.0, time.time() + 1)
+        self.assertEqual(buf.buffer_lengths()["A"], 0)
+        self.assertIsNone(buf.get_min_timestamp())
+
+    def test_remove_frame_by_receive_ts(self):
+        buf = TimeOrderedFrameBuffer(["A"], maxlen_per_cam=5, arena=True)
+        buf.put("A", _frame(1), 1.0)
+        buf.put("A", _frame(2), 2.0)
+        rts = [x["receive_ts"] for x in buf.get_frames_in_interval(0.0, time.time() + 1)["A"]]
+        self.assertTrue(buf.remove_frame("A", rts[-1]))
+        self.assertFalse(buf.remove_frame("A", -1.0))
+        self.assertEqual(buf.buffer_lengths()["A"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Unit tests for logic.inference_backends (letterbox, YOLO 출력 decode·NMS, 백엔드 간 박스 일치)."""
+import importlib.util
+import sys
+import unittest
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import config
+from logic.box_metrics import match_boxes
+from logic.inference_backends import (
+    BACKEND_ONNXRUNTIME,
+    BACKEND_OPENVINO,
+    BACKEND_ULTRALYTICS,
+    _LetterboxBackend,
+    create_backend,
+    decode_yolo_output,
+    exported_path,
+    letterbox_image,
+    scale_boxes_back,
+    to_input_tensor,
+)
+
+
+def _head_output(boxes_cxcywh, cls_scores):
+    """(4 + nc, anchors) 형태의 가짜 YOLOv8 head 출력. 실제 출력처럼 anchors > 4 + nc가 되도록 점수 0 anchor 추가."""
+    pred = np.concatenate([np.asarray(boxes_cxcywh, np.float32).T, np.asarray(cls_scores, np.float32).T])
+    return np.concatenate([pred, np.zeros((pred.shape[0], 16), np.float32)], axis=1)
+
+
+class TestLetterbox(unittest.TestCase):
+    def test_geometry_and_roundtrip(self):
+        img = np.zeros((360, 640, 3), dtype=np.uint8)
+        out, r, left, top = letterbox_image(img, (640, 640))
+        self.assertEqual(out.shape, (640, 640, 3))
+        self.assertEqual((r, left, top), (1.0, 0, 140))
+        self.assertTrue((out[:top] == 114).all())
+        box = np.array([[10.0, 20.0 + top, 110.0, 220.0 + top]])
+        np.testing.assert_allclose(scale_boxes_back(box, r, left, top, img.shape[:2]), [[10, 20, 110, 220]])
+        # 경계 밖 박스는 이미지 크기로 clip
+        clipped = scale_boxes_back(np.array([[-5.0, 0.0, 700.0, 640.0]]), r, left, top, img.shape[:2])
+        np.testing.assert_allclose(clipped, [[0, 0, 640, 360]])
+
+    def test_input_tensor_is_rgb_nchw(self):
+        img = np.zeros((4, 4, 3), dtype=np.uint8)
+        img[..., 0] = 255  # B
+        t = to_input_tensor([img, img])
+        self.assertEqual((t.shape, t.dtype), ((2, 3, 4, 4), np.float32))
+        self.assertEqual((t[0, 0].max(), t[0, 2].max()), (0.0, 1.0))
+
+
+class TestDecode(unittest.TestCase):
+    def test_conf_filter_and_nms_per_class(self):
+        boxes = [[100, 100, 50, 50], [102, 101, 50, 50], [100, 100, 50, 50], [300, 300, 40, 40]]
+        scores = [[0.9, 0.0], [0.8, 0.0], [0.0, 0.7], [0.1, 0.2]]
+        dets = decode_yolo_output(_head_output(boxes, scores), conf=0.25, iou=0.45)
+        # 같은 클래스의 겹친 박스는 하나로, 다른 클래스는 유지, 낮은 점수는 제거
+        self.assertEqual(len(dets), 2)
+        np.testing.assert_allclose(sorted(dets[:, 4]), [0.7, 0.9], rtol=1e-6)
+        np.testing.assert_allclose(dets[np.argmax(dets[:, 4]), :4], [75, 75, 125, 125])
+
+    def test_anchor_major_layout_and_empty(self):
+        pred = _head_output([[50, 50, 10, 10]] * 3, [[0.6]] * 3)
+        self.assertEqual(len(decode_yolo_output(pred.T)), 1)
+        self.assertEqual(decode_yolo_output(_head_output([[50, 50, 10, 10]], [[0.1]])).shape, (0, 6))
+
+    def test_exported_paths(self):
+        self.assertEqual(exported_path(config.MODEL_PATH, "onnx").name, "parcel_ver0123.onnx")
+        self.assertEqual(exported_path(config.MODEL_PATH, "openvino").name, "parcel_ver0123_openvino_model")
+        with self.assertRaises(ValueError):
+            create_backend("tensorrt", config.MODEL_PATH)
+
+
+class _FakeBackend(_LetterboxBackend):
+    """입력 중앙에 100x100 박스 하나를 내는 가짜 모델."""
+
+    def _run(self, batch):
+        n, _, h, w = batch.shape
+        cols = np.zeros((n, 16, 5), np.float32)
+        cols[:, 0] = [w / 2, h / 2, 100, 100, 0.9]
+        return cols.transpose(0, 2, 1)
+
+
+class TestLetterboxBackend(unittest.TestCase):
+    def test_predict_maps_back_to_image_and_scores(self):
+        img = np.zeros((360, 640, 3), dtype=np.uint8)
+        backend = _FakeBackend(640)
+        boxes = backend.predict([img, img])
+        self.assertEqual(len(boxes), 2)
+        np.testing.assert_allclose(boxes[0], [[270, 130, 370, 230]])
+        scored = backend.predict([img], with_scores=True)[0]
+        np.testing.assert_allclose(scored, [[270, 130, 370, 230, 0.9]], rtol=1e-6)
+
+
+def _available(backend):
+    module = {BACKEND_ULTRALYTICS: "ultralytics", BACKEND_ONNXRUNTIME: "onnxruntime",
+              BACKEND_OPENVINO: "openvino"}[backend]
+    return importlib.util.find_spec(module) is not None
+
+
+@unittest.skipUnless(Path(config.MODEL_PATH).exists() and _available(BACKEND_ULTRALYTICS),
+                     "model file or ultralytics not available")
+class TestBackendEquivalence(unittest.TestCase):
+    """tests/parcel.jpeg에서 export 백엔드 박스가 ultralytics(.pt) 박스와 일치하는지."""
+
+    @classmethod
+    def setUpClass(cls):
+        img = cv2.imread(str(Path(__file__).resolve().parent / "parcel.jpeg"))
+        cls.img = cv2.resize(img, (640, 360))
+        cls.ref = create_backend(BACKEND_ULTRALYTICS, config.MODEL_PATH).predict([cls.img])[0]
+
+    def _check(self, name):
+        if not _available(name):
+            self.skipTest(f"{name} not installed")
+        boxes = create_backend(name, config.MODEL_PATH).predict([self.img])[0]
+        matches, miss, extra = match_boxes(self.ref.tolist(), boxes.tolist(), 0.9)
+        self.assertEqual((len(miss), len(extra)), (0, 0))
+        for i, j, _ in matches:
+            np.testing.assert_allclose(boxes[j], self.ref[i], atol=2.0)
+
+    def test_onnxruntime(self):
+        self._check(BACKEND_ONNXRUNTIME)
+
+    def test_openvino(self):
+        self._check(BACKEND_OPENVINO)
+
+
+if __name__ == "__main__":
+    unittest.main()
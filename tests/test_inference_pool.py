@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Unit tests for logic.inference_pool (InferencePool)."""
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from logic.inference_pool import InferencePool
+
+
+class FakeDetector:
+    """get_detections / get_detections_batch 흉내. 호출 스레드를 기록."""
+
+    def __init__(self, delay=0.0, gate=None):
+        self.delay = delay
+        self.gate = gate
+        self.threads = set()
+
+    def get_detections(self, img, cfg, cam_id):
+        if self.gate is not None:
+            self.gate.wait()
+        time.sleep(self.delay)
+        self.threads.add(threading.current_thread().name)
+        return [{"cam": cam_id, "img": img}]
+
+    def get_detections_batch(self, frames, cfgs, cam_ids):
+        return [self.get_detections(f, c, cam) for f, c, cam in zip(frames, cfgs, cam_ids)]
+
+
+class TestInferencePool(unittest.TestCase):
+    def test_requires_detector(self):
+        with self.assertRaises(ValueError):
+            InferencePool([])
+
+    def test_submit_single(self):
+        pool = InferencePool([FakeDetector()])
+        pool.start()
+        try:
+            dets, elapsed = pool.submit("A", 1, {}).result(timeout=2)
+            self.assertEqual(dets, [{"cam": "A", "img": 1}])
+            self.assertGreaterEqual(elapsed, 0.0)
+        finally:
+            pool.stop()
+
+    def test_submit_batch_keeps_cam_order(self):
+        pool = InferencePool([FakeDetector()])
+        pool.start()
+        try:
+            dets, _ = pool.submit_batch([1, 2, 3], [{}, {}, {}], ["A", "B", "C"]).result(timeout=2)
+            self.assertEqual([d[0]["cam"] for d in dets], ["A", "B", "C"])
+            stats = pool.get_stats()
+            self.assertEqual(stats["workers"][0]["jobs"], 1)
+            self.assertEqual(stats["workers"][0]["frames"], 3)
+        finally:
+            pool.stop()
+
+    def test_each_worker_uses_own_detector(self):
+        detectors = [FakeDetector(delay=0.05), FakeDetector(delay=0.05)]
+        pool = InferencePool(detectors, queue_size=8)
+        pool.start()
+        try:
+            futures = [pool.submit(f"c{i}", i, {}) for i in range(4)]
+            for fut in futures:
+                fut.result(timeout=2)
+            self.assertEqual(len(detectors[0].threads), 1)
+            self.assertEqual(len(detectors[1].threads), 1)
+            self.assertNotEqual(detectors[0].threads, detectors[1].threads)
+            self.assertEqual(sum(w["jobs"] for w in pool.get_stats()["workers"]), 4)
+        finally:
+            pool.stop()
+
+    def test_backpressure_rejects_when_full(self):
+        gate = threading.Event()
+        pool = InferencePool([FakeDetector(gate=gate)], queue_size=1, submit_timeout=0.05)
+        pool.start()
+        try:
+            first = pool.submit("A", 1, {})
+            # 워커가 첫 작업을 꺼내 gate에서 대기할 때까지 기다림
+            deadline = time.time() + 2
+            while pool.get_stats()["queue_depth"] and time.time() < deadline:
+                time.sleep(0.005)
+            second = pool.submit("A", 2, {})
+            third = pool.submit("A", 3, {})
+            self.assertIsNotNone(first)
+            self.assertIsNotNone(second)
+            self.assertIsNone(third)
+            self.assertEqual(pool.get_stats()["rejected"], 1)
+            gate.set()
+            first.result(timeout=2)
+            second.result(timeout=2)
+        finally:
+            gate.set()
+            pool.stop()
+
+    def test_stop_with_full_queue_cancels_pending(self):
+        gate = threading.Event()
+        pool = InferencePool([FakeDetector(gate=gate)], queue_size=1)
+        pool.start()
+        first = pool.submit("A", 1, {})
+        deadline = time.time() + 2
+        while pool.get_stats()["queue_depth"] and time.time() < deadline:
+            time.sleep(0.005)
+        queued = pool.submit("A", 2, {})
+        t0 = time.perf_counter()
+        pool.stop(timeout=0.1)
+        self.assertLess(time.perf_counter() - t0, 1.0)
+        self.assertTrue(queued.cancelled())
+        gate.set()
+        first.result(timeout=2)
+
+    def test_error_propagates_to_future(self):
+        class Broken(FakeDetector):
+            def get_detections(self, img, cfg, cam_id):
+                raise RuntimeError("boom")
+
+        pool = InferencePool([Broken()])
+        pool.start()
+        try:
+            with self.assertRaises(RuntimeError):
+                pool.submit("A", 1, {}).result(timeout=2)
+            self.assertEqual(pool.get_stats()["workers"][0]["errors"], 1)
+        finally:
+            pool.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
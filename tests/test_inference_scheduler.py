@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Unit tests for logic.inference_scheduler (InferenceScheduler)."""
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import config
+from logic.inference_scheduler import InferenceScheduler
+from logic.matcher import FIFOGlobalMatcher
+from logic.preprocess import build_plan
+
+
+def _det(cy, in_roi=False):
+    return {"box": (0, 0, 10, 10), "center": (5, cy), "in_roi": in_roi, "in_eol": False, "width": 10}
+
+
+class TestInferenceScheduler(unittest.TestCase):
+    def setUp(self):
+        self.matcher = FIFOGlobalMatcher()
+        self.sched = InferenceScheduler(config.TRACKING_CAMS, self.matcher, idle_interval=2.0,
+                                        idle_after=3.0, lookahead=1.0)
+
+    def test_idle_cam_runs_at_idle_interval(self):
+        runs = [t for t in (0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 4.0) if self.sched.should_run("RPI_USB1", t)]
+        self.assertEqual(runs, [0.0, 2.0, 4.0])
+        stats = self.sched.get_stats()["cams"]["RPI_USB1"]
+        self.assertEqual((stats["ran"], stats["skipped"]), (3, 4))
+        # active track이 있으면 항상 추론
+        self.assertTrue(self.sched.should_run("RPI_USB1", 4.5, has_active_tracks=True))
+
+    def test_roi_activity_keeps_full_rate_until_idle_after(self):
+        plan = build_plan("RPI_USB1", config.CAM_SETTINGS["RPI_USB1"], 1280, 720)
+        self.assertTrue(self.sched.should_run("RPI_USB1", 0.0))
+        self.sched.observe("RPI_USB1", 0.0, [_det(-1000)], plan)  # ROI와 먼 detection은 활동 아님
+        self.assertFalse(self.sched.should_run("RPI_USB1", 0.5))
+        self.sched.observe("RPI_USB1", 0.5, [_det(plan.roi_y)], plan)
+        self.assertTrue(all(self.sched.should_run("RPI_USB1", t) for t in (1.0, 1.5, 3.0)))
+        self.assertFalse(self.sched.should_run("RPI_USB1", 3.5))
+
+    def test_due_master_restores_full_rate(self):
+        self.matcher.add_scanner_data("uid_001", "XSEA", 100.0)
+        self.matcher.try_match("USB_LOCAL", 106.0, 50, "USB_LOCAL_001")  # q_scan → q01
+        key = ("USB_LOCAL", "RPI_USB1")
+        start = 106.0 + config.AVG_TRAVEL[key] - config.TIME_MARGIN[key] - 1.0
+        self.assertTrue(self.sched.should_run("RPI_USB1", start - 1.0))
+        self.assertFalse(self.sched.should_run("RPI_USB1", start - 0.5))
+        self.assertTrue(self.sched.should_run("RPI_USB1", start))
+        self.assertTrue(self.sched.should_run("RPI_USB1", start + 0.5))
+        self.assertEqual(self.sched.get_stats()["cams"]["RPI_USB1"]["reasons"]["due"], 2)
+        # 다른 cam에는 영향 없음
+        self.assertTrue(self.sched.should_run("RPI_USB2", start))
+        self.assertFalse(self.sched.should_run("RPI_USB2", start + 0.5))
+
+
+if __name__ == "__main__":
+    unittest.main()
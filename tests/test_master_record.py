@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Unit tests for logic.master_record (MasterRecord dict 호환 view)."""
+import json
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from logic.master_archive import MasterArchive
+from logic.master_record import CameraCode, MasterRecord, MasterStatus, route_and_status
+from logic.matcher import FIFOGlobalMatcher
+
+
+class TestMasterRecord(unittest.TestCase):
+    def test_dict_view_reads_and_writes_names(self):
+        rec = MasterRecord("XSEA", 100.0, 12.8, MasterStatus.TRACKING)
+        self.assertEqual((rec["status"], rec["last_cam"], rec["route_code"]), ("TRACKING", "Scanner", "XSEA"))
+        self.assertIsNone(rec["pending_from_cam"])
+        rec["status"] = "PICKUP"
+        rec.update({"last_cam": "RPI_USB1", "last_time": 120.0})
+        self.assertIs(rec.status, MasterStatus.PICKUP)
+        self.assertIs(rec.last_cam, CameraCode.RPI_USB1)
+        self.assertEqual(rec.get("terminal_time", "none"), "none")
+        rec["terminal_time"] = 121.0
+        self.assertEqual(rec.pop("terminal_time"), 121.0)
+        self.assertIsNone(rec.terminal_time)
+        with self.assertRaises(KeyError):
+            rec["unknown"] = 1
+        self.assertIsNone(rec.get("unknown"))
+
+    def test_uid_view_backed_by_fixed_array(self):
+        rec = MasterRecord("XSEB", 100.0, 14.08)
+        self.assertFalse(rec["uids"])
+        self.assertNotIn("USB_LOCAL", rec.get("uids", {}))
+        rec["uids"]["USB_LOCAL"] = "USB_LOCAL_001"
+        self.assertEqual(rec.uids[CameraCode.USB_LOCAL - 1], "USB_LOCAL_001")
+        self.assertEqual(len(rec.uids), len(CameraCode))
+        self.assertIn("USB_LOCAL", rec["uids"])
+        self.assertEqual(rec["uids"], {"USB_LOCAL": "USB_LOCAL_001"})
+        self.assertIsNone(rec["uids"].get("RPI_USB1"))
+        with self.assertRaises(KeyError):
+            rec["uids"]["RPI_USB1"]
+
+    def test_matcher_masters_are_records_and_archive_serializable(self):
+        m = FIFOGlobalMatcher(retention_sec=0, archive=MasterArchive(max_entries=10))
+        m.add_scanner_data("uid_001", "XSEA", 100.0)
+        m.try_match("USB_LOCAL", 106.0, 50, "USB_LOCAL_001")
+        info = m.masters["uid_001"]
+        self.assertIsInstance(info, MasterRecord)
+        self.assertEqual(info.to_dict()["uids"], {"USB_LOCAL": "USB_LOCAL_001"})
+        m.set_status("uid_001", MasterStatus.MISSING, 107.0)
+        self.assertEqual(m.masters_with_status("MISSING"), ["uid_001"])
+        m.evict_expired(107.0)
+        rec = m.get_master("uid_001")
+        self.assertEqual((rec["status"], rec["last_cam"]), ("MISSING", "USB_LOCAL"))
+        json.dumps(rec)
+
+    def test_route_and_status_for_live_and_archived_master(self):
+        m = FIFOGlobalMatcher(retention_sec=0, archive=MasterArchive(max_entries=10))
+        m.add_scanner_data("uid_001", "XSEB", 100.0)
+        self.assertEqual(route_and_status(m.get_master("uid_001")), ("XSEB", MasterStatus.TRACKING))
+        m.set_status("uid_001", "MISSING", 101.0)
+        m.evict_expired(101.0)
+        self.assertNotIn("uid_001", m.masters)
+        self.assertEqual(route_and_status(m.get_master("uid_001")), ("XSEB", MasterStatus.MISSING))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,17 @@
 #!/usr/bin/env python3
 """Unit tests for logic.matcher (FIFOGlobalMatcher)."""
+import contextlib
+import io
+import json
 import sys
+import tempfile
+import threading
 import unittest
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import config
+from logic.master_archive import MasterArchive
 from logic.matcher import FIFOGlobalMatcher
 
 
@@ -53,10 +60,21 @@ class TestFIFOGlobalMatcher(unittest.TestCase):
         m.try_match("USB_LOCAL", 106.0, 50, "u1")
         # After match, status is TRACKING; resolve_pending can still return DISAPPEAR if now_s is past expected.
         # So set status to a terminal state and then resolve_pending should return None.
-        m.masters["uid_001"]["status"] = "PICKUP"
+        m.set_status("uid_001", "PICKUP", 107.0)
         result = m.resolve_pending("uid_001", 200.0)
         self.assertIsNone(result)
 
+    def test_queue_head_time(self):
+        m = FIFOGlobalMatcher()
+        self.assertIsNone(m.queue_head_time("q_scan"))
+        m.add_scanner_data("uid_001", "XSEA", 100.0)
+        m.add_scanner_data("uid_002", "XSEA", 101.0)
+        self.assertEqual(m.queue_head_time("q_scan"), 100.0)
+        m.try_match("USB_LOCAL", 106.0, 50, "u1")
+        self.assertEqual(m.queue_head_time("q_scan"), 101.0)
+        self.assertEqual(m.queue_head_time("q01"), 106.0)
+        self.assertIsNone(m.queue_head_time("q12"))
+
     def test_cancel_pending(self):
         m = FIFOGlobalMatcher()
         m.add_scanner_data("uid_001", "XSEA", 100.0)
@@ -65,5 +83,173 @@ class TestFIFOGlobalMatcher(unittest.TestCase):
         self.assertEqual(len(m.queues["q_scan"]), 0)
 
 
+class TestResolveDue(unittest.TestCase):
+    def _matched(self):
+        m = FIFOGlobalMatcher()
+        m.add_scanner_data("uid_001", "XSEA", 100.0)
+        m.try_match("USB_LOCAL", 106.0, 50, "u1")
+        return m
+
+    def test_only_expired_masters_resolved(self):
+        m = self._matched()
+        # 매칭 시 마감 시각 재등록: Scanner 기준 마감(110)이 아니라 USB_LOCAL 기준 마감 사용
+        self.assertEqual(m.resolve_due(111.0), [])
+        self.assertTrue(m.mark_pending("uid_001", "USB_LOCAL"))
+        deadline = 106.0 + 18.38 + 4.5
+        self.assertEqual(m.resolve_due(deadline - 0.1), [])
+        resolved = m.resolve_due(deadline + 0.1)
+        self.assertEqual([(mid, r["decision"]) for mid, r in resolved], [("uid_001", "DISAPPEAR")])
+        self.assertEqual(m.masters["uid_001"]["status"], "DISAPPEAR")
+        self.assertEqual(m.resolve_due(1e9), [])
+        self.assertFalse(m.mark_pending("uid_001", "USB_LOCAL"))
+
+    def test_terminal_status_drops_pending_deadline(self):
+        m = self._matched()
+        m.set_status("uid_001", "MISSING", 110.0)
+        self.assertEqual(m.resolve_due(1e9), [])
+
+    def test_matches_full_scan(self):
+        ops = [
+            ("scan", "a", "XSEA", 100.0), ("scan", "b", "XSEB", 101.0), ("scan", "c", "XSEB", 102.0),
+            ("match", "USB_LOCAL", 106.0), ("match", "USB_LOCAL", 107.0), ("pending", "a", "USB_LOCAL"),
+            ("match", "RPI_USB1", 125.5), ("pending", "b", "RPI_USB1"), ("match", "USB_LOCAL", 112.5),
+        ]
+        full, heap = FIFOGlobalMatcher(), FIFOGlobalMatcher()
+        for m in (full, heap):
+            for op in ops:
+                if op[0] == "scan":
+                    m.add_scanner_data(op[1], op[2], op[3])
+                elif op[0] == "match":
+                    m.try_match(op[1], op[2], 50, f"{op[1]}_{op[2]}")
+                else:
+                    m.mark_pending(op[1], op[2])
+        for now in range(100, 200):
+            expect = []
+            for mid in list(full.masters.keys()):
+                r = full.resolve_pending(mid, float(now))
+                if r:
+                    expect.append((mid, r["decision"]))
+            got = [(mid, r["decision"]) for mid, r in heap.resolve_due(float(now))]
+            self.assertEqual(sorted(got), sorted(expect), now)
+        self.assertEqual({k: v["status"] for k, v in full.masters.items()},
+                         {k: v["status"] for k, v in heap.masters.items()})
+
+
+class TestMasterLifecycle(unittest.TestCase):
+    def test_terminal_master_evicted_after_retention(self):
+        m = FIFOGlobalMatcher(retention_sec=60)
+        m.add_scanner_data("uid_001", "XSEA", 100.0)
+        m.add_scanner_data("uid_002", "XSEA", 101.0)
+        m.set_status("uid_001", "MISSING", 110.0)
+        self.assertEqual(m.evict_expired(169.0), 0)
+        self.assertEqual(m.evict_expired(170.0), 1)
+        self.assertNotIn("uid_001", m.masters)
+        # 큐에서도 제거, 다른 master는 유지
+        self.assertEqual([item[0] for item in m.queues["q_scan"]], ["uid_002"])
+        rec = m.get_master("uid_001")
+        self.assertEqual((rec["status"], rec["terminal_time"], rec["route_code"]), ("MISSING", 110.0, "XSEA"))
+        self.assertIs(m.get_master("uid_002"), m.masters["uid_002"])
+        stats = m.get_lifecycle_stats()
+        self.assertEqual((stats["live"], stats["archived"], stats["evicted_total"]), (1, 1, 1))
+        self.assertEqual(stats["live_by_status"], {"TRACKING": 1})
+
+    def test_master_revived_before_retention_is_kept(self):
+        m = FIFOGlobalMatcher(retention_sec=10)
+        m.add_scanner_data("uid_001", "XSEA", 100.0)
+        m.set_status("uid_001", "MISSING", 110.0)
+        m.set_status("uid_001", "TRACKING")
+        self.assertEqual(m.evict_expired(1e9), 0)
+        self.assertIn("uid_001", m.masters)
+
+    def test_resolved_master_archived_to_ring_and_jsonl(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = Path(d) / "archive.jsonl"
+            archive = MasterArchive(max_entries=1, jsonl_path=path)
+            m = FIFOGlobalMatcher(retention_sec=0, archive=archive)
+            for i, t in enumerate((100.0, 101.0)):
+                m.add_scanner_data(f"uid_{i}", "XSEA", t)
+            resolved = m.resolve_due(200.0)
+            self.assertEqual(len(resolved), 2)
+            self.assertEqual(m.evict_expired(200.0), 2)
+            self.assertEqual(m.masters, {})
+            # 메모리 ring은 최근 1개만, 파일에는 전부
+            self.assertIsNone(m.get_master("uid_0"))
+            self.assertEqual(m.get_master("uid_1")["status"], "DISAPPEAR")
+            archive.close()
+            lines = [json.loads(line) for line in path.read_text().splitlines()]
+            self.assertEqual([r["mid"] for r in lines], ["uid_0", "uid_1"])
+            self.assertEqual(archive.dropped_total, 1)
+
+    def test_scanner_thread_and_main_thread_share_matcher(self):
+        m = FIFOGlobalMatcher(retention_sec=0, archive=MasterArchive(max_entries=10000))
+        n, errors, done = 2000, [], threading.Event()
+
+        def scanner():
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    for i in range(n):
+                        m.add_scanner_data(f"uid_{i}", "XSEA", 100.0 + i)
+                        m.set_status(f"uid_{i}", "MISSING" if i % 2 else "PICKUP", 100.0 + i)
+            except Exception as e:  # pragma: no cover - 실패 시 보고용
+                errors.append(e)
+            finally:
+                done.set()
+
+        t = threading.Thread(target=scanner)
+        t.start()
+        try:
+            while not done.is_set():
+                m.get_lifecycle_stats()
+                m.masters_with_status("TRACKING", "MISSING")
+                m.evict_expired(1e9)
+        except Exception as e:
+            errors.append(e)
+        t.join()
+        m.evict_expired(1e9)
+        self.assertEqual(errors, [])
+        stats = m.get_lifecycle_stats()
+        self.assertEqual((stats["live"], stats["archived_total"]), (0, n))
+        self.assertEqual(m.masters_with_status("TRACKING", "MISSING", "PICKUP"), [])
+
+
+class TestStatusIndexAndPositions(unittest.TestCase):
+    def test_status_index_follows_set_status(self):
+        m = FIFOGlobalMatcher(retention_sec=0)
+        m.add_scanner_data("a", "XSEA", 100.0)
+        m.add_scanner_data("b", "XSEB", 100.0)
+        m.try_match("USB_LOCAL", 106.0, 50, "u1")
+        m.mark_pending("a", "USB_LOCAL")
+        self.assertEqual(m.masters_with_status("PENDING"), ["a"])
+        self.assertEqual(m.masters_with_status("TRACKING"), ["b"])
+        m.set_status("b", "MISSING", 107.0)
+        self.assertEqual(sorted(m.masters_with_status("PENDING", "MISSING")), ["a", "b"])
+        m.evict_expired(107.0)
+        self.assertEqual(m.masters_with_status("MISSING"), [])
+        self.assertEqual(m.get_lifecycle_stats()["live_by_status"], {"PENDING": 1})
+
+    def test_position_updates_match_full_scan(self):
+        m = FIFOGlobalMatcher()
+        m.add_scanner_data("a", "XSEA", 100.0)
+        m.add_scanner_data("b", "UNKNOWN", 103.0)
+        legacy_sent = {}
+        for k in range(0, 600):
+            now = 100.0 + k * 0.1
+            if k == 300:
+                m.set_status("b", "MISSING", now)
+            expect = []
+            for mid, info in m.masters.items():
+                if info["status"] in ["TRACKING", "PENDING"] and info.get("start_time") is not None:
+                    total_dist = config.ROUTE_TOTAL_DIST.get(info["route_code"], 12.8)
+                    rem_dist = max(0.0, total_dist - ((now - info["start_time"]) * config.BELT_SPEED))
+                    step_dist = round(rem_dist / 0.5) * 0.5
+                    if legacy_sent.get(mid) != step_dist:
+                        legacy_sent[mid] = step_dist
+                        expect.append((mid, step_dist))
+            self.assertEqual(sorted(m.due_position_updates(now)), sorted(expect), now)
+        # 0m 도달 후에는 heap에 남지 않음
+        self.assertEqual(m.due_position_updates(1e6), [])
+        self.assertEqual(m._position_token, {})
+
+
 if __name__ == "__main__":
     unittest.main()
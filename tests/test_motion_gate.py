@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Unit tests for logic.motion_gate (MotionGate)."""
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import config
+from logic.motion_gate import MotionGate
+from logic.preprocess import build_plan
+
+
+class TestMotionGate(unittest.TestCase):
+    def setUp(self):
+        self.plan = build_plan("RPI_USB3", config.CAM_SETTINGS["RPI_USB3"], 1280, 720)
+        W, H = self.plan.out_size
+        rng = np.random.default_rng(0)
+        self.img = rng.integers(0, 255, (H, W, 3), dtype=np.uint8)
+        self.gate = MotionGate(downsample=4, pixel_thresh=20, min_changed_ratio=0.002, force_every=3)
+
+    def test_skips_static_band_only_after_empty_result(self):
+        self.assertTrue(self.gate.should_run("RPI_USB3", self.img, self.plan))
+        # 직전 결과에 detection이 있으면 변화가 없어도 추론
+        self.gate.record("RPI_USB3", [{"box": (0, 0, 1, 1)}])
+        self.assertTrue(self.gate.should_run("RPI_USB3", self.img, self.plan))
+        self.gate.record("RPI_USB3", [])
+        self.assertFalse(self.gate.should_run("RPI_USB3", self.img, self.plan))
+
+    def test_motion_in_band_runs_but_outside_band_is_ignored(self):
+        self.gate.should_run("RPI_USB3", self.img, self.plan)
+        self.gate.record("RPI_USB3", [])
+        outside = self.img.copy()
+        outside[:max(0, self.plan.roi_top - self.plan.max_dy - 1)] = 0
+        self.assertFalse(self.gate.should_run("RPI_USB3", outside, self.plan))
+        moved = self.img.copy()
+        moved[self.plan.roi_top:self.plan.roi_bot, 100:200] = 255 - moved[self.plan.roi_top:self.plan.roi_bot, 100:200]
+        self.assertTrue(self.gate.should_run("RPI_USB3", moved, self.plan))
+        self.assertEqual(self.gate.get_stats()["cams"]["RPI_USB3"]["motion"], 1)
+        # EOL 밴드 변화도 감지
+        self.gate.record("RPI_USB3", [])
+        eol = moved.copy()
+        eol[self.plan.eol_top:self.plan.eol_bot] = 0
+        self.assertTrue(self.gate.should_run("RPI_USB3", eol, self.plan))
+
+    def test_force_every_and_skip_ratio(self):
+        self.gate.should_run("RPI_USB3", self.img, self.plan)
+        self.gate.record("RPI_USB3", [])
+        runs = [self.gate.should_run("RPI_USB3", self.img, self.plan) for _ in range(8)]
+        self.assertEqual(runs, [False, False, False, True, False, False, False, True])
+        stats = self.gate.get_stats()["cams"]["RPI_USB3"]
+        self.assertEqual((stats["frames"], stats["skipped"], stats["forced"]), (9, 6, 2))
+        self.assertAlmostEqual(stats["skip_ratio"], round(6 / 9, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
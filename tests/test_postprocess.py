@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Unit tests for logic.postprocess (벡터화 결과가 기존 박스별 루프와 같은지)."""
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import config
+from logic.postprocess import DETECTION_DTYPE, boxes_to_numpy, postprocess_xyxy, roi_bands, to_dicts
+from logic.preprocess import build_plan
+
+
+def _legacy_filter(xyxy, cam_cfg, cam_id, W):
+    """벡터화 이전의 박스별 ROI/EOL 필터 루프 (기준 구현)."""
+    roi_y = cam_cfg.get("roi_y", 0)
+    roi_margin = cam_cfg.get("roi_margin", 0)
+    roi_top, roi_bot = roi_y - roi_margin, roi_y + roi_margin
+    roi_x_min = cam_cfg.get("roi_x_min", 0)
+    roi_x_max = cam_cfg.get("roi_x_max", W)
+    eol_top = eol_bot = None
+    if cam_id == "RPI_USB3":
+        eol_y = cam_cfg.get("eol_y", 0)
+        eol_margin = cam_cfg.get("eol_margin", 0)
+        eol_top, eol_bot = eol_y - eol_margin, eol_y + eol_margin
+    out = []
+    for row in xyxy:
+        x1, y1, x2, y2 = map(int, row)
+        cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+        in_x_range = roi_x_min <= cx <= roi_x_max
+        in_roi = (roi_top < cy < roi_bot) and in_x_range
+        in_eol = (eol_top < cy < eol_bot) and in_x_range if eol_top is not None else False
+        out.append({"box": (x1, y1, x2, y2), "center": (cx, cy), "in_roi": in_roi, "in_eol": in_eol,
+                    "width": (x2 - x1)})
+    return out
+
+
+def _random_boxes(n, W, H, seed=0):
+    rng = np.random.default_rng(seed)
+    x1 = rng.uniform(0, W - 20, n)
+    y1 = rng.uniform(0, H - 20, n)
+    return np.stack([x1, y1, x1 + rng.uniform(5, 200, n), y1 + rng.uniform(5, 200, n)], axis=1).astype(np.float32)
+
+
+class _FakeTensor:
+    def __init__(self, arr):
+        self.arr = arr
+        self.cpu_calls = 0
+
+    def cpu(self):
+        self.cpu_calls += 1
+        return self
+
+    def numpy(self):
+        return self.arr
+
+
+class _FakeBoxes:
+    def __init__(self, arr):
+        self.xyxy = _FakeTensor(arr)
+
+
+class TestPostprocess(unittest.TestCase):
+    def test_matches_legacy_loop_for_all_cams(self):
+        for cam in config.TRACKING_CAMS:
+            plan = build_plan(cam, config.CAM_SETTINGS[cam], 1280, 720)
+            W, H = plan.out_size
+            xyxy = _random_boxes(300, W, H, seed=len(cam))
+            legacy = _legacy_filter(xyxy, dict(plan.cfg), cam, W)
+            self.assertEqual(to_dicts(postprocess_xyxy(xyxy, roi_bands(plan.cfg, cam, W))), legacy)
+            self.assertEqual(to_dicts(postprocess_xyxy(xyxy, roi_bands(plan, cam, W))), legacy)
+
+    def test_dict_types_are_python_builtins(self):
+        d = to_dicts(postprocess_xyxy(np.array([[10.7, 20.2, 50.9, 80.1]]), (0, 100, 0, 640, None, None)))[0]
+        self.assertEqual(d["box"], (10, 20, 50, 80))
+        self.assertIs(type(d["box"][0]), int)
+        self.assertIs(type(d["in_roi"]), bool)
+        self.assertIs(d["in_eol"], False)
+        self.assertEqual(d["width"], 40)
+
+    def test_letterbox_and_offset(self):
+        plan = build_plan("RPI_USB1", config.CAM_SETTINGS["RPI_USB1"], 1280, 720, letterbox_size=640)
+        _, scale, pad_left, pad_top, _, _ = plan.letterbox
+        xyxy = pad_left + np.array([[10.5, 20.5, 110.5, 220.5]]) * scale
+        xyxy[:, 1::2] += pad_top - pad_left
+        dets = postprocess_xyxy(xyxy, roi_bands(plan, "RPI_USB1", 640), plan.letterbox)
+        self.assertEqual(tuple(dets[0][["x1", "y1", "x2", "y2"]].tolist()), (10, 20, 110, 220))
+        shifted = postprocess_xyxy(np.array([[0.0, 5.0, 10.0, 15.0]]), (0, 1000, 0, 640, None, None), offset_y=100)
+        self.assertEqual((shifted["y1"][0], shifted["y2"][0], shifted["cy"][0]), (105, 115, 110.0))
+
+    def test_empty_and_boxes_to_numpy(self):
+        self.assertEqual(postprocess_xyxy(np.zeros((0, 4)), (0, 1, 0, 1, None, None)).dtype, DETECTION_DTYPE)
+        boxes = _FakeBoxes(np.array([[1, 2, 3, 4]], dtype=np.float32))
+        arr = boxes_to_numpy(boxes)
+        self.assertEqual(arr.shape, (1, 4))
+        self.assertEqual(boxes.xyxy.cpu_calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Unit tests for logic.preprocess (PreprocessPlan, 캐시, 회전·리사이즈)."""
+import copy
+import dataclasses
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import config
+from logic.preprocess import (
+    FramePreprocessor,
+    PreprocessPlanCache,
+    apply_plan,
+    build_plan,
+    roi_crop_bands,
+    roi_crops,
+    unletterbox_xyxy,
+)
+
+
+def _legacy_pixels(cfg, H):
+    """기존 main._preprocess_frame의 cfg 갱신 계산식."""
+    out = {
+        "roi_y": int(H * cfg.get("roi_y_rate", 0)),
+        "roi_margin": int(H * cfg.get("roi_margin_rate", 0)),
+        "dist_eps": int(H * cfg.get("dist_eps_rate", 0)),
+        "max_dy": int(H * cfg.get("max_dy_rate", 0)),
+    }
+    if "eol_y_rate" in cfg:
+        out["eol_y"] = int(H * cfg["eol_y_rate"])
+        out["eol_margin"] = int(H * cfg["eol_margin_rate"])
+    return out
+
+
+class TestPreprocessPlan(unittest.TestCase):
+    def test_matches_legacy_pixel_values(self):
+        for cam in config.TRACKING_CAMS:
+            cfg = config.CAM_SETTINGS[cam]
+            plan = build_plan(cam, cfg, 1280, 720, 640)
+            W, H = plan.out_size
+            self.assertEqual(W, 640)
+            rot_w, rot_h = (720, 1280) if cfg.get("rotate") in (90, 270) else (1280, 720)
+            self.assertEqual(H, int(rot_h * (640 / rot_w)))
+            for key, val in _legacy_pixels(cfg, H).items():
+                self.assertEqual(plan.cfg[key], val, f"{cam}.{key}")
+            self.assertEqual(plan.roi_top, plan.roi_y - plan.roi_margin)
+            self.assertEqual((plan.roi_x_min, plan.roi_x_max), (0, 640))
+        self.assertIsNotNone(build_plan("RPI_USB3", config.CAM_SETTINGS["RPI_USB3"], 1280, 720).eol_top)
+        self.assertIsNone(build_plan("RPI_USB1", config.CAM_SETTINGS["RPI_USB1"], 1280, 720).eol_top)
+
+    def test_plan_is_immutable(self):
+        plan = build_plan("USB_LOCAL", config.CAM_SETTINGS["USB_LOCAL"], 1280, 720)
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            plan.roi_y = 1
+        with self.assertRaises(TypeError):
+            plan.cfg["roi_y"] = 1
+
+    def test_cache_reuses_and_invalidates_on_resolution_change(self):
+        settings = copy.deepcopy(config.CAM_SETTINGS)
+        before = copy.deepcopy(settings)
+        cache = PreprocessPlanCache(settings, 640)
+        p1 = cache.get("RPI_USB1", (720, 1280, 3))
+        self.assertIs(cache.get("RPI_USB1", (720, 1280, 3)), p1)
+        p2 = cache.get("RPI_USB1", (360, 640, 3))
+        self.assertIsNot(p2, p1)
+        self.assertEqual(p2.src_size, (640, 360))
+        self.assertIsNone(cache.get("UNKNOWN", (720, 1280)))
+        # 설정 dict는 수정되지 않음
+        self.assertEqual(settings, before)
+
+    def test_apply_plan_rotates_and_resizes(self):
+        plan = build_plan("RPI_USB1", config.CAM_SETTINGS["RPI_USB1"], 1280, 720)
+        img = np.zeros((720, 1280, 3), dtype=np.uint8)
+        img.flags.writeable = False
+        out = apply_plan(plan, img)
+        self.assertEqual(out.shape, (plan.out_size[1], plan.out_size[0], 3))
+        self.assertTrue(out.flags.writeable)
+
+
+class TestFramePreprocessor(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.img = rng.integers(0, 255, (720, 1280, 3), dtype=np.uint8)
+
+    def test_fused_matches_rotate_then_resize_and_reuses_buffer(self):
+        pre = FramePreprocessor()
+        for cam in config.TRACKING_CAMS:
+            plan = build_plan(cam, config.CAM_SETTINGS[cam], 1280, 720)
+            out = pre.run(plan, self.img)
+            self.assertEqual(out.shape, (plan.out_size[1], plan.out_size[0], 3))
+            diff = np.abs(out.astype(np.int16) - apply_plan(plan, self.img).astype(np.int16)).max()
+            self.assertEqual(diff, 0)
+            self.assertIs(pre.run(plan, self.img), out)
+
+    def test_slots_rotate_buffers_per_cam(self):
+        pre = FramePreprocessor(slots=2)
+        plan = build_plan("RPI_USB1", config.CAM_SETTINGS["RPI_USB1"], 1280, 720)
+        first = pre.run(plan, self.img)
+        second = pre.run(plan, self.img)
+        self.assertIsNot(first, second)
+        self.assertIs(pre.run(plan, self.img), first)
+
+    def test_letterbox_geometry_and_box_mapping(self):
+        plan = build_plan("RPI_USB1", config.CAM_SETTINGS["RPI_USB1"], 1280, 720, letterbox_size=640)
+        pre = FramePreprocessor()
+        out = pre.run(plan, self.img)
+        box = pre.letterbox(plan, out)
+        size, scale, pad_left, pad_top, new_w, new_h = plan.letterbox
+        self.assertEqual(box.shape, (640, 640, 3))
+        self.assertEqual((new_h, pad_top), (640, 0))
+        self.assertTrue((box[:, :pad_left] == FramePreprocessor.PAD_VALUE).all())
+        self.assertTrue((box[:, pad_left + new_w:] == FramePreprocessor.PAD_VALUE).all())
+        # letterbox 좌표 박스 → out_size 좌표
+        x1, y1, x2, y2 = unletterbox_xyxy(plan, pad_left, 0, pad_left + new_w, new_h)
+        self.assertAlmostEqual(x1, 0)
+        self.assertAlmostEqual(y1, 0)
+        self.assertAlmostEqual(x2, plan.out_size[0], delta=1)
+        self.assertAlmostEqual(y2, plan.out_size[1], delta=1)
+
+
+class TestRoiCrop(unittest.TestCase):
+    def test_bands_padded_clipped_and_merged(self):
+        self.assertEqual(roi_crop_bands(1000, 400, 440, None, None, 50), ((350, 490),))
+        self.assertEqual(roi_crop_bands(1000, 20, 60, None, None, 50), ((0, 110),))
+        # ROI·EOL 밴드가 패딩으로 겹치면 하나로
+        self.assertEqual(roi_crop_bands(1000, 400, 440, 500, 540, 50), ((350, 590),))
+        self.assertEqual(roi_crop_bands(1000, 400, 440, 800, 840, 50), ((350, 490), (750, 890)))
+
+    def test_plan_crop_geometry(self):
+        plan = build_plan("RPI_USB3", config.CAM_SETTINGS["RPI_USB3"], 1280, 720,
+                          roi_crop_pad_rate=0.1, model_imgsz=640)
+        W, H = plan.out_size
+        self.assertTrue(plan.crop_bands)
+        for y0, y1 in plan.crop_bands:
+            self.assertTrue(0 <= y0 < y1 <= H)
+        # ROI 밴드 전체 + max_dy가 crop 안에 포함
+        self.assertTrue(any(y0 <= plan.roi_top - plan.max_dy and plan.roi_bot + plan.max_dy <= y1
+                            for y0, y1 in plan.crop_bands))
+        self.assertTrue(any(y0 <= plan.eol_top and plan.eol_bot <= y1 for y0, y1 in plan.crop_bands))
+        h, w = plan.crop_imgsz
+        self.assertEqual((h % 32, w % 32), (0, 0))
+        self.assertLess(h, 640)
+        self.assertEqual(build_plan("RPI_USB3", config.CAM_SETTINGS["RPI_USB3"], 1280, 720).crop_bands, ())
+
+    def test_roi_crops_are_views_with_offsets(self):
+        plans = [build_plan(c, config.CAM_SETTINGS[c], 1280, 720, roi_crop_pad_rate=0.1)
+                 for c in ("RPI_USB1", "RPI_USB3")]
+        imgs = [np.zeros((p.out_size[1], p.out_size[0], 3), dtype=np.uint8) for p in plans]
+        crops, owners, imgsz = roi_crops(list(zip(plans, imgs)))
+        self.assertEqual(len(crops), sum(len(p.crop_bands) for p in plans))
+        for crop, (idx, y0) in zip(crops, owners):
+            self.assertTrue(np.shares_memory(crop, imgs[idx]))
+            self.assertIn(y0, [b[0] for b in plans[idx].crop_bands])
+        self.assertEqual(imgsz, (max(p.crop_imgsz[0] for p in plans), max(p.crop_imgsz[1] for p in plans)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -44,6 +44,22 @@ class TestTimeOrderedFrameBuffer(unittest.TestCase):
         self.assertEqual(lengths["X"], 2)
         self.assertEqual(lengths["Y"], 1)
 
+    def test_put_copies_by_default(self):
+        buf = TimeOrderedFrameBuffer(["A"], maxlen_per_cam=5)
+        frame = np.zeros((5, 5, 3), dtype=np.uint8)
+        buf.put("A", frame, 1.0)
+        frame[:] = 9
+        _, out, _ = buf.get_oldest()
+        self.assertEqual(int(out.max()), 0)
+
+    def test_zero_copy_put_transfers_ownership(self):
+        buf = TimeOrderedFrameBuffer(["A"], maxlen_per_cam=5, zero_copy=True)
+        frame = np.zeros((5, 5, 3), dtype=np.uint8)
+        buf.put("A", frame, 1.0)
+        _, out, _ = buf.get_oldest()
+        self.assertIs(out, frame)
+        self.assertFalse(out.flags.writeable)
+
     def test_get_all_cam_ids(self):
         buf = TimeOrderedFrameBuffer(["USB_LOCAL", "RPI_USB1"], maxlen_per_cam=10)
         self.assertEqual(buf.get_all_cam_ids(), ["USB_LOCAL", "RPI_USB1"])
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Unit tests for ingest.usb_camera_worker (push callback, frame_seq). 실제 카메라 없이 가짜 capture 사용."""
+import sys
+import time
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from ingest.usb_camera_worker import USBCameraWorker, buffer_ts_to_wall
+
+
+class FakeCapture:
+    """read()/grab()마다 값이 다른 새 프레임을 n장 반환 후 실패."""
+
+    def __init__(self, n):
+        self.n = n
+        self.reads = 0
+        self.retrieved = 0
+        self.grab_mono = 0.0
+
+    def isOpened(self):
+        return True
+
+    def read(self):
+        if self.reads >= self.n:
+            time.sleep(0.005)
+            return False, None
+        self.reads += 1
+        return True, np.full((4, 4, 3), self.reads, dtype=np.uint8)
+
+    def grab(self):
+        if self.reads >= self.n:
+            time.sleep(0.005)
+            return False
+        self.reads += 1
+        self.grab_mono = time.monotonic()
+        time.sleep(0.002)  # 캡처 → grab 반환 지연
+        return True
+
+    def retrieve(self):
+        self.retrieved += 1
+        return True, np.full((4, 4, 3), self.reads, dtype=np.uint8)
+
+    def get(self, prop):
+        # V4L2 버퍼 timestamp: CLOCK_MONOTONIC ms
+        return self.grab_mono * 1000.0
+
+    def release(self):
+        pass
+
+
+class FakeWorker(USBCameraWorker):
+    def __init__(self, n, cfg=None):
+        super().__init__("usb_local_0", cfg or {})
+        self._fake = FakeCapture(n)
+
+    def initialize(self):
+        self.cap = self._fake
+        return True
+
+
+class TestUSBCameraWorkerPush(unittest.TestCase):
+    def test_each_frame_pushed_once(self):
+        worker = FakeWorker(5)
+        got = []
+        worker.set_frame_callback(lambda name, frame, ts: got.append((name, int(frame[0, 0, 0]), ts)))
+        self.assertTrue(worker.start())
+        deadline = time.time() + 2.0
+        while len(got) < 5 and time.time() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.05)
+        worker.stop()
+        self.assertEqual([v for _, v, _ in got], [1, 2, 3, 4, 5])
+        self.assertEqual({name for name, _, _ in got}, {"usb_local_0"})
+        self.assertEqual(worker.frame_seq, 5)
+        self.assertEqual(worker.latest_timestamp, got[-1][2])
+        self.assertFalse(worker.get_latest_frame(copy=False).flags.writeable)
+
+    def test_callback_error_does_not_stop_capture(self):
+        worker = FakeWorker(3)
+
+        def bad(name, frame, ts):
+            raise RuntimeError("sink failure")
+
+        worker.set_frame_callback(bad)
+        worker.start()
+        deadline = time.time() + 2.0
+        while worker.frame_seq < 3 and time.time() < deadline:
+            time.sleep(0.01)
+        worker.stop()
+        self.assertEqual(worker.frame_seq, 3)
+
+
+class TestHardwareTimestamp(unittest.TestCase):
+    def test_buffer_ts_to_wall(self):
+        self.assertAlmostEqual(buffer_ts_to_wall(99_950.0, 1000.0, 100.0), 999.95)
+        self.assertIsNone(buffer_ts_to_wall(0.0, 1000.0, 100.0))
+        # 다른 clock(예: epoch ms)이면 skew 초과 → None
+        self.assertIsNone(buffer_ts_to_wall(1.7e12, 1000.0, 100.0))
+
+    def test_grab_retrieve_split_drops_without_decoding(self):
+        # retrieve_fps 매우 낮게 → 첫 프레임만 retrieve, 나머지는 grab만
+        worker = FakeWorker(6, {"hw_timestamp": True, "retrieve_fps": 0.5})
+        got = []
+        worker.set_frame_callback(lambda name, frame, ts: got.append(ts))
+        t0 = time.time()
+        worker.start()
+        deadline = time.time() + 2.0
+        while worker._fake.reads < 6 and time.time() < deadline:
+            time.sleep(0.01)
+        worker.stop()
+        self.assertEqual(len(got), 1)
+        self.assertEqual(worker._fake.retrieved, 1)
+        self.assertEqual(worker.dropped_count, 5)
+        # 버퍼 timestamp(grab 시점) 기반: grab 반환 후 시각보다 이르고 시작 시각 이후
+        self.assertGreaterEqual(got[0], t0 - 0.01)
+        self.assertLess(got[0], worker.last_capture_time)
+        self.assertEqual(worker.hw_ts_fallbacks, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Unit tests for ingest.wire_format, FrameReceiver 포맷 판별, FramePublisher (inproc)."""
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+import numpy as np
+import zmq
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from ingest.frame_publisher import FramePublisher
+from ingest.frame_receiver import FrameReceiver
+from ingest.wire_format import (
+    ENCODING_RAW_BGR,
+    choose_reduce_factor,
+    decode_binary_payload,
+    encode_binary_message,
+    encode_json_message,
+    pack_header,
+    unpack_header,
+)
+
+
+def _frame():
+    f = np.zeros((48, 64, 3), dtype=np.uint8)
+    f[:, :32] = (10, 200, 30)
+    return f
+
+
+class TestWireFormat(unittest.TestCase):
+    def test_header_roundtrip(self):
+        hdr = unpack_header(pack_header("usb1", 1700000000.125, 1280, 720, ENCODING_RAW_BGR))
+        self.assertEqual(hdr.camera, "usb1")
+        self.assertEqual(hdr.timestamp, 1700000000.125)
+        self.assertEqual((hdr.width, hdr.height), (1280, 720))
+        self.assertEqual(hdr.encoding, ENCODING_RAW_BGR)
+
+    def test_unpack_rejects_non_binary(self):
+        self.assertIsNone(unpack_header(b"\x04\x22M\x18 not a header"))
+        self.assertIsNone(unpack_header(b"TRK"))
+
+    def test_raw_payload_is_zero_copy_view(self):
+        frame = _frame()
+        _, header, payload = encode_binary_message("usb1", "usb1", frame, 1.0, encoding="raw_bgr")
+        out = decode_binary_payload(unpack_header(header), payload)
+        self.assertTrue(np.array_equal(out, frame))
+        self.assertFalse(out.flags.writeable)
+        self.assertFalse(out.flags.owndata)
+
+    def test_raw_payload_size_mismatch(self):
+        _, header, payload = encode_binary_message("usb1", "usb1", _frame(), 1.0, encoding="raw_bgr")
+        self.assertIsNone(decode_binary_payload(unpack_header(header), payload[:-1]))
+
+
+class TestFrameReceiverFormats(unittest.TestCase):
+    def _receiver(self, wire_format="auto"):
+        recv = FrameReceiver(None, use_lz4=True, output_bgr=True, wire_format=wire_format)
+        got = []
+        recv.set_frame_callback(lambda cam, f, ts: got.append((cam, f.shape, ts)))
+        return recv, got
+
+    def test_auto_handles_json_and_binary(self):
+        recv, got = self._receiver()
+        recv.handle_message(encode_json_message("usb1", "usb1", _frame(), 1.5))
+        recv.handle_message(encode_binary_message("usb2", "usb2", _frame(), 2.5, encoding="jpeg"))
+        recv.handle_message(encode_binary_message("usb3", "usb3", _frame(), 3.5, encoding="raw_bgr"))
+        self.assertEqual(got, [("usb1", (48, 64, 3), 1.5), ("usb2", (48, 64, 3), 2.5), ("usb3", (48, 64, 3), 3.5)])
+
+    def test_json_only_ignores_binary(self):
+        recv, got = self._receiver("json")
+        recv.handle_message(encode_binary_message("usb1", "usb1", _frame(), 1.0, encoding="raw_bgr"))
+        self.assertEqual(got, [])
+
+    def test_binary_only_ignores_json(self):
+        recv, got = self._receiver("binary")
+        recv.handle_message(encode_json_message("usb1", "usb1", _frame(), 1.0))
+        self.assertEqual(got, [])
+
+
+class TestReducedDecode(unittest.TestCase):
+    def test_choose_reduce_factor(self):
+        self.assertEqual(choose_reduce_factor(1280, 720, 0, 640), 2)
+        self.assertEqual(choose_reduce_factor(2560, 1440, 0, 640), 4)
+        self.assertEqual(choose_reduce_factor(5120, 2880, 0, 640), 8)
+        # 270도 회전: 회전 후 가로 = 720 → 축소 불가
+        self.assertEqual(choose_reduce_factor(1280, 720, 270, 640), 1)
+        self.assertEqual(choose_reduce_factor(1920, 1440, 90, 640), 2)
+        self.assertEqual(choose_reduce_factor(0, 0, 0, 640), 1)
+
+    def test_receiver_decodes_reduced_jpeg(self):
+        frame = np.zeros((96, 128, 3), dtype=np.uint8)
+        frame[:, :64] = (10, 200, 30)
+        calls = []
+
+        def factor_fn(camera, w, h):
+            calls.append((camera, w, h))
+            return 2 if camera == "usb1" else 1
+
+        recv = FrameReceiver(None, wire_format="auto", reduce_factor_fn=factor_fn)
+        got = {}
+        recv.set_frame_callback(lambda camera, f, ts: got.__setitem__(camera, f.shape))
+        recv.handle_message(encode_binary_message("usb1", "usb1", frame, 1.0))
+        recv.handle_message(encode_json_message("usb2", "usb2", frame, 2.0))
+        self.assertEqual(got["usb1"], (48, 64, 3))
+        self.assertEqual(got["usb2"], (96, 128, 3))
+        self.assertEqual(calls, [("usb1", 128, 96), ("usb2", 128, 96)])
+
+
+class TestFramePublisherInproc(unittest.TestCase):
+    def test_publish_binary_over_inproc(self):
+        ctx = zmq.Context()
+        pub = ctx.socket(zmq.PUB)
+        pub.bind("inproc://test-wire")
+        sub = ctx.socket(zmq.SUB)
+        sub.setsockopt(zmq.SUBSCRIBE, b"")
+        sub.connect("inproc://test-wire")
+        recv = FrameReceiver(sub, wire_format="binary")
+        got = threading.Event()
+        received = []
+
+        def cb(cam, frame, ts):
+            received.append((cam, ts))
+            got.set()
+
+        recv.set_frame_callback(cb)
+        recv.start()
+        try:
+            publisher = FramePublisher(pub, wire_format="binary", encoding="raw_bgr")
+            deadline = time.time() + 3
+            while not got.is_set() and time.time() < deadline:
+                publisher.publish("usb1", _frame(), 42.0)
+                got.wait(0.05)
+            self.assertTrue(got.is_set())
+            self.assertEqual(received[0], ("usb1", 42.0))
+        finally:
+            recv.stop()
+            pub.close(linger=0)
+            sub.close(linger=0)
+            ctx.term()
+
+
+if __name__ == "__main__":
+    unittest.main()
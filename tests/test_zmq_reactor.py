@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Unit tests for ingest.zmq_reactor (inproc PUB → 여러 SUB → Poller 스레드 1개)."""
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+import numpy as np
+import zmq
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from ingest.frame_publisher import FramePublisher
+from ingest.frame_receiver import FrameReceiver
+from ingest.zmq_reactor import ZmqReactor, configure_sub_socket
+
+
+def _wait_for(pred, timeout=3.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if pred():
+            return True
+        time.sleep(0.01)
+    return pred()
+
+
+class TestZmqReactor(unittest.TestCase):
+    def setUp(self):
+        self.ctx = zmq.Context()
+        self.sockets = []
+
+    def tearDown(self):
+        for s in self.sockets:
+            s.close(linger=0)
+        self.ctx.term()
+
+    def _pair(self, name, rcvhwm=None):
+        pub = self.ctx.socket(zmq.PUB)
+        pub.bind(f"inproc://reactor-{name}")
+        sub = self.ctx.socket(zmq.SUB)
+        sub.setsockopt(zmq.SUBSCRIBE, b"")
+        configure_sub_socket(sub, rcvhwm=rcvhwm)
+        sub.connect(f"inproc://reactor-{name}")
+        self.sockets += [pub, sub]
+        return FramePublisher(pub, wire_format="binary", encoding="raw_bgr"), sub
+
+    def test_single_thread_serves_all_sockets(self):
+        frame = np.zeros((8, 8, 3), dtype=np.uint8)
+        received = []
+        lock = threading.Lock()
+
+        def cb(camera, f, ts):
+            with lock:
+                received.append(camera)
+
+        reactor = ZmqReactor(poll_timeout_ms=20)
+        pubs = []
+        for name in ("a", "b"):
+            pub, sub = self._pair(name, rcvhwm=10)
+            recv = FrameReceiver(sub, wire_format="binary")
+            recv.set_frame_callback(cb)
+            reactor.add(recv)
+            pubs.append((name, pub))
+        reactor.start()
+        try:
+            time.sleep(0.1)
+            for name, pub in pubs:
+                for _ in range(3):
+                    pub.publish(f"cam_{name}", frame, 1.0)
+            self.assertTrue(_wait_for(lambda: len(received) == 6))
+        finally:
+            reactor.stop()
+        self.assertEqual(sorted(set(received)), ["cam_a", "cam_b"])
+        self.assertEqual(sum(s["received"] for s in reactor.get_stats()), 6)
+        self.assertFalse(reactor.thread.is_alive())
+
+    def test_conflate_keeps_latest_per_camera(self):
+        received = []
+        pub, sub = self._pair("conflate")
+        recv = FrameReceiver(sub, wire_format="binary")
+        recv.set_frame_callback(lambda camera, f, ts: received.append((camera, ts)))
+        reactor = ZmqReactor(poll_timeout_ms=20)
+        reactor.add(recv, conflate=True)
+        time.sleep(0.05)
+        frame = np.zeros((4, 4, 3), dtype=np.uint8)
+        for i in range(5):
+            pub.publish("usb1", frame, float(i))
+            pub.publish("usb2", frame, float(i))
+        time.sleep(0.05)  # reactor 시작 전 큐에 쌓인 메시지를 한 배치로 드레인
+        reactor.start()
+        try:
+            self.assertTrue(_wait_for(lambda: len(received) >= 2))
+            time.sleep(0.05)
+        finally:
+            reactor.stop()
+        self.assertEqual(sorted(received), [("usb1", 4.0), ("usb2", 4.0)])
+        self.assertEqual(reactor.get_stats()[0]["dropped_stale"], 8)
+
+    def test_add_after_start_rejected(self):
+        _, sub = self._pair("late")
+        reactor = ZmqReactor(poll_timeout_ms=20)
+        reactor.start()
+        try:
+            with self.assertRaises(RuntimeError):
+                reactor.add(FrameReceiver(sub))
+        finally:
+            reactor.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()